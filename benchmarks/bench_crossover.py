@@ -0,0 +1,54 @@
+"""
+Input size where tokenize(backend='numpy') overtakes the scalar backends.
+
+	python benchmarks/bench_crossover.py [--input vpit] [--max-size 4000000]
+
+Prints the best time of each backend for growing prefixes of an input from
+bench_lexer.INPUTS, and the smallest size from which numpy stays faster than each
+of the other backends.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_lexer import INPUTS
+from tokenizer import tokenize
+from tsql_lexer import value_hash
+
+BACKENDS = ('loop', 'regex', 'numpy')
+
+def _best_time(sql: str, backend: str, repeat: int) -> float:
+	best = float('inf')
+	for _ in range(repeat):
+		start = time.perf_counter()
+		for _ in tokenize(sql, value_hash=value_hash, backend=backend):
+			pass
+		best = min(best, time.perf_counter() - start)
+	return best
+
+def main(argv=None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('--input', choices=list(INPUTS), default='vpit')
+	parser.add_argument('--max-size', type=int, default=4_000_000, help='largest input size in characters')
+	parser.add_argument('--repeat', type=int, default=5)
+	args = parser.parse_args(argv)
+
+	source = INPUTS[args.input]
+	print(f"{'chars':>10}" + ''.join(f'{backend + " ms":>12}' for backend in BACKENDS))
+	size, crossover = 64, dict.fromkeys(BACKENDS[:-1])
+	while size <= args.max_size:
+		sql = (source * (size // len(source) + 1))[:size]
+		times = {backend: _best_time(sql, backend, args.repeat if size < 1_000_000 else 1) for backend in BACKENDS}
+		print(f'{size:>10}' + ''.join(f'{times[backend] * 1e3:>12.3f}' for backend in BACKENDS))
+		for backend in crossover:
+			crossover[backend] = (crossover[backend] or size) if times['numpy'] < times[backend] else None
+		size *= 4
+	for backend, size in crossover.items():
+		print(f'numpy faster than {backend} from {size} characters' if size else f'numpy never stays faster than {backend}')
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
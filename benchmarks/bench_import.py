@@ -0,0 +1,58 @@
+"""
+Cold start cost of importing the lexer and parser.
+
+	python benchmarks/bench_import.py [--module tsql_parser] [--repeat 20]
+
+Imports the module in fresh interpreters with -X importtime and prints the median
+self and cumulative import time of the repository modules, and the median wall time
+of the interpreter run against an empty one. Bytecode caching follows the
+environment: with PYTHONDONTWRITEBYTECODE set every run compiles the sources.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ('tokenizer', 'tsql_tables', 'tsql_keywords', 'tsql_lexer', 'tsql_parser', 'tsql_fingerprint')
+
+def _run(code: str, importtime: bool = False) -> tuple[float, str]:
+	args = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', code]
+	start = time.perf_counter()
+	result = subprocess.run(args, cwd=ROOT, capture_output=True, text=True, check=True)
+	return time.perf_counter() - start, result.stderr
+
+def _import_times(stderr: str) -> dict[str, tuple[int, int]]:
+	"""(self, cumulative) microseconds by module name from -X importtime output"""
+	times = {}
+	for line in stderr.splitlines():
+		if not line.startswith('import time:') or 'imported package' in line: continue
+		self_us, cumulative_us, name = line[len('import time:'):].split('|')
+		times[name.strip()] = (int(self_us), int(cumulative_us))
+	return times
+
+def main(argv=None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('--module', default='tsql_parser', help='module to import (default tsql_parser)')
+	parser.add_argument('--repeat', type=int, default=20, help='interpreter runs, the median is kept')
+	args = parser.parse_args(argv)
+
+	code = f'import {args.module}'
+	_run(code) # write the bytecode cache, if enabled
+	runs = [_import_times(_run(code, importtime=True)[1]) for _ in range(args.repeat)]
+	print(f"{'module':<20}{'self ms':>10}{'cumulative ms':>15}")
+	for name in MODULES:
+		if name not in runs[0]: continue
+		self_ms = statistics.median(run[name][0] for run in runs) / 1e3
+		cumulative_ms = statistics.median(run[name][1] for run in runs) / 1e3
+		print(f'{name:<20}{self_ms:>10.2f}{cumulative_ms:>15.2f}')
+
+	empty = statistics.median(_run('pass')[0] for _ in range(args.repeat))
+	full = statistics.median(_run(code)[0] for _ in range(args.repeat))
+	print(f'interpreter with {code!r}: {full * 1e3:.1f} ms, empty: {empty * 1e3:.1f} ms, difference {(full - empty) * 1e3:.1f} ms')
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
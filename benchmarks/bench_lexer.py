@@ -0,0 +1,155 @@
+"""
+Tokenizer and lexer micro-benchmarks.
+
+Reports tokens/s, MB/s, retained memory blocks per token (blocks still allocated while
+the results are held in a list) and peak traced bytes per token of tokenize(), lex() and
+split_batches() on synthetic inputs and the vpit fixture. Runs offline:
+
+	python benchmarks/bench_lexer.py                        # print results
+	python benchmarks/bench_lexer.py --save baseline.json   # store a baseline
+	python benchmarks/bench_lexer.py --compare benchmarks/baseline.json --threshold 0.15
+
+With --compare the exit status is 1 when any tokens/s figure is slower than the
+baseline by more than the threshold, or any retained blocks figure grew by more than it.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tokenizer import tokenize
+from tsql_lexer import lex, split_batches, value_hash
+from tests.fixtures import vpit
+
+def keyword_dml(n: int) -> str:
+	"""Keyword dense statements, few identifiers"""
+	return ''.join(f"""
+update t{i % 7} set c = c + 1 where not exists (select 1 from u where u.id = t{i % 7}.id and u.x is not null)
+delete from t{i % 5} where id in (select id from v where v.y between 1 and 10 union all select id from w)
+insert into log (id) select top (10) id from t order by id desc
+GO
+""" for i in range(n))
+
+def wide_select(n: int) -> str:
+	"""SELECTs with hundreds of qualified columns"""
+	columns = ',\n\t'.join(f'[s{i % 3}].tbl{i % 11}.column_name_{i}' for i in range(200))
+	return ''.join(f"select\n\t{columns}\nfrom [s0].tbl0 join [s1].tbl1 on tbl0.id = tbl1.id\nGO\n" for i in range(n))
+
+def literal_insert(n: int) -> str:
+	"""Multi-row INSERT ... VALUES full of strings and numbers"""
+	rows = ',\n'.join(f"({i}, N'name {i} with ''quotes''', 'abc{i}', {i}.25, 1.5e{i % 9}, 0x{i:04x}, '2024-01-{i % 28 + 1:02d}')" for i in range(100))
+	return ''.join(f'insert into t (a, b, c, d, e, f, g) values\n{rows}\nGO\n' for _ in range(n))
+
+def commented_procedure(n: int) -> str:
+	"""Procedures where most of the text is comments"""
+	header = '/*\n' + ''.join(f' * line {i} of the procedure documentation block\n' for i in range(30)) + ' */\n'
+	body = ''.join(f'\tset @x = @x + {i} -- step {i}: explain why this step is needed\n' for i in range(20))
+	return ''.join(f'{header}create procedure p{i} as\nbegin\n\tdeclare @x int = 0 /* counter */\n{body}end\nGO\n' for i in range(n))
+
+INPUTS = {
+	'keyword_dml': keyword_dml(200),
+	'wide_select': wide_select(10),
+	'literal_insert': literal_insert(10),
+	'commented_procedure': commented_procedure(40),
+	'vpit': vpit * 50,
+}
+
+CASES = {
+	'tokenize': lambda sql: tokenize(sql, value_hash=value_hash),
+	'tokenize_regex': lambda sql: tokenize(sql, value_hash=value_hash, backend='regex'),
+	'lex': lex,
+	'split_batches': split_batches,
+}
+
+def _best_time(fn, sql: str, repeat: int) -> float:
+	best = float('inf')
+	for _ in range(repeat):
+		start = time.perf_counter()
+		for _ in fn(sql):
+			pass
+		best = min(best, time.perf_counter() - start)
+	return best
+
+def _memory(fn, sql: str) -> tuple[int, int]:
+	"""Memory blocks retained by the list of fn(sql) results, and peak traced bytes of consuming fn(sql)"""
+	gc.collect()
+	gc.disable()
+	try:
+		blocks = sys.getallocatedblocks()
+		result = list(fn(sql))
+		blocks = sys.getallocatedblocks() - blocks
+		del result
+		tracemalloc.start()
+		for _ in fn(sql):
+			pass
+		peak = tracemalloc.get_traced_memory()[1]
+		tracemalloc.stop()
+	finally:
+		gc.enable()
+	return blocks, peak
+
+def run(repeat: int = 5, cases=None, inputs=None) -> dict:
+	results = {}
+	for input_name, sql in INPUTS.items():
+		if inputs and input_name not in inputs: continue
+		tokens = sum(1 for _ in lex(sql))
+		megabytes = len(sql.encode('utf-8')) / 1e6
+		for case_name, fn in CASES.items():
+			if cases and case_name not in cases: continue
+			seconds = _best_time(fn, sql, repeat)
+			blocks, peak = _memory(fn, sql)
+			results[f'{case_name}/{input_name}'] = {
+				'seconds': seconds,
+				'tokens_per_s': tokens / seconds,
+				'mb_per_s': megabytes / seconds,
+				'retained_blocks_per_token': blocks / tokens,
+				'peak_bytes_per_token': peak / tokens,
+			}
+	return results
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+	"""Descriptions of the results worse than baseline by more than threshold (a fraction)"""
+	regressions = []
+	for name, current in results.items():
+		if (base := baseline.get(name)) is None: continue
+		if current['tokens_per_s'] < base['tokens_per_s'] * (1 - threshold):
+			regressions.append(f"{name}: {current['tokens_per_s']:,.0f} tokens/s, baseline {base['tokens_per_s']:,.0f}")
+		if current['retained_blocks_per_token'] > base['retained_blocks_per_token'] * (1 + threshold) + 0.01:
+			regressions.append(f"{name}: {current['retained_blocks_per_token']:.2f} retained blocks/token, baseline {base['retained_blocks_per_token']:.2f}")
+	return regressions
+
+def main(argv=None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('--repeat', type=int, default=5, help='timing runs per case, the best one is kept')
+	parser.add_argument('--case', action='append', choices=list(CASES), help='only run these functions')
+	parser.add_argument('--input', action='append', choices=list(INPUTS), help='only run on these inputs')
+	parser.add_argument('--save', metavar='JSON', help='write the results as a baseline')
+	parser.add_argument('--compare', metavar='JSON', help='baseline to compare with')
+	parser.add_argument('--threshold', type=float, default=0.10, help='allowed slowdown as a fraction (default 0.10)')
+	args = parser.parse_args(argv)
+
+	results = run(args.repeat, args.case, args.input)
+	print(f"{'benchmark':<36}{'tokens/s':>14}{'MB/s':>9}{'retained/tok':>14}{'peak B/tok':>12}")
+	for name, r in results.items():
+		print(f"{name:<36}{r['tokens_per_s']:>14,.0f}{r['mb_per_s']:>9.2f}{r['retained_blocks_per_token']:>14.2f}{r['peak_bytes_per_token']:>12.1f}")
+
+	if args.save:
+		with open(args.save, 'w') as f:
+			json.dump({'python': platform.python_version(), 'machine': platform.machine(), 'results': results}, f, indent=1, sort_keys=True)
+	if args.compare:
+		with open(args.compare) as f:
+			baseline = json.load(f)['results']
+		regressions = compare(results, baseline, args.threshold)
+		for line in regressions:
+			print('REGRESSION', line)
+		return 1 if regressions else 0
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
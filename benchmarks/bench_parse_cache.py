@@ -0,0 +1,61 @@
+"""
+Parse throughput of repeated ORM style statements through a ParseCache.
+
+	python benchmarks/bench_parse_cache.py [--queries 20000] [--shapes 50] [--values 10]
+
+The queries use --shapes statement shapes, each with --values different literal
+values. Prints queries/s without a cache, with the exact text cache and with the
+token shape cache, and the cache counters.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tsql_cache import ParseCache
+from tsql_parser import Parser
+
+def orm_queries(count: int, shapes: int, values: int, seed: int = 0) -> list[str]:
+	rng = random.Random(seed)
+	queries = []
+	for _ in range(count):
+		shape, value = rng.randrange(shapes), rng.randrange(values)
+		# Shapes differ in their number of columns
+		columns = ', '.join(f'[t{shape}].[column_{k}]' for k in range(shape + 1))
+		queries.append(
+			f'select {columns} from [dbo].[table_{shape}] as [t{shape}] '
+			f"left join [dbo].[owner] as [o] on [o].[id] = [t{shape}].[owner_id] "
+			f"where [t{shape}].[id] = {value} and [t{shape}].[state] in (1, 2) and [o].[name] like N'user{value}%' "
+			f'order by [t{shape}].[created] desc offset 0 rows fetch next 50 rows only'
+		)
+	return queries
+
+def main(argv=None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('--queries', type=int, default=20000)
+	parser.add_argument('--shapes', type=int, default=50, help='distinct statement shapes')
+	parser.add_argument('--values', type=int, default=10, help='distinct literal values per shape')
+	parser.add_argument('--maxsize', type=int, default=256, help='cache entries')
+	args = parser.parse_args(argv)
+
+	queries = orm_queries(args.queries, args.shapes, args.values)
+	runs = {
+		'no cache': lambda sql: Parser(sql).parse(),
+		'exact': ParseCache(args.maxsize).parse,
+		'shape': ParseCache(args.maxsize, shapes=True).parse,
+	}
+	print(f"{'cache':<14}{'queries/s':>12}  counters")
+	for name, parse in runs.items():
+		start = time.perf_counter()
+		for sql in queries:
+			parse(sql)
+		seconds = time.perf_counter() - start
+		info = parse.__self__.cache_info() if hasattr(parse, '__self__') else ''
+		print(f'{name:<14}{len(queries) / seconds:>12,.0f}  {info}')
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
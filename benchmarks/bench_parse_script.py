@@ -0,0 +1,57 @@
+"""
+parse_script() throughput on a generated script with a growing number of workers.
+
+	python benchmarks/bench_parse_script.py [--workers 1 2 4 8] [--statements 20000] [--no-semicolons]
+
+Writes a script of query expressions separated by semicolons and GO lines, or only by
+line breaks with --no-semicolons, with one giant statement in the middle, to a
+temporary file and prints statements/s and MB/s of parse_script() per number of
+workers, and the time iter_statements() takes to split the script.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_parser_threads import QUERIES
+from tsql_lexer import iter_statements
+from tsql_parser import parse_script
+
+def script(statements: int, semicolons = True) -> str:
+	ends = (';\n', '\nGO\n') if semicolons else ('\n', '\n')
+	parts = [QUERIES[k % len(QUERIES)] + ends[k % 10 == 0] for k in range(statements)]
+	parts.insert(statements // 2, 'select 1' + ' union all select 1' * 5000 + ends[0])
+	return ''.join(parts)
+
+def main(argv=None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+	parser.add_argument('--statements', type=int, default=20000)
+	parser.add_argument('--no-semicolons', dest='semicolons', action='store_false')
+	args = parser.parse_args(argv)
+
+	with tempfile.TemporaryDirectory() as directory:
+		path = os.path.join(directory, 'script.sql')
+		with open(path, 'w', encoding='utf-8') as f:
+			f.write(script(args.statements, args.semicolons))
+		megabytes = os.path.getsize(path) / 1e6
+		with open(path, 'rb') as f:
+			start = time.perf_counter()
+			spans = sum(1 for _ in iter_statements(f))
+			split = time.perf_counter() - start
+		print(f'{os.cpu_count()} CPUs, {megabytes:.1f} MB, {spans} spans split in {split * 1000:.0f} ms')
+		print(f"{'workers':>8}{'statements/s':>14}{'MB/s':>8}{'speedup':>9}")
+		single = None
+		for workers in args.workers:
+			start = time.perf_counter()
+			count = sum(1 for _ in parse_script(path, workers))
+			seconds = time.perf_counter() - start
+			single = single or seconds
+			print(f'{workers:>8}{count / seconds:>14,.0f}{megabytes / seconds:>8.2f}{single / seconds:>9.2f}')
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Parse time of conditions with growing parenthesis nesting.
+
+	python benchmarks/bench_parser_nesting.py [--depth 2 4 8 16 32] [--shape iif]
+
+A parenthesis in a condition is tried as a condition first and parsed again as an
+expression when that fails, so without memoization every nesting level of the iif
+shape doubles the parse time. Each shape should grow about linearly with the depth.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tsql_parser import Parser
+
+def arith(depth: int) -> str:
+	"""((a + 1) * 0) * 1 ... > 1"""
+	return '(' * depth + 'a + 1' + ''.join(f') * {k}' for k in range(depth)) + ' > 1'
+
+def cond(depth: int) -> str:
+	"""((a = 1))"""
+	return '(' * depth + 'a = 1' + ')' * depth
+
+def iif(depth: int) -> str:
+	"""(iif((iif(a > 0, 1, 0) + 1) > 1, 1, 0) + 1) > 1"""
+	e = 'a'
+	for k in range(depth):
+		e = f'(iif({e} > {k}, 1, 0) + 1)'
+	return e + ' > 1'
+
+SHAPES = {'arith': arith, 'cond': cond, 'iif': iif}
+
+def _best_time(sql: str, repeat: int) -> float:
+	best = float('inf')
+	for _ in range(repeat):
+		start = time.perf_counter()
+		Parser(sql).parse()
+		best = min(best, time.perf_counter() - start)
+	return best
+
+def main(argv=None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('--depth', type=int, nargs='+', default=[2, 4, 8, 16, 32])
+	parser.add_argument('--shape', action='append', choices=list(SHAPES), help='only run these shapes')
+	parser.add_argument('--repeat', type=int, default=5, help='timing runs per depth, the best one is kept')
+	args = parser.parse_args(argv)
+
+	print(f"{'shape':<8}{'depth':>6}{'tokens':>8}{'ms':>10}{'us/token':>10}")
+	for name, shape in SHAPES.items():
+		if args.shape and name not in args.shape: continue
+		for depth in args.depth:
+			sql = f'select a from t where {shape(depth)}'
+			seconds = _best_time(sql, args.repeat)
+			tokens = Parser(sql).n
+			print(f'{name:<8}{depth:>6}{tokens:>8}{seconds * 1e3:>10.3f}{seconds * 1e6 / tokens:>10.2f}')
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Parser throughput with a growing number of threads.
+
+	python benchmarks/bench_parser_threads.py [--threads 1 2 4 8] [--queries 2000]
+
+Each thread parses its share of the queries with its own Parser. The results are
+checked against a single threaded run, so the benchmark also catches parsers that
+share state. With the GIL threads take turns: expect scaling only on free-threaded
+Python builds.
+"""
+import argparse
+import os
+import sys
+import sysconfig
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tsql_parser import Parser
+
+QUERIES = [
+	"select a, b + 1 x, c * 2 - d / 3 from t left join u on t.a = u.a where a in (1, 2) and b is not null order by a",
+	"select * from (select a from t) d cross apply f(1) g union all select cast(x as varchar(10)) from t2",
+	"select top 10 with ties t.*, count(*) over (partition by a order by b rows between unbounded preceding and current row) from t with (nolock)",
+	"select a from t where exists (select 1 from u) and not (a > 1 or b like 'x%') and c between 1 and 2 and d not in (select e from f)",
+	"select convert(decimal(10, 2), a), try_cast(b as nvarchar(max)), iif(a = 1, 2, 3) from t full outer join u on 1 = 1",
+	"select x = a + 1, 'lit' as y from openjson(@j) with (a int '$.a') j for json path, root('r')",
+]
+
+def _parse_all(queries: list[str]) -> list:
+	return [Parser(sql).parse() for sql in queries]
+
+def run(queries: list[str], threads: int) -> tuple[float, list]:
+	"""Seconds to parse queries in threads chunks, and the results in order"""
+	chunks = [queries[k::threads] for k in range(threads)]
+	start = time.perf_counter()
+	with ThreadPoolExecutor(threads) as pool:
+		parts = list(pool.map(_parse_all, chunks))
+	seconds = time.perf_counter() - start
+	results = [None] * len(queries)
+	for k, part in enumerate(parts):
+		results[k::threads] = part
+	return seconds, results
+
+def main(argv=None) -> int:
+	parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+	parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+	parser.add_argument('--queries', type=int, default=2000, help='number of queries to parse')
+	parser.add_argument('--repeat', type=int, default=3, help='timing runs per thread count, the best one is kept')
+	args = parser.parse_args(argv)
+
+	queries = (QUERIES * (args.queries // len(QUERIES) + 1))[:args.queries]
+	expected = _parse_all(queries)
+	gil = 'disabled' if sysconfig.get_config_var('Py_GIL_DISABLED') else 'enabled'
+	print(f'Python {sys.version.split()[0]}, GIL {gil}, {len(queries)} queries')
+	print(f"{'threads':>8}{'queries/s':>12}{'speedup':>9}")
+	single = None
+	for threads in args.threads:
+		best = float('inf')
+		for _ in range(args.repeat):
+			seconds, results = run(queries, threads)
+			if results != expected:
+				print(f'{threads} threads: results differ from the single threaded parse')
+				return 1
+			best = min(best, seconds)
+		single = single or best
+		print(f'{threads:>8}{len(queries) / best:>12,.0f}{single / best:>9.2f}')
+	return 0
+
+if __name__ == '__main__':
+	sys.exit(main())
@@ -0,0 +1,78 @@
+"""SQL texts shared by the tests and the benchmarks"""
+
+vpit="""
+use liga;
+drop view if exists vpit;
+create VIEW vpit as
+with 
+ resultados_acumulado as(	select distinct temporada, division, jornada
+							, elocal
+							, glocal
+							, sum(1) over (partition by temporada, division, elocal order by jornada) as JC
+							, sum(glocal) over (partition by temporada, division, elocal order by jornada) as GFC
+							, sum(gvisitante) over (partition by temporada, division, elocal order by jornada) as GCC
+							, sum(case when glocal > gvisitante then 1 else 0 end) over (partition by temporada, division, elocal order by jornada) as GC
+							, sum(case when glocal = gvisitante then 1 else 0 end) over (partition by temporada, division, elocal order by jornada) as EC
+							, sum(case when glocal < gvisitante then 1 else 0 end) over (partition by temporada, division, elocal order by jornada) as PC
+							, evisitante
+							, gvisitante
+							, sum(1) over (partition by temporada, division, evisitante order by jornada) as JF
+							, sum(gvisitante) over (partition by temporada, division, evisitante order by jornada) as GFF
+							, sum(glocal) over (partition by temporada, division, evisitante order by jornada) as GCF
+							, sum(case when glocal < gvisitante then 1 else 0 end) over (partition by temporada, division, evisitante order by jornada) as GF
+							, sum(case when glocal = gvisitante then 1 else 0 end) over (partition by temporada, division, evisitante order by jornada) as EF
+							, sum(case when glocal > gvisitante then 1 else 0 end) over (partition by temporada, division, evisitante order by jornada) as PF
+							, (glocal+1)/(cast(gvisitante+1 as decimal)) as ratio_glocal_1
+							, (gvisitante+1)/(cast(glocal+1 as decimal)) as ratio_gvisitante_1
+							from resultados as r 
+						)
+							
+,promedios as			(	select*
+							, GFC /cast(JC as decimal) as prom_gfc
+							, GCC /cast(JC as decimal) as prom_gcc
+							, GC /cast(JC as decimal) as prom_gc
+							, EC /cast(JC as decimal) as prom_ec
+							, PC /cast(JC as decimal) as prom_pc
+
+							, GFF / cast(JF as decimal) as prom_gff
+							, GCF / cast(JF as decimal) as prom_gcf
+							, GF / cast(JF as decimal) as prom_gf
+							, EF / cast(JF as decimal) as prom_ef
+							, PF / cast(JF as decimal) as prom_pf
+
+							from resultados_acumulado as r
+							where glocal is not null and gvisitante is not null
+						)
+select 
+  row_number()over(partition by r.division, r.temporada order by r.jornada desc, r.elocal) as rn
+, r.*
+, l.prom_gfc as A
+, l.prom_gcc as B
+, l.prom_gc as C
+, l.prom_ec as D
+, l.prom_pc as E
+, v.prom_gff as F
+, v.prom_gcf as G
+, v.prom_gf as H
+, v.prom_ef as I
+, v.prom_pf as J
+, dense_rank() over(partition by r.division, r.temporada order by r.jornada desc) as K
+FROM resultados_acumulado as r
+left join promedios l on l.temporada = r.temporada and l.division = r.division and l.elocal = r.elocal and l.glocal is not null
+		and l.jc = (select max(jc)
+					from promedios u 
+					where u.temporada = r.temporada 
+					and u.division = r.division 
+					and u.elocal = r.elocal 
+					and u.jc <= r.jc - 1
+					) #r.jc -1
+left join promedios v on v.temporada = r.temporada and v.division = r.division and v.evisitante = r.evisitante and v.glocal is not null
+		and v.jf = (select max(jf)
+					from promedios u 
+					where u.temporada = r.temporada 
+					and u.division = r.division 
+					and u.evisitante = r.evisitante
+					and u.jf <= r.jf - 1
+					) #r.jf -1
+order by r.division desc, r.temporada desc, r.jornada desc, r.elocal
+"""
@@ -1,6 +1,8 @@
 import unittest
+import importlib.util
 import re
-from tokenizer import Token, tokenize
+from sys import intern
+from tokenizer import Token, TokenArray, LineIndex, TokenizerProfile, Utf8Offsets, tokenize, tokenize_bytes
 
 class TokenizerTest(unittest.TestCase):
 	vpit="""
@@ -158,6 +160,69 @@ order by r.division desc, r.temporada desc, r.jornada desc, r.elocal
 		values = [(tok.get_value(sql=sql), tok.type == 2) for tok in tokenize(sql)]
 		self.assertEqual([("(", False),("1", True), (",", False), ("'2025-09-06'", False), (",", False), ("2.56e41", True), (",", False), ("7", True), (")", False)], values)
 
+	def test_regex_backend(self):
+		samples = [self.vpit, '', "'open", "'u''", '--eof', '/* /* */', '/*/ */x', '12.123.456e+489.12esdf', '1e--x', 'a<>b<=c>=d!e', 'x\u00b2 \u0663.5']
+		fields = lambda toks: [(t.start, t.end, t.type, t.value, t.value_id) for t in toks]
+		for sql in samples:
+			for comments in (False, True):
+				self.assertEqual(fields(tokenize(sql, comments=comments)), fields(tokenize(sql, comments=comments, backend='regex')), sql)
+
+	@unittest.skipUnless(importlib.util.find_spec('numpy'), 'numpy not installed')
+	def test_numpy_backend(self):
+		samples = [self.vpit, '', "'open", '--eof', '/* /* */ x', '12abc 1e5x $abc a.b .5 a..b', 'a<>b<=c>=d!e', 'x\u00b2 \u0663.5']
+		fields = lambda toks: [(t.start, t.end, t.type, t.value, t.value_id) for t in toks]
+		for sql in samples:
+			for comments in (False, True):
+				self.assertEqual(fields(tokenize(sql, comments=comments)), fields(tokenize(sql, comments=comments, backend='numpy')), sql)
+		self.assertEqual(fields(tokenize(self.vpit, pos=101)), fields(tokenize(self.vpit, pos=101, backend='numpy')))
+
+	def test_unknown_backend(self):
+		with self.assertRaises(ValueError):
+			list(tokenize('a', backend='simd'))
+
+	def test_lazy_value(self):
+		sql = "select 'a', 1 <> x"
+		toks = list(tokenize(sql, value_hash={'SELECT': 1, '<>': 2}))
+		self.assertFalse(hasattr(toks[0], '__dict__'))
+		self.assertEqual(["SELECT", "'a'", ",", "1", "<>", "X"], [t.value for t in toks])
+		self.assertIs(toks[0].value, 'SELECT')
+		self.assertIs(toks[4].value, intern('<>'))
+		self.assertIs(list(tokenize(sql, value_hash={'<>': 2}, backend='regex'))[4].value, intern('<>'))
+		toks[0].value = 'SELECT ALL'
+		self.assertEqual('SELECT ALL', toks[0].value)
+
+	def test_line_index(self):
+		sql = self.vpit + '\n\nx'
+		expected = [(len(sql[:o].split('\n')), len(sql[:o].split('\n')[-1]) + 1) for o in range(len(sql) + 1)]
+		lines = LineIndex(sql)
+		self.assertEqual(expected, [lines.position(o) for o in range(len(sql) + 1)])
+		self.assertEqual(expected, lines.positions(range(len(sql) + 1)))
+		self.assertEqual(expected[::-1], lines.positions(range(len(sql), -1, -1)))
+		toks = list(tokenize(sql))
+		self.assertEqual([expected[t.start] for t in toks], [t.get_position(sql, lines) for t in toks])
+		self.assertEqual([expected[t.start] for t in toks], [t.get_position(sql) for t in toks])
+		array = TokenArray(sql)
+		array.extend(toks)
+		self.assertEqual([expected[t.start] for t in toks], array.positions())
+		self.assertEqual(array.positions(), array.positions(lines))
+
+	def test_tokenize_bytes(self):
+		sql = "select 'año', [€] from t -- end"
+		data = sql.encode()
+		offsets = Utf8Offsets(data)
+		toks = list(tokenize_bytes(data))
+		self.assertEqual([(t.start, t.end, t.type, t.value) for t in tokenize(sql)],
+				   [(offsets.char_offset(t.start), offsets.char_offset(t.end), t.type, t.value) for t in toks])
+		self.assertEqual(("'año'", 7, 13), (toks[1].value, toks[1].start, toks[1].end))
+
+	def test_profile(self):
+		profile = TokenizerProfile(value_hash={'SELECT': 1})
+		fields = lambda toks: [(t.start, t.end, t.type, t.value, t.value_id) for t in toks]
+		for sql in [self.vpit, '', "select 'año' -- x", '/* /* */ x']:
+			self.assertEqual(fields(tokenize(sql, value_hash={'SELECT': 1}, comments=True)), fields(profile.tokenize(sql, comments=True)))
+			self.assertEqual(fields(tokenize(sql, value_hash={'SELECT': 1})), fields(profile.tokenize(sql, backend='loop')))
+			self.assertEqual(fields(tokenize_bytes(sql.encode())), fields(TokenizerProfile().tokenize_bytes(sql.encode())))
+
 class CurrentTest(unittest.TestCase):
 	pass
 
@@ -0,0 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+from tsql_cache import ParseCache
+from tsql_parser import Parser, AstArena
+
+def test_parse_cache():
+    cache = ParseCache(maxsize=2)
+    sql = "select a from t where b = 1"
+    tree, tokens = cache.parse(sql)
+    assert tree == Parser(sql).parse() and [t.value for t in tokens][-1] == '1'
+    assert cache.parse(sql)[0] is tree
+    cache.parse("select 1")
+    cache.parse("select 2")
+    assert cache.parse(sql)[0] is not tree
+    info = cache.cache_info()
+    assert (info.hits, info.shape_hits, info.misses, info.evictions, info.currsize) == (1, 0, 4, 2, 2)
+    cache.cache_clear()
+    assert cache.cache_info()[:5] == (0, 0, 0, 0, 0)
+
+def test_parse_cache_shapes():
+    cache = ParseCache(shapes=True, arena=True)
+    tree, _ = cache.parse("select a from t where b = 1 and c in (1, 2)")
+    assert isinstance(tree, AstArena)
+    # Same shape: the tree is shared, the tokens are the new ones
+    sql = "SELECT a FROM t WHERE b = 25 AND c IN (3, 4)"
+    shared, tokens = cache.parse(sql)
+    assert shared is tree and shared == Parser(sql).parse_arena()
+    assert [t.value for t in tokens][7] == '25'
+    # Other shapes
+    sql = "select a from t where b = 1 and c in (1, 2, 3)"
+    assert cache.parse(sql)[0] == Parser(sql).parse_arena()
+    sql = "select a from t where b = 'x' and c in (1, 2)"
+    assert cache.parse(sql)[0] == Parser(sql).parse_arena()
+    info = cache.cache_info()
+    assert (info.hits, info.shape_hits, info.misses, info.currsize) == (0, 1, 3, 4)
+
+def test_parse_cache_max_tokens():
+    cache = ParseCache(max_tokens=10)
+    cache.parse("select a, b from t") # 6 tokens
+    cache.parse("select c from u") # 4 tokens
+    assert cache.cache_info().evictions == 0
+    cache.parse("select 1")
+    info = cache.cache_info()
+    assert (info.evictions, info.currsize, info.tokens) == (1, 2, 6)
+
+def test_parse_cache_threads():
+    cache = ParseCache(maxsize=8, shapes=True)
+    queries = [f"select a, b from t where c = {k % 20} and d = 'x'" for k in range(400)]
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(cache.parse, queries))
+    for sql, (tree, tokens) in zip(queries, results):
+        parser = Parser(sql)
+        assert tree == parser.parse() and tokens == parser.tokens[:parser.n]
+    info = cache.cache_info()
+    assert info.hits + info.shape_hits + info.misses == len(queries) and info.currsize <= 8
@@ -0,0 +1,29 @@
+import pytest
+from tsql_fingerprint import fingerprint, fingerprint_hash
+
+@pytest.mark.parametrize("sql, template",[
+    ("select a,b from t where x=1 and z = 'abc'", "SELECT A, B FROM T WHERE X = ? AND Z = ?"),
+    ("SELECT  a\n\tFROM [dbo].[T] left  outer join u on u.id = t.id", "SELECT A FROM DBO.T LEFT OUTER JOIN U ON U.ID = T.ID"),
+    ("select N'x', 0x1F, 1.5e3, -2", "SELECT ?, ?, ?, - ?"),
+    ("select a from t where b in (1, -2, N'x') and c not in (select d from u) and e in (@p, 3)",
+        "SELECT A FROM T WHERE B IN (...) AND C NOT IN (SELECT D FROM U) AND E IN (@P, ?)"),
+    ("insert into t (a, b) values (1, 'x'), (2, (3)), (4, 5); select 1", "INSERT INTO T (A, B) VALUES (?, ?); SELECT ?"),
+    ("select * from (values (1, 2), (3, 4)) v(a, b)", "SELECT * FROM (VALUES (?, ?)) V (A, B)"),
+    ("insert into t default values; select (1), (2) from u", "INSERT INTO T DEFAULT VALUES; SELECT (?), (?) FROM U"),
+    ("insert t default values select max(a), (b) from t", "INSERT T DEFAULT VALUES SELECT MAX (A), (B) FROM T"),
+    ("insert t values (1), (2) select (a), (b) from t", "INSERT T VALUES (?) SELECT (A), (B) FROM T"),
+])
+def test_fingerprint(sql, template):
+    assert fingerprint(sql)[0] == template
+    assert fingerprint(sql)[1] == fingerprint_hash(sql)
+    assert fingerprint(sql, bits=128)[1] == fingerprint_hash(sql, bits=128)
+
+def test_fingerprint_hash():
+    same = ["select a from t where b in (1, 2, 3)", "SELECT A FROM T WHERE B IN ('x')", "select [a] from t where b in (4)"]
+    assert len({fingerprint_hash(sql) for sql in same}) == 1
+    assert len({fingerprint_hash(sql, bits=128) for sql in same}) == 1
+    different = ["select a from t", "select b from t", "select a from t where a = 1", "select a from t where a = b", "select a, b from t"]
+    assert len({fingerprint_hash(sql) for sql in different}) == len(different)
+    assert fingerprint_hash("insert t values (1), (2)") == fingerprint_hash("insert t values (3)")
+    assert fingerprint_hash("insert t default values; select (1), (2) from u") != fingerprint_hash("insert t default values; select (1) from u")
+    assert 0 <= fingerprint_hash("select 1") < 1 << 64 and 0 <= fingerprint_hash("select 1", bits=128) < 1 << 128
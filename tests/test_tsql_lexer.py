@@ -1,83 +1,9 @@
 import unittest
 import pytest
-from tsql_lexer import lex, EnumTokenType, EnumValueId
-
-vpit="""
-use liga;
-drop view if exists vpit;
-create VIEW vpit as
-with 
- resultados_acumulado as(	select distinct temporada, division, jornada
-							, elocal
-							, glocal
-							, sum(1) over (partition by temporada, division, elocal order by jornada) as JC
-							, sum(glocal) over (partition by temporada, division, elocal order by jornada) as GFC
-							, sum(gvisitante) over (partition by temporada, division, elocal order by jornada) as GCC
-							, sum(case when glocal > gvisitante then 1 else 0 end) over (partition by temporada, division, elocal order by jornada) as GC
-							, sum(case when glocal = gvisitante then 1 else 0 end) over (partition by temporada, division, elocal order by jornada) as EC
-							, sum(case when glocal < gvisitante then 1 else 0 end) over (partition by temporada, division, elocal order by jornada) as PC
-							, evisitante
-							, gvisitante
-							, sum(1) over (partition by temporada, division, evisitante order by jornada) as JF
-							, sum(gvisitante) over (partition by temporada, division, evisitante order by jornada) as GFF
-							, sum(glocal) over (partition by temporada, division, evisitante order by jornada) as GCF
-							, sum(case when glocal < gvisitante then 1 else 0 end) over (partition by temporada, division, evisitante order by jornada) as GF
-							, sum(case when glocal = gvisitante then 1 else 0 end) over (partition by temporada, division, evisitante order by jornada) as EF
-							, sum(case when glocal > gvisitante then 1 else 0 end) over (partition by temporada, division, evisitante order by jornada) as PF
-							, (glocal+1)/(cast(gvisitante+1 as decimal)) as ratio_glocal_1
-							, (gvisitante+1)/(cast(glocal+1 as decimal)) as ratio_gvisitante_1
-							from resultados as r 
-						)
-							
-,promedios as			(	select*
-							, GFC /cast(JC as decimal) as prom_gfc
-							, GCC /cast(JC as decimal) as prom_gcc
-							, GC /cast(JC as decimal) as prom_gc
-							, EC /cast(JC as decimal) as prom_ec
-							, PC /cast(JC as decimal) as prom_pc
-
-							, GFF / cast(JF as decimal) as prom_gff
-							, GCF / cast(JF as decimal) as prom_gcf
-							, GF / cast(JF as decimal) as prom_gf
-							, EF / cast(JF as decimal) as prom_ef
-							, PF / cast(JF as decimal) as prom_pf
-
-							from resultados_acumulado as r
-							where glocal is not null and gvisitante is not null
-						)
-select 
-  row_number()over(partition by r.division, r.temporada order by r.jornada desc, r.elocal) as rn
-, r.*
-, l.prom_gfc as A
-, l.prom_gcc as B
-, l.prom_gc as C
-, l.prom_ec as D
-, l.prom_pc as E
-, v.prom_gff as F
-, v.prom_gcf as G
-, v.prom_gf as H
-, v.prom_ef as I
-, v.prom_pf as J
-, dense_rank() over(partition by r.division, r.temporada order by r.jornada desc) as K
-FROM resultados_acumulado as r
-left join promedios l on l.temporada = r.temporada and l.division = r.division and l.elocal = r.elocal and l.glocal is not null
-		and l.jc = (select max(jc)
-					from promedios u 
-					where u.temporada = r.temporada 
-					and u.division = r.division 
-					and u.elocal = r.elocal 
-					and u.jc <= r.jc - 1
-					) #r.jc -1
-left join promedios v on v.temporada = r.temporada and v.division = r.division and v.evisitante = r.evisitante and v.glocal is not null
-		and v.jf = (select max(jf)
-					from promedios u 
-					where u.temporada = r.temporada 
-					and u.division = r.division 
-					and u.evisitante = r.evisitante
-					and u.jf <= r.jf - 1
-					) #r.jf -1
-order by r.division desc, r.temporada desc, r.jornada desc, r.elocal
-"""
+import re
+from tokenizer import SymbolTable, Trivia, tokenize
+from tests.fixtures import vpit
+from tsql_lexer import _lex, value_hash, VALUE_FLAGS, EnumValueFlag, iter_batches, iter_statements, split_batches, find_token_at, TokenIndex, lex, lex_bytes, lex_columnar, lex_file, relex, normalize_identifier, EnumTokenType, EnumValueId
 
 @pytest.fixture
 def lexed_tokens(): return lambda query: [tok for tok in lex(query)]
@@ -143,4 +69,207 @@ def test_has_value_id():
     tokens = [tok for tok in lex(vpit)]
     for t in tokens:
         if t.type not in (EnumTokenType.IDENTIFIER, EnumTokenType.INTEGER, EnumTokenType.DECIMAL):
-        	assert t.value_id != None
\ No newline at end of file
+        	assert t.value_id != None
+def test_lex_columnar():
+    tokens = lex_columnar(vpit)
+    expected = [tok for tok in lex(vpit)]
+    assert len(tokens) == len(expected)
+    assert [(t.start, t.end, t.type, t.value_id) for t in tokens] == [(t.start, t.end, t.type, t.value_id) for t in expected]
+    assert [tokens.get_value(i) for i in range(len(tokens))] == [t.get_value(vpit) for t in expected]
+    assert tokens[-1].value == "r.elocal"
+
+def test_lex_file(tmp_path):
+    path = tmp_path / "vpit.sql"
+    path.write_text(vpit)
+    assert [(t.start, t.end, t.type, t.value, t.value_id) for t in lex_file(path)] == [(t.start, t.end, t.type, t.value, t.value_id) for t in lex(vpit)]
+    data = memoryview(vpit.encode())
+    assert [(t.start, t.value) for t in lex_bytes(data[:30], pos=10)] == [(t.start, t.value) for t in lex(vpit[:30]) if t.start >= 10]
+
+@pytest.mark.parametrize("sql, edit",[
+    ("select a from t left join u on 1 = 1", (15, 0, " outer")),
+    ("select a from t left outer join u", (15, 6, "")),
+    ("select a.b, c from t", (8, 0, ".x")),
+    ("select a, 'b', c from t where 1 = 1", (10, 0, "'")),
+    ("select a /* x */, b from t", (9, 2, "")),
+    ("select a, b from t -- c\n where 1 = 1", (19, 2, "")),
+    (vpit, (600, 0, "/*")),
+    (vpit, (1000, 1, "@")),
+    ("select 1, 'abc", (8, 0, "2")),
+    ("select 1, [abc", (7, 1, "")),
+    ("select 1, \"abc", (7, 0, "42")),
+])
+def test_relex(sql, edit):
+    start, old_len, new_text = edit
+    new_sql = sql[:start] + new_text + sql[start + old_len:]
+    expected = [(t.start, t.end, t.type, t.value, t.value_id) for t in lex(new_sql)]
+    assert [(t.start, t.end, t.type, t.value, t.value_id) for t in relex(new_sql, list(lex(sql)), edit)] == expected
+    assert [(t.start, t.end, t.type, t.value_id) for t in relex(new_sql, lex_columnar(sql), edit)] == [t[:3] + t[4:] for t in expected]
+
+def test_relex_sources():
+    # Typing forward: the tokens keep referring to the source of the first lex() only
+    sql = vpit
+    tokens = list(lex(sql))
+    for k in range(60):
+        start = 500 + 3 * k
+        sql = sql[:start] + "1, " + sql[start:]
+        tokens = relex(sql, tokens, (start, 0, "1, "))
+    assert len({id(t.src) for t in tokens if t.src is not None}) <= 1
+    assert [(t.start, t.type, t.value) for t in tokens] == [(t.start, t.type, t.value) for t in lex(sql)]
+
+def test_symbols():
+    symbols = SymbolTable()
+    tokens = list(lex('select [dbo].[T].a, dbo.t.A, "dbo".t.a, [my col], @v from dbo.t', symbols=symbols))
+    ids = [t.symbol_id for t in tokens if t.type == EnumTokenType.IDENTIFIER]
+    assert ids == [1, 1, 1, 2, 3, 4]
+    assert [t.symbol_id for t in tokens if t.type != EnumTokenType.IDENTIFIER] == [None] * 6
+    assert symbols.names[1:] == ['DBO.T.A', '[MY COL]', '@V', 'DBO.T']
+    assert tokens[-1].value is symbols.name(4)
+    assert [t.symbol_id for t in lex('SELECT A FROM DBO.T', symbols=symbols)] == [None, 5, None, 4]
+    assert list(lex_columnar('select a from dbo.t', symbols=symbols).symbol_id) == [0, 5, 0, 4]
+    assert normalize_identifier('[a.b].c') == '[A.B].C'
+
+def test_multipart_names():
+    sql = "select srv . db.dbo.[a.b], t.* from s; select x"
+    tokens = list(lex(sql))
+    name = tokens[1].parts
+    assert list(name) == ['SRV', 'DB', 'DBO', '[a.b]'] and len(name) == 4
+    assert name[-1] == '[a.b]' and name[-2] == 'DBO'
+    assert [sql[slice(*name.span(i))] for i in range(4)] == ['srv', 'db', 'dbo', '[a.b]']
+    assert tokens[1].value == 'SRV.DB.DBO.[a.b]' and name.values == ('SRV', 'DB', 'DBO', '[a.b]')
+    assert tokens[3].parts is None and tokens[-1].parts is None
+    new_sql = "-- x\n" + sql
+    moved = relex(new_sql, tokens, (0, 0, "-- x\n"))[1]
+    assert moved.value == 'SRV.DB.DBO.[a.b]' and new_sql[slice(*moved.parts.span(-1))] == '[a.b]'
+
+def test_trivia():
+    sql = "-- header\nselect a, -- first\n  /* doc */ b /* x */ from t left /*y*/ outer join u\n/* end */"
+    trivia = Trivia()
+    tokens = list(lex(sql, trivia=trivia))
+    assert [(t.start, t.end, t.value) for t in tokens] == [(t.start, t.end, t.value) for t in lex(sql)]
+    assert len(trivia) == len(tokens)
+    leading = [[sql[s:e] for s, e in trivia.leading(i)] for i in range(len(tokens) + 1)]
+    trailing = [[sql[s:e] for s, e in trivia.trailing(i)] for i in range(len(tokens))]
+    assert leading == [["-- header\n"], [], [], ["/* doc */"], [], [], ["/*y*/"], [], ["/* end */"]]
+    assert trailing == [[], [], ["-- first\n"], ["/* x */"], [], [], [], []]
+    assert sql[trivia.edges[3]:tokens[3].start] == "  /* doc */ "
+    assert sql[tokens[7].end:trivia.edges[8]] == "\n"
+
+@pytest.mark.parametrize("sql, expected",[
+    ("a.b.c", ["A.B.C"]),
+    ("a..b", ["A..", "B"]),
+    ("a.left join b", ["A", ".", "LEFT JOIN", "B"]),
+    ("x is not null", ["X", "IS NOT NULL"]),
+    ("left outer apply", ["LEFT", "OUTER APPLY"]),
+    ("@v.a [b].[c]", ["@V", ".", "A", "[b].[c]"]),
+])
+def test_merges(sql, expected):
+    assert [t.value for t in lex(sql)] == expected
+
+def test_merges_stream():
+    read = []
+    def source():
+        for t in tokenize(" ".join(f"c{i}" for i in range(50000)) + " . d is not null", value_hash=value_hash):
+            read.append(t)
+            yield t
+    tokens = _lex(source())
+    assert next(tokens).value == "C0"
+    assert len(read) <= 4
+    assert [t.value for t in tokens][-3:] == ["C49998", "C49999.D", "IS NOT NULL"]
+
+def test_value_flags():
+    flags = [VALUE_FLAGS[t.value_id or 0] for t in lex("select a from t left outer join u on a >= b union select 1 + 2")]
+    assert flags[0] == EnumValueFlag.KEYWORD | EnumValueFlag.QUERY_START
+    assert flags[1] == 0
+    assert flags[4] == EnumValueFlag.KEYWORD | EnumValueFlag.JOIN
+    assert [f & EnumValueFlag.COMPARISON for f in flags].count(EnumValueFlag.COMPARISON) == 1
+    assert flags[10] & EnumValueFlag.SET_OPERATOR and flags[13] & EnumValueFlag.ARITHMETIC
+    assert VALUE_FLAGS[EnumValueId.LEFT] & EnumValueFlag.COMPOUND_START
+    assert VALUE_FLAGS[EnumValueId.NVARCHAR] & EnumValueFlag.DATA_TYPE
+
+def test_generated_tables():
+    import os, tsql_keywords, tsql_tables
+    with open(os.path.join(os.path.dirname(tsql_keywords.__file__), 'tsql_tables.py'), newline='') as f:
+        assert f.read() == tsql_keywords.render(), 'run python tsql_keywords.py'
+    assert EnumValueId.SELECT == tsql_tables.ValueId.SELECT and EnumValueId(tsql_tables.ValueId.DOT).name == 'DOT'
+    assert value_hash['SELECT'] == EnumValueId.SELECT and VALUE_FLAGS == tsql_keywords._value_flags()
+
+def _batches_by_tokens(sql):
+    """
+    split_batches() from the tokenizer: GO identifiers first on their line, followed by
+    nothing but an optional ASCII count and a line comment
+    """
+    batches, start = [], 0
+    for t in tokenize(sql, comments=True):
+        if t.type != EnumTokenType.IDENTIFIER or t.value != "GO" or t.start < start: continue
+        line_start, line_end = sql.rfind("\n", 0, t.start) + 1, (sql.find("\n", t.end) + 1 or len(sql) + 1) - 1
+        words = sql[line_start:line_end].split("--", 1)[0].split()
+        if (sql[line_start:t.start].strip() == "" and words[0].upper() == "GO" and len(words) <= 2
+                and all(re.fullmatch("[0-9]+", w) for w in words[1:])):
+            batches.append(sql[start:line_start].strip())
+            start = line_end
+    batches.append(sql[start:].strip())
+    return [b for b in batches if b]
+
+@pytest.mark.parametrize("sql, expected",[
+    ("select 1\nGO\nselect 2\n go \n\nGO\n", ["select 1", "select 2"]),
+    ("GO\nselect 1\ngo 3\r\nselect 2", ["select 1"] * 3 + ["select 2"]),
+    ("select 'a\nGO\n' /* x\nGO\n/* y */\nGO\n*/\nGO\n[b\nGO]", ["select 'a\nGO\n' /* x\nGO\n/* y */\nGO\n*/", "[b\nGO]"]),
+    ("select 1 -- x\nGO\nselect 2", ["select 1 -- x", "select 2"]),
+    ("select 1e-- '\nGO\n'", ["select 1e-- '\nGO\n'"]),
+    ("select a1e-- '\nGO\n'", ["select a1e-- '", "'"]),
+    ("select 1e-1e-- '\nGO\n'", ["select 1e-1e-- '", "'"]),
+    ("select 1e-1.e-- '\nGO\n'", ["select 1e-1.e-- '", "'"]),
+    ("select 1e--- '\nGO\n'", ["select 1e--- '", "'"]),
+    ("select 'a'1e-- [\nGO\n]", ["select 'a'1e-- [\nGO\n]"]),
+    ("select 1 /* GO\n*/ -- x\n'GO\n'", ["select 1 /* GO\n*/ -- x\n'GO\n'"]),
+    ("select 1 /* x\n*/ GO\nselect 2", ["select 1 /* x\n*/ GO\nselect 2"]),
+    ("select 1\ngo-\nselect 2\nGO*/\nGO ١\ngo 2x\nGO 2 3", ["select 1\ngo-\nselect 2\nGO*/\nGO ١\ngo 2x\nGO 2 3"]),
+    ("select 1\nGO -- done\nselect 2\ngo 2-- twice\n", ["select 1", "select 2", "select 2"]),
+])
+def test_iter_batches(sql, expected, tmp_path):
+    assert [sql[start:end] for start, end in iter_batches(sql)] == expected
+    assert split_batches(sql) == _batches_by_tokens(sql)
+    assert split_batches(sql) == [sql[start:end] for start, end in iter_batches(sql, repeat=False)]
+    path = tmp_path / "script.sql"
+    path.write_bytes(sql.encode())
+    with open(path, "rb") as f:
+        data = sql.encode()
+        assert [data[start:end].decode() for start, end in iter_batches(f)] == expected
+
+def test_iter_statements(tmp_path):
+    sql = "select 1; select ';' -- ;\n;\nGO\nselect /* ; */ 2 select 3\n;;"
+    expected = ["select 1", "select ';' -- ;", "select /* ; */ 2", "select 3"]
+    assert [sql[start:end] for start, end in iter_statements(sql)] == expected
+    path = tmp_path / "script.sql"
+    path.write_bytes(sql.encode())
+    with open(path, "rb") as f:
+        assert [sql[start:end] for start, end in iter_statements(f)] == expected
+    assert [sql[start:end] for start, end in iter_batches(sql)] == [sql[:sql.index("\nGO")], sql[sql.index("GO") + 3:]]
+
+@pytest.mark.parametrize("sql, expected",[
+    ("select a from t where b in (select c from u) select 1e5 union all select x.select\nselect 2",
+        ["select a from t where b in (select c from u)", "select 1e5 union all select x.select", "select 2"]),
+    ("select case when a = 1 then 2 end from t insert t select 1 select 2\nGO\nselect 1 begin tran select 2 commit",
+        ["select case when a = 1 then 2 end from t", "insert t select 1 select 2", "select 1", "begin tran select 2 commit"]),
+    ("select 1 if @x = 1 begin select 1 select 2 end else select 3 select [select] 'select' -- select\nfrom t",
+        ["select 1", "if @x = 1 begin select 1 select 2 end else select 3 select [select] 'select' -- select\nfrom t"]),
+    ("select 1 except select 2 intersect (select 3) set @a = 1", ["select 1 except select 2 intersect (select 3)", "set @a = 1"]),
+    ("(select 1) select 2; select 1 begin try select 2 end try begin catch select 3 end catch select 4 update t set a = 1",
+        ["(select 1) select 2", "select 1", "begin try select 2 end try begin catch select 3 end catch select 4 update t set a = 1"]),
+])
+def test_iter_statements_without_semicolons(sql, expected):
+    assert [sql[start:end] for start, end in iter_statements(sql)] == expected
+    assert [sql.encode()[start:end].decode() for start, end in iter_statements(sql.encode())] == expected
+
+def test_token_index():
+    sql = vpit + "\nGO\nselect a.b from t\nGO\n\n"
+    tokens = list(lex(sql))
+    index = TokenIndex.of(sql, tokens)
+    expected = [next((k for k, t in enumerate(tokens) if t.start <= p < t.end), None) for p in range(len(sql) + 1)]
+    assert [index.token_at(p) for p in range(len(sql) + 1)] == expected
+    assert index.tokens_at(list(range(len(sql), -1, -1))) == expected[::-1]
+    assert [find_token_at(tokens, p) for p in range(len(sql) + 1)] == [None if k is None else tokens[k] for k in expected]
+    assert TokenIndex.of(sql, lex_columnar(sql)).tokens_at(list(range(len(sql) + 1))) == expected
+    assert [t.value for t in tokens[index.tokens_in(len(vpit) + 11, len(vpit) + 16)]] == ["A.B", "FROM"]
+    assert [t.value for t in tokens[index.batch_tokens(1)]] == ["SELECT", "A.B", "FROM", "T"]
+    assert [index.batch_of(k) for k in (0, len(tokens) - 2, len(tokens) - 1)] == [0, 1, None] # GO lines are tokens too
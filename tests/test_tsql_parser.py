@@ -0,0 +1,175 @@
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from tsql_lexer import lex, iter_statements
+import pickle
+from tsql_parser import Parser, StreamParser, AstArena, ArenaNode, Node, N, TOKEN, parse_script
+
+QUERIES = [
+    "select a, b + 1 x from t left join u on t.a = u.a where a in (1, 2) and b is not null order by a",
+    "select top 10 t.*, count(*) over (partition by a order by b) from t with (nolock) union select 1",
+    "select a from t where exists (select 1 from u) and not (a > 1 or b like 'x%') and (c + 1) * 2 > 3",
+]
+
+def test_parser():
+    parser = Parser(QUERIES[0])
+    tree = parser.parse()
+    assert tree.type == N.query_especification and parser.idx == parser.n
+    assert [t.value for _, t in parser.walk(tree)][:4] == ['SELECT', 'A', ',', 'B']
+    # A nested parse does not move the outer cursor
+    parser.seek(2)
+    Parser(QUERIES[1]).parse()
+    assert parser.idx == 2 and parser.tokens[parser.idx].value == ','
+
+@pytest.mark.parametrize("sql, message", [
+    ("select a from", 'Error in "FROM" (L1:C10) idx 3 Table source expected.'),
+    ("select cast(a as int", 'Error in "INT" (L1:C18) idx 6 Unexpected EOF.'),
+    ("select cast(a as int from t", 'Error in "FROM" (L1:C22) idx 6 PARENTH_2 expected.'),
+    ("", 'Error in "" (L1:C1) idx 0 Unexpected EOF.'),
+])
+def test_parser_errors(sql, message):
+    with pytest.raises(Exception) as e:
+        Parser(sql).parse()
+    assert str(e.value) == message
+
+def test_ast_arena():
+    for sql in QUERIES:
+        parser = Parser(sql)
+        tree = parser.parse()
+        arena = AstArena.from_node(tree)
+        assert arena.root == tree and arena.to_node() == tree
+        assert Parser(sql).parse_arena() == arena == pickle.loads(pickle.dumps(arena))
+        assert parser.walk(arena.root) == parser.walk(tree)
+        assert arena.root.span == (0, parser.n)
+        for id in range(len(arena)):
+            children = list(arena.children(id))
+            assert all(arena.parent[child] == id for child in children)
+            if arena.types[id] == TOKEN:
+                assert not children and arena.end[id] == arena.start[id] + 1
+            elif children:
+                assert (arena.start[id], arena.end[id]) == (arena.start[children[0]], arena.end[children[-1]])
+    root = Parser(QUERIES[0]).parse_arena().root
+    select = root[0][0]
+    assert isinstance(select, ArenaNode) and select.type == N.select_clause and select[0] == 0
+    assert select.parent.parent == root and select.next_sibling.type == N.from_clause
+    assert len(root[0]) == 4 and root[0][-1].type == N.order_by_clause and root.parent is None
+
+def test_iter_walk():
+    parser = Parser(QUERIES[2])
+    tree = parser.parse()
+    items = list(parser.iter_walk(tree))
+    assert items[0] == ([], tree)
+    assert [t for _, t in items if not isinstance(t, Node)] == [t for _, t in parser.walk(tree)]
+    pre = [n for _, n in parser.iter_walk(tree, tokens=False)]
+    post = [n for _, n in parser.iter_walk(tree, order='post', tokens=False)]
+    assert len(pre) == len(post) and pre[0] is tree and post[-1] is tree
+    assert post.index(pre[1]) > post.index(pre[2])
+    # The path is the live stack
+    for path, n in parser.iter_walk(tree, types=[N.exists_condition], tokens=False):
+        assert n.type == N.exists_condition and [p.type for p in path][:2] == [N.query_especification, N.where_clause]
+    conditions = parser.iter_walk(Parser(QUERIES[2]).parse_arena().root, types={N.binary_condition}, tokens=False)
+    assert next(conditions)[1].type == N.binary_condition
+    with pytest.raises(ValueError):
+        next(parser.iter_walk(tree, order='in'))
+
+    # Deeper than the recursion limit
+    deep = root = Node(N.expression)
+    for _ in range(5000):
+        deep.append(Node(N.expression))
+        deep = deep[0]
+    deep.append(0)
+    assert [len(path) for path, _ in parser.iter_walk(root, types=())] == [5000]
+    assert len(parser.walk(root)[0][0]) == 5000
+
+def test_parser_threads():
+    queries = QUERIES * 50
+    expected = [Parser(sql).parse() for sql in queries]
+    with ThreadPoolExecutor(4) as pool:
+        assert list(pool.map(lambda sql: Parser(sql).parse(), queries)) == expected
+
+def test_stream_parser():
+    sql = ";\n".join(QUERIES * 3) + ";;"
+    parser = StreamParser(sql)
+    starts = []
+    for start, tree, tokens in parser.statements():
+        reference = Parser(sql)
+        reference.seek(start)
+        assert tree == reference.parse() and tokens == reference.tokens[start:reference.idx]
+        assert [t for _, t in parser.walk(tree)] == [t for _, t in reference.walk(tree)]
+        assert parser.base == start and len(parser.buf) < len(tokens) + StreamParser._CHUNK + 4
+        starts.append(start)
+    assert len(starts) == 9 and parser.n == len(list(lex(sql)))
+    assert [start for start, _, _ in StreamParser(None, lex(sql)).statements()] == starts
+    assert list(StreamParser(";;").statements()) == []
+    with pytest.raises(Exception, match='Error in "FROM" \\(offset 26\\) idx 8 Table source expected.'):
+        list(StreamParser(None, lex("select a from t; select b from")).statements())
+
+def test_parser_without_sql():
+    sql = "select a, b from t where a = 1"
+    assert Parser(None, lex(sql)).parse() == Parser(sql).parse()
+    assert Parser(None, []).tokens[0].start == 0
+    assert Parser(None, lex(sql + "  ")).tokens[-1].start == len(sql)
+    with pytest.raises(Exception, match='Error in "FROM" \\(offset 12\\) idx 5 Table source expected.'):
+        Parser(None, lex("select a, b from")).parse()
+
+def test_parse_using():
+    sql = "select parse(x as int using 'en-US'), try_parse('1' as datetime2 using @c), parse(y as date) from t"
+    parser = Parser(sql)
+    tree = parser.parse()
+    assert parser.idx == parser.n
+    assert [t.value for _, t in parser.walk(tree)][1:10] == ["PARSE", "(", "X", "AS", "INT", "USING", "'en-US'", ")", ","]
+
+def test_parser_nesting():
+    sql = "a"
+    for k in range(40):
+        sql = f"(iif({sql} > {k}, 1, 0) + 1)"
+    sql = f"select a from t where {sql} > 1 and ((b = 1) or (c) * 2 < 3) order by (a + 1) desc, b"
+    parser = Parser(sql)
+    tree = parser.parse()
+    # Exponential backtracking would never finish at this depth
+    assert parser.idx == parser.n and parser.speculating == 0
+    assert [t.value for _, t in parser.walk(tree)] == [t.value for t in parser.tokens[:parser.n]]
+    assert Parser(sql).parse() == tree
+    # Errors inside speculative parses still report the final failure
+    with pytest.raises(Exception, match='PARENTH_2 expected.'):
+        Parser("select a from t where ((a = 1) and (b + 1 > 2)").parse()
+    # A parenthesized expression fails the speculative rule without an exception
+    parser = Parser("(a + 1) * 2 > 1")
+    assert parser._parenthesized_condition() is None
+    parser.seek(0)
+    assert parser._speculate(parser._parenthesized_condition) is None and parser.idx == 0
+    parser = Parser("(a + 1 > 2)")
+    assert parser._speculate(parser._parenthesized_condition)[1] == parser.n
+
+def test_parse_script(tmp_path):
+    statements = [QUERIES[k % 3].replace("x%", "x;é%") for k in range(40)] + ["select 1 " + " union all select 1" * 300]
+    script = "".join(sql + (";\n" if k % 2 else "\n/* ; */\nGO\n") for k, sql in enumerate(statements))
+    path = tmp_path / "script.sql"
+    path.write_text(script, encoding="utf-8")
+    data = script.encode()
+    results = list(parse_script(path, workers=1, chunk_size=512))
+    assert [data[offset:offset + len(tokens.sql)].decode() for offset, _, tokens in results] == statements
+    for sql, (offset, arena, tokens) in zip(statements, results):
+        assert arena == Parser(sql).parse_arena() and arena.root.span == (0, len(tokens))
+        assert tokens.get_value(0) == b"select" and tokens[len(tokens) - 1].value == sql.split()[-1]
+    # Workers send back the same results
+    for (offset, arena, tokens), (offset2, arena2, tokens2) in zip(results, parse_script(path, workers=2, chunk_size=512)):
+        assert offset == offset2 and arena == arena2 and tokens.sql == tokens2.sql and tokens.start == tokens2.start
+    # Without semicolons nor GO lines the statements are still split between the chunks
+    path.write_text("\n".join(statements), encoding="utf-8")
+    single = list(parse_script(path, workers=1, chunk_size=512))
+    assert len(list(iter_statements(path.read_bytes()))) == len(statements)
+    assert [len(tokens.sql) for _, _, tokens in single] == [len(sql.encode()) for sql in statements]
+    assert [(offset, arena) for offset, arena, _ in parse_script(path, workers=2, chunk_size=512)] == [(offset, arena) for offset, arena, _ in single]
+    path.write_text(script + "select a from", encoding="utf-8")
+    with pytest.raises(Exception, match=f'Error in "FROM" \\(offset {len(data) + 9}\\)'):
+        list(parse_script(path, workers=2))
+
+def test_import_cost():
+    # parse_script() imports the process pool on first use only
+    code = "import sys, tsql_parser; print(sorted(m for m in ('concurrent.futures', 'multiprocessing', 'socket') if m in sys.modules))"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
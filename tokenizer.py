@@ -1,6 +1,14 @@
-from dataclasses import dataclass
-from typing import Iterator
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+from collections.abc import Iterator
+import re
+import mmap
+import os
 import string
+import sys
+import threading
+from sys import intern
 from enum import IntEnum
 
 class EnumTokenType(IntEnum):
@@ -20,20 +28,365 @@ class Mask(IntEnum):
 	DELIMITED = 0b00001000
 	COMMENT = 0b00010000
 
-@dataclass
+class MultipartName:
+	"""
+	Parts of a dotted name (server.database.schema.object, table.column...).
+
+	values holds the part values, spans a flat array('i') of the (start, end) offsets of
+	each part; blanks around the dots belong to no part. Indexing gives part values, so
+	name[-1] is the object or column and name[-2] its schema or table.
+
+	Tokens keep the name packed in one bytes object (see pack()) next to the joined value,
+	a single block instead of the parts, the tuple and the array.
+	"""
+	__slots__ = ('values', 'spans')
+
+	def __init__(self, values: tuple[str, ...], spans: array):
+		self.values = values
+		self.spans = spans
+
+	def __len__(self) -> int:
+		return len(self.values)
+
+	def __getitem__(self, idx: int) -> str:
+		return self.values[idx]
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self.values)
+
+	def span(self, idx: int) -> tuple[int, int]:
+		if idx < 0: idx += len(self.values)
+		return self.spans[2 * idx], self.spans[2 * idx + 1]
+
+	def moved(self, delta: int) -> 'MultipartName':
+		return MultipartName(self.values, array('i', (offset + delta for offset in self.spans)))
+
+	@staticmethod
+	def pack(values, spans) -> bytes:
+		"""spans followed by the length of each value, as array('i') bytes"""
+		packed = array('i', spans)
+		packed.extend(len(value) for value in values)
+		return packed.tobytes()
+
+	@classmethod
+	def unpack(cls, value: str, packed: bytes) -> 'MultipartName':
+		"""Name packed by pack(), with value the '.' joined values"""
+		spans = array('i')
+		spans.frombytes(packed)
+		count = len(spans) // 3
+		values, offset = [], 0
+		for length in spans[2 * count:]:
+			values.append(value[offset : offset + length])
+			offset += length + 1
+		del spans[2 * count:]
+		return cls(tuple(values), spans)
+
+	def __str__(self) -> str:
+		return '.'.join(self.values)
+
+	def __repr__(self) -> str:
+		return f'MultipartName({self.values!r}, {self.spans.tolist()!r})'
+
+	def __eq__(self, other) -> bool:
+		if other.__class__ is not self.__class__:
+			return NotImplemented
+		return self.values == other.values and self.spans == other.spans
+
+	__hash__ = None
+
 class Token:
-	start: int
-	end: int
-	type:int # 1 word, 2 number, 3 delimited_literal, 4 operator, 5 delimiter
-	value:str
-	value_id: int=None
+	"""
+	Token span, type and value.
+
+	Slotted to avoid a per-token __dict__. When value is not given it is sliced from
+	src (a str, or UTF-8 bytes-like data) on first access; keyword and operator values
+	are interned by the tokenizer. symbol_id is the SymbolTable id of an identifier,
+	or None when no symbol table was used. parts is the MultipartName of a dotted name,
+	unpacked from _parts on each access, or None.
+	"""
+	__slots__ = ('start', 'end', 'type', 'value_id', '_value', 'src', 'symbol_id', '_parts')
+
+	def __init__(self, start: int, end: int, type: int, value: str = None, value_id: int = None, src: str = None):
+		self.start = start
+		self.end = end
+		self.type = type # 1 word, 2 number, 3 delimited_literal, 4 operator, 5 delimiter
+		self.value_id = value_id
+		self._value = value
+		self.src = src
+		self.symbol_id = None
+		self._parts = None
+
+	@property
+	def value(self) -> str:
+		if (value := self._value) is None:
+			if self.src is not None:
+				value = self.src[self.start : self.end]
+				if value.__class__ is not str: value = str(value, 'utf-8')
+				self._value = value
+		return value
+
+	@value.setter
+	def value(self, value: str):
+		self._value = value
+
+	@property
+	def parts(self) -> MultipartName | None:
+		return None if self._parts is None else MultipartName.unpack(self._value, self._parts)
+
+	@parts.setter
+	def parts(self, name: MultipartName | None):
+		"""Also sets the value, joined from the parts"""
+		if name is None:
+			self._parts = None
+		else:
+			self._value, self._parts = '.'.join(name.values), MultipartName.pack(name.values, name.spans)
+
+	def __repr__(self) -> str:
+		return f'Token(start={self.start!r}, end={self.end!r}, type={self.type!r}, value={self.value!r}, value_id={self.value_id!r})'
+
+	def __eq__(self, other) -> bool:
+		if other.__class__ is not self.__class__:
+			return NotImplemented
+		return (self.start, self.end, self.type, self.value, self.value_id) == (other.start, other.end, other.type, other.value, other.value_id)
+
+	__hash__ = None
 
 	def get_value(self, sql):
 		return sql[self.start : self.end]
-	def get_position(self, sql: str) -> tuple[int, int]:
-		"""Get line number and column"""
-		lines = sql[:self.start].split('\n')
-		return len(lines), len(lines[-1]) + 1
+	def moved(self, delta: int, src=None) -> 'Token':
+		"""
+		Copy of the token delta positions further, slicing a lazy value from src. Without
+		src the value of the copy is taken from this token, it does not refer to any source.
+		"""
+		value = self._value
+		if src is None and value is None: value = self.value
+		token = Token(self.start + delta, self.end + delta, self.type, value, self.value_id, src)
+		token.symbol_id = self.symbol_id
+		if self._parts is not None: token.parts = self.parts.moved(delta)
+		return token
+	def detach(self):
+		"""Take the value out of the source, so that the token no longer refers to it"""
+		self._value = self.value
+		self.src = None
+	def get_position(self, sql: str, lines: 'LineIndex' = None) -> tuple[int, int]:
+		"""Get line number and column. Pass the LineIndex of sql when looking up many tokens."""
+		if lines is not None: return lines.position(self.start)
+		start = self.start
+		return sql.count('\n', 0, start) + 1, start - sql.rfind('\n', 0, start)
+
+class LineIndex:
+	"""
+	Offsets of the line breaks of a source text, built once and searched with bisect
+	to turn character offsets into 1-based (line, column) pairs in O(log n).
+	"""
+	__slots__ = ('newlines',)
+
+	def __init__(self, sql: str):
+		self.newlines = newlines = array('i')
+		append, find = newlines.append, sql.find
+		i = find('\n')
+		while i >= 0:
+			append(i)
+			i = find('\n', i + 1)
+
+	def position(self, offset: int) -> tuple[int, int]:
+		newlines = self.newlines
+		line = bisect_left(newlines, offset)
+		return line + 1, offset - newlines[line - 1] if line else offset + 1
+
+	def positions(self, offsets) -> list[tuple[int, int]]:
+		"""
+		Bulk position(). Ascending offsets, like the start column of a TokenArray,
+		are resolved with a linear merge; out of order ones fall back to bisect.
+		"""
+		newlines, result = self.newlines, []
+		append, count = result.append, len(newlines)
+		line, previous = 0, -1
+		for offset in offsets:
+			if offset < previous:
+				line = bisect_left(newlines, offset)
+			while line < count and newlines[line] < offset:
+				line += 1
+			append((line + 1, offset - newlines[line - 1] if line else offset + 1))
+			previous = offset
+		return result
+
+class TokenArray:
+	"""
+	Columnar token container: parallel array('i') columns instead of one Token per token.
+
+	A missing value_id or symbol_id is stored as 0 (ids start at 1). Values are not
+	stored, they are sliced from the source text when a token is materialised.
+	"""
+	__slots__ = ('sql', 'start', 'end', 'type', 'value_id', 'symbol_id')
+
+	def __init__(self, sql: str, tokens=()):
+		self.sql = sql
+		self.start, self.end, self.type, self.value_id, self.symbol_id = array('i'), array('i'), array('i'), array('i'), array('i')
+		self.extend(tokens)
+
+	def append(self, token: Token):
+		self.start.append(token.start)
+		self.end.append(token.end)
+		self.type.append(token.type)
+		self.value_id.append(token.value_id or 0)
+		self.symbol_id.append(token.symbol_id or 0)
+
+	def extend(self, tokens, delta: int = 0):
+		"""Append tokens, delta positions further"""
+		start, end, type, value_id, symbol_id = self.start.append, self.end.append, self.type.append, self.value_id.append, self.symbol_id.append
+		for t in tokens:
+			start(t.start + delta); end(t.end + delta); type(t.type); value_id(t.value_id or 0); symbol_id(t.symbol_id or 0)
+
+	def __len__(self) -> int:
+		return len(self.start)
+
+	def __getitem__(self, idx: int) -> Token:
+		token = Token(self.start[idx], self.end[idx], self.type[idx], None, self.value_id[idx] or None, self.sql)
+		token.symbol_id = self.symbol_id[idx] or None
+		return token
+
+	def __iter__(self) -> Iterator[Token]:
+		for idx in range(len(self.start)):
+			yield self[idx]
+
+	def get_value(self, idx: int) -> str:
+		return self.sql[self.start[idx] : self.end[idx]]
+
+	def positions(self, lines: 'LineIndex' = None) -> list[tuple[int, int]]:
+		"""Line and column of every token start"""
+		if lines is not None: return lines.positions(self.start)
+		# Without an index, count the newlines between consecutive starts
+		sql, result = self.sql, []
+		count, rfind, append = sql.count, sql.rfind, result.append
+		line, previous = 1, 0
+		for offset in self.start:
+			if offset < previous: line, previous = 1, 0
+			line += count('\n', previous, offset)
+			previous = offset
+			append((line, offset - rfind('\n', 0, offset)))
+		return result
+
+class Trivia:
+	"""
+	Comments and whitespace around tokens, kept out of the token stream.
+
+	Filled by divert() and attach() while tokenizing with comments=True: divert() drops
+	comments from the stream into spans, a flat array('i') of (start, end) pairs, and
+	attach() records for the token at each index i of the final stream:
+
+	- edges[i]: where its leading trivia starts. It runs to the token start, and the
+	  trailing trivia of the previous token runs from that token's end to edges[i].
+	  Trailing trivia stops after the first line break outside a comment.
+	- lead_from[i], trail_from[i]: index of the first leading and trailing comment.
+
+	edges and lead_from get one more entry for the trivia after the last token.
+	Comments inside a token, such as between the words of a merged keyword, count as
+	leading trivia of that token.
+	"""
+	__slots__ = ('text', 'spans', 'edges', 'lead_from', 'trail_from')
+
+	def __init__(self):
+		self.text = None
+		self.spans, self.edges, self.lead_from, self.trail_from = array('i'), array('i'), array('i'), array('i')
+
+	def divert(self, tokens: Iterator[Token]) -> Iterator[Token]:
+		"""Tokens without the comments, which are appended to spans."""
+		append, COMMENT = self.spans.append, Mask.COMMENT
+		for t in tokens:
+			if t.type & COMMENT:
+				append(t.start)
+				append(t.end)
+			else:
+				yield t
+
+	def attach(self, tokens: Iterator[Token], text: str, pos: int = 0) -> Iterator[Token]:
+		"""Pass tokens through, recording the trivia around each one."""
+		self.text = text
+		spans, edges, lead_from, trail_from = self.spans, self.edges, self.lead_from, self.trail_from
+		edge, c, end = pos, 0, None
+		for t in tokens:
+			if end is not None:
+				edge = self._edge(end, t.start, c)
+			while 2 * c < len(spans) and spans[2 * c] < edge: c += 1
+			edges.append(edge)
+			lead_from.append(c)
+			end = t.end
+			while 2 * c < len(spans) and spans[2 * c] < end: c += 1
+			trail_from.append(c)
+			yield t
+		if end is not None:
+			edge = self._edge(end, len(text), c)
+		while 2 * c < len(spans) and spans[2 * c] < edge: c += 1
+		edges.append(edge)
+		lead_from.append(c)
+
+	def _edge(self, end: int, next_start: int, c: int) -> int:
+		text, spans = self.text, self.spans
+		n, find = len(spans) // 2, text.find
+		while c < n and spans[2 * c] < next_start:
+			if (newline := find('\n', end, spans[2 * c])) >= 0:
+				return newline + 1
+			end = min(spans[2 * c + 1], len(text))
+			if text[end - 1] == '\n':
+				return end
+			c += 1
+		newline = find('\n', end, next_start)
+		return newline + 1 if newline >= 0 else max(end, min(next_start, len(text)))
+
+	def __len__(self) -> int:
+		return len(self.trail_from)
+
+	def comment(self, idx: int) -> tuple[int, int]:
+		return self.spans[2 * idx], self.spans[2 * idx + 1]
+
+	def leading(self, idx: int) -> list[tuple[int, int]]:
+		"""Comment spans in the leading trivia of token idx; idx == len(self) for the end of text."""
+		stop = self.trail_from[idx] if idx < len(self.trail_from) else len(self.spans) // 2
+		return [self.comment(c) for c in range(self.lead_from[idx], stop)]
+
+	def trailing(self, idx: int) -> list[tuple[int, int]]:
+		"""Comment spans in the trailing trivia of token idx."""
+		return [self.comment(c) for c in range(self.trail_from[idx], self.lead_from[idx + 1])]
+
+class SymbolTable:
+	"""
+	Stable small integer ids for normalised identifiers, shared across texts.
+
+	Each name is stored once as an interned string, so tokens can share it instead of
+	holding their own copy. Ids start at 1 and are never reused. Lookups are lock free;
+	adding a new name takes a lock, so one table can be shared between threads.
+	"""
+	__slots__ = ('ids', 'names', '_lock')
+
+	def __init__(self, names=()):
+		self.ids: dict[str, int] = {}
+		self.names: list[str] = [None]
+		self._lock = threading.Lock()
+		for name in names:
+			self.add(name)
+
+	def add(self, name: str) -> int:
+		"""Id of name, assigning the next one if it is new"""
+		if (id := self.ids.get(name)) is None:
+			with self._lock:
+				if (id := self.ids.get(name)) is None:
+					id = len(self.names)
+					self.names.append(intern(name))
+					self.ids[self.names[id]] = id
+		return id
+
+	def get(self, name: str) -> int | None:
+		return self.ids.get(name)
+
+	def name(self, id: int) -> str:
+		return self.names[id]
+
+	def __len__(self) -> int:
+		return len(self.names) - 1
+
+	def __contains__(self, name: str) -> bool:
+		return name in self.ids
 
 def tokenize(
 	text: str,
@@ -46,10 +399,26 @@ def tokenize(
 	operators2chars=frozenset(['<>', '<=', '>=']),
 	is_identifier = None,
 	value_hash={},
-	comments = False
+	comments = False,
+	backend = 'loop',
+	pos = 0
 ) -> Iterator[Token]:
 	
-	text, i, n, linecomment_len = text + '\n', 0, len(text) + 1, len(line_comment)
+	if backend == 'regex':
+		scanner = _compile_scanner(frozenset(word_start), frozenset(word_chars), tuple(delimited_constructs.items()),
+							 line_comment, block_comments[0], frozenset(operators1char), frozenset(operators2chars),
+							 'ascii' if text.isascii() else 'unicode')
+		yield from _tokenize_regex(text, scanner.finditer, block_comments, is_identifier, value_hash, comments, pos)
+		return
+	elif backend == 'numpy':
+		yield from _tokenize_numpy(text, frozenset(word_start), frozenset(word_chars), delimited_constructs, line_comment,
+							 block_comments, frozenset(operators1char), frozenset(operators2chars), is_identifier,
+							 value_hash, comments, pos)
+		return
+	elif backend != 'loop':
+		raise ValueError(f'Unknown tokenizer backend "{backend}".')
+
+	text, i, n, linecomment_len = text + '\n', pos, len(text) + 1, len(line_comment)
 
 	block_opening, block_closing = block_comments[0], block_comments[1]
 	opening_len, closing_len = len(block_opening), len(block_closing)
@@ -62,7 +431,8 @@ def tokenize(
 		if c in word_start:
 			while i < n and text[i] in word_chars: i += 1
 			value = text[start:i].upper()
-			yield Token(start, i, type=EnumTokenType.IDENTIFIER, value=value, value_id=value_hash.get(value)); continue
+			if (value_id := value_hash.get(value)) is not None: value = intern(value)
+			yield Token(start, i, type=EnumTokenType.IDENTIFIER, value=value, value_id=value_id); continue
 
 		# Number
 		dot = False
@@ -76,13 +446,13 @@ def tokenize(
 				while i < n and text[i].isdigit(): i += 1
 
 			if text[i] not in('E','e'):
-				yield Token(start, i, type=EnumTokenType.INTEGER if dot==False else EnumTokenType.DECIMAL, value=text[start:i])
+				yield Token(start, i, type=EnumTokenType.INTEGER if dot==False else EnumTokenType.DECIMAL, src=text)
 			else:
 				i += 1
 				if text[i] in ('+', '-'):
 					i += 1
 				while i < n and text[i].isdigit(): i += 1
-				yield Token(start, i, type=EnumTokenType.INTEGER if dot==False else EnumTokenType.DECIMAL, value=text[start:i])
+				yield Token(start, i, type=EnumTokenType.INTEGER if dot==False else EnumTokenType.DECIMAL, src=text)
 			continue
 
 		# Line comment
@@ -90,7 +460,7 @@ def tokenize(
 			start = i
 			i = text.find('\n', i+2) + 1 or n; 
 			if comments:
-				yield Token(start, i, type=EnumTokenType.LINE_COMMENT, value=text[start:i])
+				yield Token(start, i, type=EnumTokenType.LINE_COMMENT, src=text)
 			continue
 
 		# Block comment
@@ -102,7 +472,7 @@ def tokenize(
 				elif text[i:i+closing_len] == block_closing: depth -= 1; i += closing_len
 				else: i += 1
 			if comments:
-				yield Token(start, i, type=EnumTokenType.BLOCK_COMMENT, value=text[start:i])
+				yield Token(start, i, type=EnumTokenType.BLOCK_COMMENT, src=text)
 			continue
 
 		# Delimited literal
@@ -116,17 +486,390 @@ def tokenize(
 			if is_identifier != None and is_identifier(value): 
 				ty = EnumTokenType.IDENTIFIER
 				value_id = value_hash.get(value)
-			else: ty = EnumTokenType.DELIMITED_LITERAL
-			yield Token(start, i, type=ty, value=value, value_id=value_id)
+			else: 
+				ty, value = EnumTokenType.DELIMITED_LITERAL, None
+			yield Token(start, i, type=ty, value=value, value_id=value_id, src=text)
 			continue
 
 		# Operator / delimiter
-		if text[i:i+2] in operators2chars:
-			value = text[i:i+2]
-			yield Token(i, i+2, type=EnumTokenType.OPERATOR, value=value, value_id=value_hash.get(value)); i += 2
+		if (value := text[i:i+2]) in operators2chars:
+			if (value_id := value_hash.get(value)) is not None: value = intern(value)
+			yield Token(i, i+2, type=EnumTokenType.OPERATOR, value=value, value_id=value_id); i += 2
 		elif c in operators1char:
-			value = text[i:i+1]
-			yield Token(i, i+1, type=EnumTokenType.OPERATOR, value=value, value_id=value_hash.get(value)); i += 1
+			yield Token(i, i+1, type=EnumTokenType.OPERATOR, value=c, value_id=value_hash.get(c)); i += 1
+		else:
+			yield Token(i, i+1, type=EnumTokenType.DELIMITER, value=c, value_id=value_hash.get(c)); i += 1
+
+
+@lru_cache(maxsize=None)
+def _unicode_digits() -> str:
+	"""Characters accepted by str.isdigit() that the regex \\d class (str.isdecimal()) does not."""
+	return ''.join(c for c in map(chr, range(0x80, sys.maxunicode + 1)) if c.isdigit() and not c.isdecimal())
+
+def _char_class(chars) -> str:
+	return '[' + ''.join(re.escape(c) for c in sorted(chars)) + ']'
+
+@lru_cache(maxsize=32)
+def _compile_scanner(word_start, word_chars, delimited_constructs, line_comment, block_opening,
+					 operators1char, operators2chars, mode) -> re.Pattern:
+	"""
+	Compile the tokenizer parameters into one alternation regex.
+
+	Alternatives are listed in the same order as the branches of the loop backend,
+	so the first one that matches is the one the loop would have taken. Nested block
+	comments cannot be expressed as a regex: only the opening marker is matched and
+	the caller skips the body.
+
+	mode is 'ascii' or 'unicode' for str input and 'bytes' for UTF-8 buffers, where a
+	delimiter is a whole multi-byte character and only ASCII digits and spaces count.
+	"""
+	digit = '[\\d' + re.escape(_unicode_digits()) + ']' if mode == 'unicode' else '[0-9]'
+	exponent = f'(?:[eE][+-]?{digit}*)?'
+	# The loop searches the end of a line comment from 2 characters after its start
+	skipped = '(?s:.)' * max(0, 2 - len(line_comment))
+	delimited = '|'.join(
+		f'{re.escape(opening)}[^{re.escape(closing)}]*(?:{re.escape(closing * 2)}[^{re.escape(closing)}]*)*{re.escape(closing)}?'
+		for opening, closing in delimited_constructs)
+	never = '(?!)'
+	pattern = '|'.join([
+		f'({_char_class(word_start)}{_char_class(word_chars)}*)',
+		f'({digit}+(?:\\.{digit}*)?{exponent})',
+		f'(\\.{digit}+{exponent})',
+		f'({re.escape(line_comment)}{skipped}[^\\n]*\\n?)',
+		f'({re.escape(block_opening)})',
+		f'({delimited or never})',
+		f'({"|".join(re.escape(o) for o in sorted(operators2chars) if len(o) == 2) or never})',
+		f'({_char_class(operators1char) if operators1char else never})',
+		'([\\xc0-\\xff][\\x80-\\xbf]*|[^\\t-\\r\\x1c- ])' if mode == 'bytes' else '(\\S)',
+	])
+	return re.compile(pattern.encode('ascii') if mode == 'bytes' else pattern)
+
+# Group numbers of the _compile_scanner() alternatives
+_WORD, _INTEGER, _DECIMAL, _LINE_COMMENT, _BLOCK_COMMENT, _DELIMITED, _OPERATOR2, _OPERATOR1, _DELIMITER = range(1, 10)
+
+def _skip_block_comment(find, i, n, block_opening, block_closing) -> int:
+	"""End of a nested block comment opened before i: the earliest marker wins, an opening one on ties."""
+	opening_len, closing_len, depth = len(block_opening), len(block_closing), 1
+	while depth:
+		closing = find(block_closing, i)
+		if closing < 0: return n
+		opening = find(block_opening, i, closing + opening_len)
+		if opening >= 0: depth += 1; i = opening + opening_len
+		else: depth -= 1; i = closing + closing_len
+	return i
+
+def _tokenize_regex(text, finditer, block_comments, is_identifier, value_hash, comments, pos, padded=False) -> Iterator[Token]:
+	"""Regex backend of tokenize(). Emits exactly the same tokens as the loop backend."""
+	if not padded: text = text + '\n'
+	i, n = pos, len(text)
+	block_opening, block_closing = block_comments[0], block_comments[1]
+	find = text.find
+	get_id = value_hash.get
+	IDENTIFIER, INTEGER, DECIMAL, DELIMITED_LITERAL, OPERATOR, DELIMITER = EnumTokenType.IDENTIFIER, EnumTokenType.INTEGER, \
+		EnumTokenType.DECIMAL, EnumTokenType.DELIMITED_LITERAL, EnumTokenType.OPERATOR, EnumTokenType.DELIMITER
+
+	while i < n:
+		for m in finditer(text, i):
+			kind = m.lastindex
+			start, i = m.span()
+
+			if kind == _WORD:
+				value = text[start:i].upper()
+				if (value_id := get_id(value)) is not None: value = intern(value)
+				yield Token(start, i, IDENTIFIER, value, value_id)
+			elif kind >= _OPERATOR2:
+				value = text[start:i]
+				if (value_id := get_id(value)) is not None: value = intern(value)
+				yield Token(start, i, DELIMITER if kind == _DELIMITER else OPERATOR, value, value_id)
+			elif kind == _INTEGER or kind == _DECIMAL:
+				yield Token(start, i, INTEGER if kind == _INTEGER else DECIMAL, None, None, text)
+			elif kind == _DELIMITED:
+				value = text[start:i]
+				if is_identifier != None and is_identifier(value):
+					yield Token(start, i, IDENTIFIER, value, get_id(value))
+				else:
+					yield Token(start, i, DELIMITED_LITERAL, None, None, text)
+			elif kind == _LINE_COMMENT:
+				if comments:
+					yield Token(start, i, EnumTokenType.LINE_COMMENT, None, None, text)
+			else:
+				# The body is skipped with str.find, so the scan restarts after it
+				i = _skip_block_comment(find, i, n, block_opening, block_closing)
+				if comments:
+					yield Token(start, i, EnumTokenType.BLOCK_COMMENT, None, None, text)
+				break
+		else:
+			break
+
+_SPACE, _WORD_CHAR, _WORD_START, _SINGLE = 1, 2, 4, 8
+
+@lru_cache(maxsize=32)
+def _numpy_table(word_start, word_chars, irregular):
+	"""Class bits of each byte for _tokenize_numpy(); 0 for the characters left to the regex scanner."""
+	import numpy
+	table = numpy.zeros(256, numpy.uint8)
+	for code in range(128):
+		c = chr(code)
+		if c.isspace(): table[code] = _SPACE
+		elif c in word_chars: table[code] = _WORD_CHAR | (_WORD_START if c in word_start else 0)
+		elif c not in irregular and c not in word_start: table[code] = _SINGLE
+	return table
+
+def _tokenize_numpy(text, word_start, word_chars, delimited_constructs, line_comment, block_comments,
+					operators1char, operators2chars, is_identifier, value_hash, comments, pos) -> Iterator[Token]:
+	"""
+	NumPy backend of tokenize(). Emits exactly the same tokens as the loop backend.
+
+	Every character is classified at once with a lookup table, and the word runs and
+	single character tokens are found with vectorised comparisons and flatnonzero().
+	Identifiers, keywords and one character operators and delimiters come straight
+	from those arrays. Numbers, literals, comments and two character operators are
+	matched one at a time with the regex scanner, until the next token boundary NumPy
+	found. Non-ASCII text is tokenized by the regex backend.
+	"""
+	import numpy
+	scanner = _compile_scanner(word_start, word_chars, tuple(delimited_constructs.items()), line_comment,
+						block_comments[0], operators1char, operators2chars, 'ascii' if text.isascii() else 'unicode')
+	if not text.isascii():
+		yield from _tokenize_regex(text, scanner.finditer, block_comments, is_identifier, value_hash, comments, pos)
+		return
+
+	starters = frozenset(''.join(delimited_constructs) + line_comment[:1] + block_comments[0][:1]
+						 + ''.join(operator[0] for operator in operators2chars))
+	text = text + '\n'
+	codes = numpy.frombuffer(text.encode('ascii'), numpy.uint8)
+	classes = _numpy_table(word_start, word_chars, starters | frozenset(string.digits + '.'))[codes]
+	if '.' not in word_chars and '.' not in word_start and '.' not in starters:
+		# A dot not followed by a digit can only be a one character token
+		dots = numpy.flatnonzero(codes[:-1] == ord('.'))
+		classes[dots[(codes[dots + 1] < ord('0')) | (codes[dots + 1] > ord('9'))]] = _SINGLE
+	word = (classes & _WORD_CHAR) != 0
+	run_start = word.copy()
+	run_start[1:] &= ~word[:-1]
+	run_ends = numpy.append(numpy.flatnonzero(word[:-1] & ~word[1:]) + 1, len(text))
+	starts = run_start | ((classes & (_SPACE | _WORD_CHAR)) == 0)
+	if 0 < pos < len(text) - 1 and word[pos] and word[pos - 1]:
+		# Starting inside a word run: scan from pos as an irregular region
+		starts[pos], classes[pos] = True, 0
+	events = numpy.flatnonzero(starts)
+	ends = run_ends[numpy.searchsorted(run_ends, events, 'right')]
+
+	upper, get_id, match, find, n = text.upper(), value_hash.get, scanner.match, text.find, len(text)
+	block_opening, block_closing = block_comments
+	IDENTIFIER, INTEGER, DECIMAL, DELIMITED_LITERAL, OPERATOR, DELIMITER = EnumTokenType.IDENTIFIER, EnumTokenType.INTEGER, \
+		EnumTokenType.DECIMAL, EnumTokenType.DELIMITED_LITERAL, EnumTokenType.OPERATOR, EnumTokenType.DELIMITER
+
+	i = pos
+	for start, kind, end in zip(events.tolist(), classes[events].tolist(), ends.tolist()):
+		if start < i: continue
+		if kind & _WORD_START:
+			value = upper[start:end]
+			if (value_id := get_id(value)) is not None: value = intern(value)
+			yield Token(start, end, IDENTIFIER, value, value_id)
+			i = end
+			continue
+		if kind & _SINGLE:
+			c = text[start]
+			yield Token(start, start + 1, OPERATOR if c in operators1char else DELIMITER, c, get_id(c))
+			i = start + 1
+			continue
+
+		# Irregular region: one regex token at a time, up to a boundary found by NumPy.
+		# A token ending inside a word run (a number before letters) continues it.
+		i, resume = start, True
+		while resume:
+			m = match(text, i)
+			start, i = m.span()
+			kind = m.lastindex
+			if kind == _WORD:
+				value = upper[start:i]
+				if (value_id := get_id(value)) is not None: value = intern(value)
+				yield Token(start, i, IDENTIFIER, value, value_id)
+			elif kind >= _OPERATOR2:
+				value = text[start:i]
+				if (value_id := get_id(value)) is not None: value = intern(value)
+				yield Token(start, i, DELIMITER if kind == _DELIMITER else OPERATOR, value, value_id)
+			elif kind == _INTEGER or kind == _DECIMAL:
+				yield Token(start, i, INTEGER if kind == _INTEGER else DECIMAL, None, None, text)
+			elif kind == _DELIMITED:
+				value = text[start:i]
+				if is_identifier != None and is_identifier(value):
+					yield Token(start, i, IDENTIFIER, value, get_id(value))
+				else:
+					yield Token(start, i, DELIMITED_LITERAL, None, None, text)
+			elif kind == _LINE_COMMENT:
+				if comments:
+					yield Token(start, i, EnumTokenType.LINE_COMMENT, None, None, text)
+			else:
+				i = _skip_block_comment(find, i, n, block_opening, block_closing)
+				if comments:
+					yield Token(start, i, EnumTokenType.BLOCK_COMMENT, None, None, text)
+			resume = i < n - 1 and text[i] in word_chars and text[i - 1] in word_chars
+
+def tokenize_bytes(
+	data,
+	word_start=frozenset('_@#' + string.ascii_letters),
+	word_chars=frozenset('_@#$' + string.ascii_letters + string.digits),
+	delimited_constructs={"'": "'", '"': '"', '[': "]"},
+	line_comment='--',
+	block_comments=['/*', '*/'],
+	operators1char=frozenset('><=-+*/%&|^~'),
+	operators2chars=frozenset(['<>', '<=', '>=']),
+	is_identifier = None,
+	value_hash={},
+	comments = False,
+	pos = 0
+) -> Iterator[Token]:
+	"""
+	Tokenize UTF-8 encoded bytes, a memoryview or a mmap without copying it, from byte
+	offset pos.
+
+	Same rules as tokenize(backend='regex') but offsets are byte offsets (see Utf8Offsets)
+	and the end of input is the end of the buffer: unterminated comments and literals
+	end at len(data) instead of one past it. Only ASCII digits and whitespace are
+	recognised and the tokenizer parameters must be ASCII. Values not needed to look
+	up value_hash are decoded from data on first access.
+	"""
+	scanner = _compile_scanner(frozenset(word_start), frozenset(word_chars), tuple(delimited_constructs.items()),
+						line_comment, block_comments[0], frozenset(operators1char), frozenset(operators2chars), 'bytes')
+	return _tokenize_bytes(data, scanner.finditer, block_comments, is_identifier, value_hash, comments, pos)
+
+def _tokenize_bytes(data, finditer, block_comments, is_identifier, value_hash, comments, pos=0) -> Iterator[Token]:
+	i, n = pos, len(data)
+	search_opening = re.compile(re.escape(block_comments[0].encode('ascii'))).search
+	search_closing = re.compile(re.escape(block_comments[1].encode('ascii'))).search
+	opening_len = len(block_comments[0])
+	get_id = value_hash.get
+	IDENTIFIER, INTEGER, DECIMAL, DELIMITED_LITERAL, OPERATOR, DELIMITER = EnumTokenType.IDENTIFIER, EnumTokenType.INTEGER, \
+		EnumTokenType.DECIMAL, EnumTokenType.DELIMITED_LITERAL, EnumTokenType.OPERATOR, EnumTokenType.DELIMITER
+
+	while i < n:
+		for m in finditer(data, i):
+			kind = m.lastindex
+			start, i = m.span()
+
+			if kind == _WORD:
+				value = m.group().upper().decode('ascii')
+				if (value_id := get_id(value)) is not None: value = intern(value)
+				yield Token(start, i, IDENTIFIER, value, value_id)
+			elif kind >= _OPERATOR2:
+				value = m.group().decode('utf-8')
+				if (value_id := get_id(value)) is not None: value = intern(value)
+				yield Token(start, i, DELIMITER if kind == _DELIMITER else OPERATOR, value, value_id)
+			elif kind == _INTEGER or kind == _DECIMAL:
+				yield Token(start, i, INTEGER if kind == _INTEGER else DECIMAL, None, None, data)
+			elif kind == _DELIMITED:
+				if is_identifier != None and is_identifier(value := m.group().decode('utf-8')):
+					yield Token(start, i, IDENTIFIER, value, get_id(value))
+				else:
+					yield Token(start, i, DELIMITED_LITERAL, None, None, data)
+			elif kind == _LINE_COMMENT:
+				if comments:
+					yield Token(start, i, EnumTokenType.LINE_COMMENT, None, None, data)
+			else:
+				depth = 1
+				while depth:
+					if (closing := search_closing(data, i)) is None: i = n; break
+					if (opening := search_opening(data, i, closing.start() + opening_len)) is not None:
+						depth += 1; i = opening.end()
+					else:
+						depth -= 1; i = closing.end()
+				if comments:
+					yield Token(start, i, EnumTokenType.BLOCK_COMMENT, None, None, data)
+				break
 		else:
-			value = text[i:i+1]
-			yield Token(i, i+1, type=EnumTokenType.DELIMITER, value=value, value_id=value_hash.get(value)); i += 1
+			break
+
+def map_file(path):
+	"""
+	Read-only memory map of a file, or b'' when it is empty.
+
+	The map is released once it, and every token that lazily slices its value from it,
+	have been garbage collected.
+	"""
+	with open(path, 'rb') as f:
+		if os.fstat(f.fileno()).st_size == 0:
+			return b''
+		return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def tokenize_file(path, **kwargs) -> Iterator[Token]:
+	"""Tokenize a UTF-8 file through a read-only memory map (see tokenize_bytes())."""
+	return tokenize_bytes(map_file(path), **kwargs)
+
+class Utf8Offsets:
+	"""
+	Maps byte offsets of UTF-8 data to character offsets.
+
+	Only the multi-byte characters are recorded, so pure ASCII input costs nothing
+	and each lookup is a bisect over them.
+	"""
+	__slots__ = ('starts', 'extra')
+
+	def __init__(self, data):
+		self.starts, self.extra = array('q'), array('q')
+		extra = 0
+		for m in re.finditer(rb'[\xc0-\xff][\x80-\xbf]*', data):
+			extra += m.end() - m.start() - 1
+			self.starts.append(m.start())
+			self.extra.append(extra)
+
+	def char_offset(self, offset: int) -> int:
+		k = bisect_left(self.starts, offset)
+		return offset - self.extra[k - 1] if k else offset
+
+	def char_offsets(self, offsets) -> list[int]:
+		return [self.char_offset(o) for o in offsets]
+
+class TokenizerProfile:
+	"""
+	Tokenizer configuration compiled once and reused across calls.
+
+	Holds the frozen character tables, the value_hash lookup and the scanning regexes
+	built by _compile_scanner() (one alternation whose first-character checks dispatch
+	to the token rule), so tokenizing a short text costs no per-call setup.
+	"""
+	__slots__ = ('word_start', 'word_chars', 'delimited_constructs', 'line_comment', 'block_comments', 'operators1char',
+				 'operators2chars', 'is_identifier', 'value_hash', '_key', '_ascii', '_unicode', '_bytes')
+
+	def __init__(self,
+				word_start=frozenset('_@#' + string.ascii_letters),
+				word_chars=frozenset('_@#$' + string.ascii_letters + string.digits),
+				delimited_constructs={"'": "'", '"': '"', '[': "]"},
+				line_comment='--',
+				block_comments=['/*', '*/'],
+				operators1char=frozenset('><=-+*/%&|^~'),
+				operators2chars=frozenset(['<>', '<=', '>=']),
+				is_identifier = None,
+				value_hash={}):
+		self.word_start, self.word_chars = frozenset(word_start), frozenset(word_chars)
+		self.delimited_constructs = dict(delimited_constructs)
+		self.line_comment, self.block_comments = line_comment, (block_comments[0], block_comments[1])
+		self.operators1char, self.operators2chars = frozenset(operators1char), frozenset(operators2chars)
+		self.is_identifier, self.value_hash = is_identifier, value_hash
+		self._key = (self.word_start, self.word_chars, tuple(self.delimited_constructs.items()), line_comment,
+					 block_comments[0], self.operators1char, self.operators2chars)
+		# Scanners are compiled on first use, profiles are cheap to create at import time
+		self._ascii = self._unicode = self._bytes = None
+
+	def tokenize(self, text: str, comments = False, backend = 'regex', pos = 0) -> Iterator[Token]:
+		"""tokenize() with this profile"""
+		if backend == 'regex':
+			if text.isascii(): finditer = self._ascii or self._scanner('ascii')
+			else: finditer = self._unicode or self._scanner('unicode')
+			return _tokenize_regex(text, finditer, self.block_comments, self.is_identifier, self.value_hash, comments, pos)
+		return tokenize(text, self.word_start, self.word_chars, self.delimited_constructs, self.line_comment, self.block_comments,
+				  self.operators1char, self.operators2chars, self.is_identifier, self.value_hash, comments, backend, pos)
+
+	def tokenize_bytes(self, data, comments = False, pos = 0) -> Iterator[Token]:
+		"""tokenize_bytes() with this profile"""
+		finditer = self._bytes or self._scanner('bytes')
+		return _tokenize_bytes(data, finditer, self.block_comments, self.is_identifier, self.value_hash, comments, pos)
+
+	def tokenize_file(self, path, comments = False) -> Iterator[Token]:
+		"""tokenize_file() with this profile"""
+		return self.tokenize_bytes(map_file(path), comments)
+
+	def _scanner(self, mode):
+		finditer = _compile_scanner(*self._key, mode).finditer
+		setattr(self, '_' + mode, finditer)
+		return finditer
@@ -0,0 +1,101 @@
+from collections import OrderedDict, namedtuple
+from threading import Lock
+from tokenizer import Token
+from tsql_lexer import lex
+from tsql_parser import Parser, Node, AstArena
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'shape_hits', 'misses', 'evictions', 'currsize', 'maxsize', 'tokens'])
+
+def _shape(tokens: list[Token]) -> tuple[int, ...]:
+	"""
+	What the rules see of the tokens: the value id of keywords and operators, the type
+	of the other tokens, and for identifiers whether they start with @ (OPENXML takes
+	a variable). Literal values and identifier names do not change the tree.
+	"""
+	return tuple(t.value_id if t.value_id is not None else -2 * t.type - (t.value[0] == '@') - 1 for t in tokens)
+
+class ParseCache:
+	"""
+	Bounded LRU cache of parse results, safe to share between threads.
+
+	Entries are keyed by the exact query text. With shapes, a query missing from the
+	cache reuses the tree of a cached query with the same token shape, a literal and
+	identifier normalized fingerprint of the token list: the two queries only differ
+	in literal values and identifier names, so the rules take the same path and the
+	token indices of the tree stay valid for the new tokens. Unlike fingerprint_hash()
+	the shape keeps every token, IN lists of different lengths parse to different trees.
+
+	The least recently used entries are evicted past maxsize entries or, when set,
+	past max_tokens tokens over all entries. Parsing happens outside the lock, so two
+	threads missing the same text may both parse it.
+	"""
+	__slots__ = ('maxsize', 'max_tokens', 'shapes', 'arena', '_entries', '_shapes', '_lock', '_tokens', 'hits', 'shape_hits', 'misses', 'evictions')
+
+	def __init__(self, maxsize: int = 1024, shapes = False, max_tokens: int = None, arena = False):
+		"""
+		Args:
+			maxsize (int): Maximum number of entries.
+			shapes (bool): Also reuse the trees of queries with the same token shape.
+			max_tokens (int): Maximum number of tokens over all entries, None for no limit.
+			arena (bool): Keep the trees as AstArena instead of Node.
+		"""
+		self.maxsize, self.max_tokens, self.shapes, self.arena = maxsize, max_tokens, shapes, arena
+		self._entries = OrderedDict() # sql: (tree, tokens, shape)
+		self._shapes = {} # shape: sql of an entry with that shape
+		self._lock = Lock()
+		self._tokens = 0
+		self.hits = self.shape_hits = self.misses = self.evictions = 0
+
+	def parse(self, sql: str) -> tuple[Node | AstArena, list[Token]]:
+		"""
+		Tree of the query expression at the start of sql, and the tokens of sql its token
+		indices refer to. Both are shared with other callers and must not be modified.
+		"""
+		with self._lock:
+			if (entry := self._entries.get(sql)) is not None:
+				self._entries.move_to_end(sql)
+				self.hits += 1
+				return entry[0], entry[1]
+
+		tokens = list(lex(sql))
+		tree = shape = None
+		if self.shapes:
+			shape = _shape(tokens)
+			with self._lock:
+				if (same := self._shapes.get(shape)) is not None:
+					# Used as a shape, keep it
+					self._entries.move_to_end(same)
+					tree = self._entries[same][0]
+		reused = tree is not None
+		if not reused:
+			parser = Parser(sql, tokens)
+			tree = parser.parse_arena() if self.arena else parser.parse()
+
+		with self._lock:
+			if reused: self.shape_hits += 1
+			else: self.misses += 1
+			if sql not in self._entries:
+				self._entries[sql] = (tree, tokens, shape)
+				self._tokens += len(tokens)
+				if shape is not None and shape not in self._shapes: self._shapes[shape] = sql
+				self._evict()
+		return tree, tokens
+
+	def _evict(self):
+		while self._entries and (len(self._entries) > self.maxsize or self.max_tokens is not None and self._tokens > self.max_tokens):
+			sql, (_, tokens, shape) = self._entries.popitem(last=False)
+			self._tokens -= len(tokens)
+			if self._shapes.get(shape) == sql: del self._shapes[shape]
+			self.evictions += 1
+
+	def cache_info(self) -> CacheInfo:
+		with self._lock:
+			return CacheInfo(self.hits, self.shape_hits, self.misses, self.evictions, len(self._entries), self.maxsize, self._tokens)
+
+	def cache_clear(self):
+		"""Drop the entries and reset the counters"""
+		with self._lock:
+			self._entries.clear()
+			self._shapes.clear()
+			self._tokens = 0
+			self.hits = self.shape_hits = self.misses = self.evictions = 0
@@ -0,0 +1,150 @@
+from collections.abc import Iterator
+from functools import lru_cache
+from zlib import crc32
+from tokenizer import Token, Mask
+from tsql_lexer import lex, normalize_identifier, ValueId, EnumTokenType
+
+# Item types that are not token types
+_PLACEHOLDER = 0
+_LITERAL, _LITERAL_LIST = 1, 2
+
+_FNV = {
+	64: (0xcbf29ce484222325, 0x100000001b3),
+	128: (0x6c62272e07bb014262b821756295c58d, 0x1000000000000000000013b),
+}
+
+@lru_cache(maxsize=4096)
+def _value_key(value: str) -> int:
+	return crc32(normalize_identifier(value).encode('utf-8'))
+
+def _key(t: Token) -> int:
+	if t.value_id is not None: return t.value_id
+	return _value_key(t.value)
+
+def _literals(tokens: Iterator[Token]) -> Iterator[Token]:
+	"""Drops the N of N'text' and the X1F of 0x1F, which the tokenizer splits off the literal"""
+	IDENTIFIER, INTEGER, LITERAL = EnumTokenType.IDENTIFIER, EnumTokenType.INTEGER, Mask.NUMBER | Mask.DELIMITED
+	previous = None
+	for t in tokens:
+		if previous is not None:
+			if t.start == previous.end and (t.type & LITERAL if previous.type == IDENTIFIER else t.type == IDENTIFIER and t.value[0] == 'X'):
+				if previous.type == IDENTIFIER: previous = t
+				yield previous
+				previous = None
+				continue
+			yield previous
+			previous = None
+		if t.type == INTEGER and t.value == '0' or t.type == IDENTIFIER and t.value == 'N':
+			previous = t
+		else:
+			yield t
+	if previous is not None:
+		yield previous
+
+def _items(tokens: Iterator[Token]) -> Iterator[tuple[int, int, Token | None]]:
+	"""
+	Normalized token stream: (type, key, token) for kept tokens and (_PLACEHOLDER,
+	_LITERAL or _LITERAL_LIST, None) for literals and collapsed IN lists. key is the
+	value id, or the CRC32 of the normalized value when there is none. VALUES keeps
+	its first row only, the rows end at the first token other than , (
+	"""
+	I, LITERAL = ValueId, Mask.NUMBER | Mask.DELIMITED
+	it, back = _literals(tokens), []
+	next_token = lambda: back.pop() if back else next(it, None)
+	values_depth = None
+
+	while (t := next_token()) is not None:
+		if t.type & LITERAL:
+			yield _PLACEHOLDER, _LITERAL, None
+			continue
+
+		if t.value_id == I.IN or t.value_id == I.NOT_IN:
+			yield t.type, t.value_id, t
+			# IN (literal, ...) becomes IN (...), anything else is kept
+			buffer, literals = [], 0
+			while (u := next_token()) is not None:
+				buffer.append(u)
+				if len(buffer) == 1:
+					if u.value_id != I.PARENTH_1: break
+				elif u.type & LITERAL: literals += 1
+				elif u.value_id not in (I.COMMA, I.OP_SUB, I.OP_ADD): break
+			if literals and buffer[-1].value_id == I.PARENTH_2:
+				yield buffer[0].type, I.PARENTH_1, buffer[0]
+				yield _PLACEHOLDER, _LITERAL_LIST, None
+				yield buffer[-1].type, I.PARENTH_2, buffer[-1]
+			else:
+				back.extend(reversed(buffer))
+			continue
+
+		if t.value_id == I.VALUES:
+			# Not for DEFAULT VALUES, or VALUES as a column name
+			if (u := next_token()) is not None:
+				back.append(u)
+				values_depth = 0 if u.value_id == I.PARENTH_1 else None
+		elif values_depth is not None:
+			if t.value_id == I.SEMICOLON:
+				values_depth = None
+			elif t.value_id == I.PARENTH_1:
+				values_depth += 1
+			elif t.value_id == I.PARENTH_2 and values_depth > 0:
+				values_depth -= 1
+				if values_depth == 0:
+					yield t.type, t.value_id, t
+					# Skip the next rows: , ( ... )
+					while (comma := next_token()) is not None:
+						if comma.value_id != I.COMMA or (row := next_token()) is None or row.value_id != I.PARENTH_1:
+							if comma.value_id == I.COMMA and row is not None: back.append(row)
+							back.append(comma)
+							break
+						depth = 1
+						while depth and (u := next_token()) is not None:
+							if u.value_id == I.PARENTH_1: depth += 1
+							elif u.value_id == I.PARENTH_2: depth -= 1
+					values_depth = None
+					continue
+		yield t.type, _key(t), t
+
+def _text(type: int, key: int, t: Token | None) -> str:
+	if type == _PLACEHOLDER:
+		return '?' if key == _LITERAL else '...'
+	if type == EnumTokenType.IDENTIFIER:
+		return normalize_identifier(t.value)
+	return t.value
+
+def fingerprint_hash(sql: str, quoted_identifiers = True, bits: int = 64) -> int:
+	"""
+	FNV-1a style hash of the fingerprint() template, computed over (type, key) pairs
+	of the normalized token stream without building any text.
+	"""
+	h, prime = _FNV[bits]
+	mask = (1 << bits) - 1
+	for type, key, _ in _items(lex(sql, quoted_identifiers)):
+		h = ((h ^ (type << 32 | key)) * prime) & mask
+	return h
+
+def fingerprint(sql: str, quoted_identifiers = True, bits: int = 64) -> tuple[str, int]:
+	"""
+	Shape of a query, to group queries that only differ in literal values.
+
+	Args:
+		sql (str): Query text.
+		quoted_identifiers (bool): As in lex().
+		bits (int): Hash size, 64 or 128.
+
+	Returns:
+		tuple[str, int]: Template and its fingerprint_hash(). In the template numbers and
+			literals are "?", literal IN lists "(...)", VALUES keeps its first row only,
+			keywords and identifiers are normalized (see normalize_identifier) and
+			tokens are separated by single spaces.
+	"""
+	h, prime = _FNV[bits]
+	mask = (1 << bits) - 1
+	parts, glue = [], False
+	for type, key, t in _items(lex(sql, quoted_identifiers)):
+		h = ((h ^ (type << 32 | key)) * prime) & mask
+		text = _text(type, key, t)
+		if parts and not glue and text not in (',', ')', ';', '.'):
+			parts.append(' ')
+		parts.append(text)
+		glue = text in ('(', '.')
+	return ''.join(parts), h
@@ -1,895 +1,199 @@
+import io
+import mmap
+import re
 import string
-from typing import Iterator, List
-from tokenizer import Token, tokenize, EnumTokenType, Mask
-from enum import IntEnum, auto
-
-class EnumValueId(IntEnum):
-	RIGHT_OUTER_JOIN = auto()
-	LEFT_OUTER_JOIN = auto()
-	FULL_OUTER_JOIN = auto()
-	IS_NOT_NULL = auto()
-	INNER_JOIN = auto()
-	CROSS_JOIN = auto()
-	COMMIT_TRAN = auto()
-	ADD_CONSTRAINT = auto()
-	WITHIN_GROUP = auto()
-	BEGIN_TRAN = auto()
-	CROSS_APPLY = auto()
-	BEGIN_TRANSACTION = auto()
-	ROLLBACK_TRANSACTION = auto()
-	BEGIN_TRY = auto()
-	GROUP_BY = auto()
-	END_CATCH = auto()
-	FULL_JOIN = auto()
-	COMMIT_TRANSACTION = auto()
-	ADD_COLUMN = auto()
-	BEGIN_CATCH = auto()
-	LEFT_JOIN = auto()
-	ROLLBACK_TRAN = auto()
-	ORDER_BY = auto()
-	END_TRY = auto()
-	RIGHT_JOIN = auto()
-	OUTER_APPLY = auto()
-	IS_NULL = auto()
-	NOT_IN = auto()
-	NOT_BETWEEN = auto()
-	NOT_LIKE = auto()
-	NOT_EXISTS = auto()
-	SESSION_USER = auto()
-	VIEW = auto()
-	NOT = auto()
-	TSEQUAL = auto()
-	SECURITYAUDIT = auto()
-	CONVERT = auto()
-	BROWSE = auto()
-	UNPIVOT = auto()
-	ROWCOUNT = auto()
-	RETURN = auto()
-	SEMANTICSIMILARITYDETAILSTABLE = auto()
-	PROCEDURE = auto()
-	DENY = auto()
-	PIVOT = auto()
-	AND = auto()
-	TOP = auto()
-	INTO = auto()
-	SET = auto()
-	END = auto()
-	CASE = auto()
-	CHECK = auto()
-	COLUMN = auto()
-	EXECUTE = auto()
-	DISK = auto()
-	MERGE = auto()
-	INNER = auto()
-	NATIONAL = auto()
-	ERRLVL = auto()
-	TEXTSIZE = auto()
-	DROP = auto()
-	USER = auto()
-	DBCC = auto()
-	AS = auto()
-	HAVING = auto()
-	BACKUP = auto()
-	WHEN = auto()
-	CURRENT_TIME = auto()
-	OPTION = auto()
-	SHUTDOWN = auto()
-	CLOSE = auto()
-	IDENTITY = auto()
-	IS = auto()
-	NOCHECK = auto()
-	PRECISION = auto()
-	FOR = auto()
-	PUBLIC = auto()
-	OR = auto()
-	THEN = auto()
-	FREETEXT = auto()
-	REFERENCES = auto()
-	DECLARE = auto()
-	CURRENT_DATE = auto()
-	FREETEXTTABLE = auto()
-	CROSS = auto()
-	TRIGGER = auto()
-	CURRENT = auto()
-	BETWEEN = auto()
-	LIKE = auto()
-	EXEC = auto()
-	GOTO = auto()
-	CONTINUE = auto()
-	ESCAPE = auto()
-	NULLIF = auto()
-	NONCLUSTERED = auto()
-	FILE = auto()
-	ON = auto()
-	RECONFIGURE = auto()
-	COMMIT = auto()
-	COLLATE = auto()
-	OVER = auto()
-	SEMANTICSIMILARITYTABLE = auto()
-	FETCH = auto()
-	SEMANTICKEYPHRASETABLE = auto()
-	TABLESAMPLE = auto()
-	FILLFACTOR = auto()
-	DATABASE = auto()
-	DELETE = auto()
-	OPENDATASOURCE = auto()
-	RESTORE = auto()
-	IDENTITY_INSERT = auto()
-	KILL = auto()
-	INTERSECT = auto()
-	GRANT = auto()
-	CONTAINSTABLE = auto()
-	FROM = auto()
-	VALUES = auto()
-	TRY_CONVERT = auto()
-	EXIT = auto()
-	DOUBLE = auto()
-	CURRENT_TIMESTAMP = auto()
-	PROC = auto()
-	EXCEPT = auto()
-	HOLDLOCK = auto()
-	WHERE = auto()
-	PLAN = auto()
-	TABLE = auto()
-	CONTAINS = auto()
-	REVOKE = auto()
-	REPLICATION = auto()
-	ASC = auto()
-	TRUNCATE = auto()
-	IN = auto()
-	ADD = auto()
-	READTEXT = auto()
-	REVERT = auto()
-	COALESCE = auto()
-	USE = auto()
-	CURRENT_USER = auto()
-	OPENQUERY = auto()
-	LOAD = auto()
-	OF = auto()
-	DUMP = auto()
-	LINENO = auto()
-	EXISTS = auto()
-	OFF = auto()
-	UNION = auto()
-	DISTRIBUTED = auto()
-	VARYING = auto()
-	DESC = auto()
-	SYSTEM_USER = auto()
-	IF = auto()
-	ELSE = auto()
-	OPENXML = auto()
-	SETUSER = auto()
-	CLUSTERED = auto()
-	WHILE = auto()
-	WITH = auto()
-	LEFT = auto()
-	ROLLBACK = auto()
-	WAITFOR = auto()
-	SCHEMA = auto()
-	DISTINCT = auto()
-	BULK = auto()
-	FUNCTION = auto()
-	SAVE = auto()
-	CONSTRAINT = auto()
-	UPDATETEXT = auto()
-	CASCADE = auto()
-	FOREIGN = auto()
-	OPEN = auto()
-	ALL = auto()
-	BREAK = auto()
-	ROWGUIDCOL = auto()
-	TRANSACTION = auto()
-	UPDATE = auto()
-	ANY = auto()
-	BY = auto()
-	ORDER = auto()
-	EXTERNAL = auto()
-	KEY = auto()
-	TRAN = auto()
-	OFFSETS = auto()
-	RAISERROR = auto()
-	SELECT = auto()
-	CREATE = auto()
-	GROUP = auto()
-	FULL = auto()
-	ALTER = auto()
-	READ = auto()
-	INSERT = auto()
-	BEGIN = auto()
-	STATISTICS = auto()
-	OUTER = auto()
-	OPENROWSET = auto()
-	SOME = auto()
-	RULE = auto()
-	AUTHORIZATION = auto()
-	PRINT = auto()
-	DEALLOCATE = auto()
-	PERCENT = auto()
-	RIGHT = auto()
-	INDEX = auto()
-	JOIN = auto()
-	PRIMARY = auto()
-	UNIQUE = auto()
-	WRITETEXT = auto()
-	COMPUTE = auto()
-	RESTRICT = auto()
-	TO = auto()
-	DEFAULT = auto()
-	NULL = auto()
-	CHECKPOINT = auto()
-	IDENTITYCOL = auto()
-
-	#Not Keyword
-	WITHIN = auto()
-	APPLY = auto()
-	TRY = auto()
-	CATCH = auto()
-	PARTITION = auto()
-	ROW = auto()
-	ROWS = auto()
-	RANGE = auto()
-	UNBOUNDED = auto()
-	PRECEDING = auto()
-	FOLLOWING = auto()
-	PATH = auto()
-	AUTO = auto()
-	EXPLICIT = auto()
-	RAW = auto()
-	ABSENT = auto()
-	XSINIL = auto()
-	ELEMENTS = auto()
-	XMLSCHEMA = auto()
-	XMLDATA = auto()
-	ROOT = auto()
-	INCLUDE_NULL_VALUES = auto()
-	WITHOUT_ARRAY_WRAPPER = auto()
-	OPENJSON = auto()
-	BINARY = auto()
-	BASE64 = auto()
-	TYPE = auto()
-	OFFSET = auto()
-	ONLY = auto()
-	TIES = auto()
-	CAST = auto()
-	TRY_CAST = auto()
-	PARSE = auto()
-	TRY_PARSE = auto()
-	USING = auto()
-	AVG = auto()
-	COUNT = auto()
-	SUM = auto()
-	MIN = auto()
-	MAX = auto()
-	IIF = auto()
-	FORCESEEK = auto()
-	SPATIAL_WINDOW_MAX_CELLS = auto()
-
-	# Data types - Exact
-	TINYINT = auto()
-	SMALLINT = auto()
-	INT = auto()
-	BIGINT = auto()
-	BIT = auto()
-	DECIMAL = auto()
-	NUMERIC = auto()
-	MONEY = auto()
-	SMALLMONEY = auto()
-
-	# Data types - Approximate
-	FLOAT = auto()
-	REAL = auto()
-
-	# Data types - Date and time
-	DATE = auto()
-	TIME = auto()
-	DATETIME2 = auto()
-	DATETIMEOFFSET = auto()
-	DATETIME = auto()
-	SMALLDATETIME = auto()
-
-	# Data types - Character string
-	CHAR = auto()
-	VARCHAR = auto()
-	TEXT = auto()
-
-	# Data types - Unicode character string
-	NCHAR = auto()
-	NVARCHAR = auto()
-	NTEXT = auto()
-
-	# Data types - Binary strings
-	# BINARY = auto()
-	VARBINARY = auto()
-	IMAGE = auto()
-
-	# Data types - Other data types
-	CURSOR = auto()
-	GEOGRAPHY = auto()
-	GEOMETRY = auto()
-	HIERARCHYID = auto()
-	JSON = auto()
-	VECTOR = auto()
-	ROWVERSION = auto()
-	SQL_VARIANT = auto()
-	# TABLE = auto()
-	UNIQUEIDENTIFIER = auto()
-	XML = auto()
-
-	# Comparision
-	EQ = auto()
-	NE = auto()
-	GT = auto()
-	GE = auto()
-	LT = auto()
-	LE = auto()
-	
-	# Arithmetic
-	OP_ADD = auto()
-	OP_SUB = auto()
-	OP_MUL = auto()
-	OP_DIV = auto()
-	OP_MOD = auto()
-	# Parentheses
-	PARENTH_1 = auto()
-	PARENTH_2 = auto()
-
-	# Bitwise
-	BW_AND = auto()
-	BW_OR = auto()
-	BW_XOR = auto()
-	BW_NOT = auto()
-
-	# Delimiters
-	SEMICOLON = auto()
-	COMMA = auto()
-	DOT = auto()
-
-value_hash = {
-	'SESSION_USER': EnumValueId.SESSION_USER,
-	'VIEW': EnumValueId.VIEW,
-	'NOT': EnumValueId.NOT,
-	'TSEQUAL': EnumValueId.TSEQUAL,
-	'SECURITYAUDIT': EnumValueId.SECURITYAUDIT,
-	'CONVERT': EnumValueId.CONVERT,
-	'BROWSE': EnumValueId.BROWSE,
-	'UNPIVOT': EnumValueId.UNPIVOT,
-	'ROWCOUNT': EnumValueId.ROWCOUNT,
-	'RETURN': EnumValueId.RETURN,
-	'SEMANTICSIMILARITYDETAILSTABLE': EnumValueId.SEMANTICSIMILARITYDETAILSTABLE,
-	'PROCEDURE': EnumValueId.PROCEDURE,
-	'DENY': EnumValueId.DENY,
-	'PIVOT': EnumValueId.PIVOT,
-	'AND': EnumValueId.AND,
-	'TOP': EnumValueId.TOP,
-	'INTO': EnumValueId.INTO,
-	'SET': EnumValueId.SET,
-	'END': EnumValueId.END,
-	'CASE': EnumValueId.CASE,
-	'CHECK': EnumValueId.CHECK,
-	'COLUMN': EnumValueId.COLUMN,
-	'EXECUTE': EnumValueId.EXECUTE,
-	'DISK': EnumValueId.DISK,
-	'MERGE': EnumValueId.MERGE,
-	'INNER': EnumValueId.INNER,
-	'NATIONAL': EnumValueId.NATIONAL,
-	'ERRLVL': EnumValueId.ERRLVL,
-	'TEXTSIZE': EnumValueId.TEXTSIZE,
-	'DROP': EnumValueId.DROP,
-	'USER': EnumValueId.USER,
-	'DBCC': EnumValueId.DBCC,
-	'AS': EnumValueId.AS,
-	'HAVING': EnumValueId.HAVING,
-	'BACKUP': EnumValueId.BACKUP,
-	'WHEN': EnumValueId.WHEN,
-	'CURRENT_TIME': EnumValueId.CURRENT_TIME,
-	'OPTION': EnumValueId.OPTION,
-	'SHUTDOWN': EnumValueId.SHUTDOWN,
-	'CLOSE': EnumValueId.CLOSE,
-	'IDENTITY': EnumValueId.IDENTITY,
-	'IS': EnumValueId.IS,
-	'NOCHECK': EnumValueId.NOCHECK,
-	'PRECISION': EnumValueId.PRECISION,
-	'FOR': EnumValueId.FOR,
-	'PUBLIC': EnumValueId.PUBLIC,
-	'OR': EnumValueId.OR,
-	'THEN': EnumValueId.THEN,
-	'FREETEXT': EnumValueId.FREETEXT,
-	'CURSOR': EnumValueId.CURSOR,
-	'REFERENCES': EnumValueId.REFERENCES,
-	'DECLARE': EnumValueId.DECLARE,
-	'CURRENT_DATE': EnumValueId.CURRENT_DATE,
-	'FREETEXTTABLE': EnumValueId.FREETEXTTABLE,
-	'CROSS': EnumValueId.CROSS,
-	'TRIGGER': EnumValueId.TRIGGER,
-	'CURRENT': EnumValueId.CURRENT,
-	'BETWEEN': EnumValueId.BETWEEN,
-	'LIKE': EnumValueId.LIKE,
-	'EXEC': EnumValueId.EXEC,
-	'GOTO': EnumValueId.GOTO,
-	'CONTINUE': EnumValueId.CONTINUE,
-	'ESCAPE': EnumValueId.ESCAPE,
-	'NULLIF': EnumValueId.NULLIF,
-	'NONCLUSTERED': EnumValueId.NONCLUSTERED,
-	'FILE': EnumValueId.FILE,
-	'ON': EnumValueId.ON,
-	'RECONFIGURE': EnumValueId.RECONFIGURE,
-	'COMMIT': EnumValueId.COMMIT,
-	'COLLATE': EnumValueId.COLLATE,
-	'OVER': EnumValueId.OVER,
-	'SEMANTICSIMILARITYTABLE': EnumValueId.SEMANTICSIMILARITYTABLE,
-	'FETCH': EnumValueId.FETCH,
-	'SEMANTICKEYPHRASETABLE': EnumValueId.SEMANTICKEYPHRASETABLE,
-	'TABLESAMPLE': EnumValueId.TABLESAMPLE,
-	'FILLFACTOR': EnumValueId.FILLFACTOR,
-	'DATABASE': EnumValueId.DATABASE,
-	'DELETE': EnumValueId.DELETE,
-	'OPENDATASOURCE': EnumValueId.OPENDATASOURCE,
-	'RESTORE': EnumValueId.RESTORE,
-	'IDENTITY_INSERT': EnumValueId.IDENTITY_INSERT,
-	'KILL': EnumValueId.KILL,
-	'INTERSECT': EnumValueId.INTERSECT,
-	'GRANT': EnumValueId.GRANT,
-	'CONTAINSTABLE': EnumValueId.CONTAINSTABLE,
-	'FROM': EnumValueId.FROM,
-	'VALUES': EnumValueId.VALUES,
-	'TRY_CONVERT': EnumValueId.TRY_CONVERT,
-	'EXIT': EnumValueId.EXIT,
-	'DOUBLE': EnumValueId.DOUBLE,
-	'CURRENT_TIMESTAMP': EnumValueId.CURRENT_TIMESTAMP,
-	'PROC': EnumValueId.PROC,
-	'EXCEPT': EnumValueId.EXCEPT,
-	'HOLDLOCK': EnumValueId.HOLDLOCK,
-	'WHERE': EnumValueId.WHERE,
-	'PLAN': EnumValueId.PLAN,
-	'TABLE': EnumValueId.TABLE,
-	'CONTAINS': EnumValueId.CONTAINS,
-	'REVOKE': EnumValueId.REVOKE,
-	'REPLICATION': EnumValueId.REPLICATION,
-	'ASC': EnumValueId.ASC,
-	'TRUNCATE': EnumValueId.TRUNCATE,
-	'IN': EnumValueId.IN,
-	'ADD': EnumValueId.ADD,
-	'READTEXT': EnumValueId.READTEXT,
-	'REVERT': EnumValueId.REVERT,
-	'COALESCE': EnumValueId.COALESCE,
-	'USE': EnumValueId.USE,
-	'CURRENT_USER': EnumValueId.CURRENT_USER,
-	'OPENQUERY': EnumValueId.OPENQUERY,
-	'LOAD': EnumValueId.LOAD,
-	'OF': EnumValueId.OF,
-	'DUMP': EnumValueId.DUMP,
-	'LINENO': EnumValueId.LINENO,
-	'EXISTS': EnumValueId.EXISTS,
-	'OFF': EnumValueId.OFF,
-	'UNION': EnumValueId.UNION,
-	'DISTRIBUTED': EnumValueId.DISTRIBUTED,
-	'VARYING': EnumValueId.VARYING,
-	'DESC': EnumValueId.DESC,
-	'SYSTEM_USER': EnumValueId.SYSTEM_USER,
-	'IF': EnumValueId.IF,
-	'ELSE': EnumValueId.ELSE,
-	'OPENXML': EnumValueId.OPENXML,
-	'SETUSER': EnumValueId.SETUSER,
-	'CLUSTERED': EnumValueId.CLUSTERED,
-	'WHILE': EnumValueId.WHILE,
-	'WITH': EnumValueId.WITH,
-	'LEFT': EnumValueId.LEFT,
-	'ROLLBACK': EnumValueId.ROLLBACK,
-	'WAITFOR': EnumValueId.WAITFOR,
-	'SCHEMA': EnumValueId.SCHEMA,
-	'DISTINCT': EnumValueId.DISTINCT,
-	'BULK': EnumValueId.BULK,
-	'FUNCTION': EnumValueId.FUNCTION,
-	'SAVE': EnumValueId.SAVE,
-	'CONSTRAINT': EnumValueId.CONSTRAINT,
-	'UPDATETEXT': EnumValueId.UPDATETEXT,
-	'CASCADE': EnumValueId.CASCADE,
-	'FOREIGN': EnumValueId.FOREIGN,
-	'OPEN': EnumValueId.OPEN,
-	'ALL': EnumValueId.ALL,
-	'BREAK': EnumValueId.BREAK,
-	'ROWGUIDCOL': EnumValueId.ROWGUIDCOL,
-	'TRANSACTION': EnumValueId.TRANSACTION,
-	'UPDATE': EnumValueId.UPDATE,
-	'ANY': EnumValueId.ANY,
-	'BY': EnumValueId.BY,
-	'ORDER': EnumValueId.ORDER,
-	'EXTERNAL': EnumValueId.EXTERNAL,
-	'KEY': EnumValueId.KEY,
-	'TRAN': EnumValueId.TRAN,
-	'OFFSETS': EnumValueId.OFFSETS,
-	'RAISERROR': EnumValueId.RAISERROR,
-	'SELECT': EnumValueId.SELECT,
-	'CREATE': EnumValueId.CREATE,
-	'GROUP': EnumValueId.GROUP,
-	'FULL': EnumValueId.FULL,
-	'ALTER': EnumValueId.ALTER,
-	'READ': EnumValueId.READ,
-	'INSERT': EnumValueId.INSERT,
-	'BEGIN': EnumValueId.BEGIN,
-	'STATISTICS': EnumValueId.STATISTICS,
-	'OUTER': EnumValueId.OUTER,
-	'OPENROWSET': EnumValueId.OPENROWSET,
-	'SOME': EnumValueId.SOME,
-	'RULE': EnumValueId.RULE,
-	'AUTHORIZATION': EnumValueId.AUTHORIZATION,
-	'PRINT': EnumValueId.PRINT,
-	'DEALLOCATE': EnumValueId.DEALLOCATE,
-	'PERCENT': EnumValueId.PERCENT,
-	'RIGHT': EnumValueId.RIGHT,
-	'INDEX': EnumValueId.INDEX,
-	'JOIN': EnumValueId.JOIN,
-	'PRIMARY': EnumValueId.PRIMARY,
-	'UNIQUE': EnumValueId.UNIQUE,
-	'WRITETEXT': EnumValueId.WRITETEXT,
-	'COMPUTE': EnumValueId.COMPUTE,
-	'RESTRICT': EnumValueId.RESTRICT,
-	'TO': EnumValueId.TO,
-	'DEFAULT': EnumValueId.DEFAULT,
-	'NULL': EnumValueId.NULL,
-	'CHECKPOINT': EnumValueId.CHECKPOINT,
-	'IDENTITYCOL': EnumValueId.IDENTITYCOL,
-	'INNER JOIN': EnumValueId.INNER_JOIN,
-	'CROSS JOIN': EnumValueId.CROSS_JOIN,
-	'COMMIT TRAN': EnumValueId.COMMIT_TRAN,
-	'ADD CONSTRAINT': EnumValueId.ADD_CONSTRAINT,
-	'WITHIN GROUP': EnumValueId.WITHIN_GROUP,
-	'BEGIN TRAN': EnumValueId.BEGIN_TRAN,
-	'CROSS APPLY': EnumValueId.CROSS_APPLY,
-	'BEGIN TRANSACTION': EnumValueId.BEGIN_TRANSACTION,
-	'ROLLBACK TRANSACTION': EnumValueId.ROLLBACK_TRANSACTION,
-	'BEGIN TRY': EnumValueId.BEGIN_TRY,
-	'GROUP BY': EnumValueId.GROUP_BY,
-	'END CATCH': EnumValueId.END_CATCH,
-	'FULL JOIN': EnumValueId.FULL_JOIN,
-	'COMMIT TRANSACTION': EnumValueId.COMMIT_TRANSACTION,
-	'ADD COLUMN': EnumValueId.ADD_COLUMN,
-	'BEGIN CATCH': EnumValueId.BEGIN_CATCH,
-	'LEFT JOIN': EnumValueId.LEFT_JOIN,
-	'ROLLBACK TRAN': EnumValueId.ROLLBACK_TRAN,
-	'ORDER BY': EnumValueId.ORDER_BY,
-	'END TRY': EnumValueId.END_TRY,
-	'RIGHT JOIN': EnumValueId.RIGHT_JOIN,
-	'OUTER APPLY': EnumValueId.OUTER_APPLY,
-	'IS NULL': EnumValueId.IS_NULL,
-	'NOT IN': EnumValueId.NOT_IN,
-	'NOT BETWEEN': EnumValueId.NOT_BETWEEN,
-	'NOT LIKE': EnumValueId.NOT_LIKE,
-	'NOT EXISTS': EnumValueId.NOT_EXISTS,
-	'RIGHT OUTER JOIN': EnumValueId.RIGHT_OUTER_JOIN,
-	'LEFT OUTER JOIN': EnumValueId.LEFT_OUTER_JOIN,
-	'FULL OUTER JOIN': EnumValueId.FULL_OUTER_JOIN,
-	'IS NOT NULL': EnumValueId.IS_NOT_NULL,	
-	# Not Keyword
-	'WITHIN': EnumValueId.WITHIN,
-	'APPLY': EnumValueId.APPLY,
-	'TRY': EnumValueId.TRY,
-	'CATCH': EnumValueId.CATCH,
-	'PARTITION': EnumValueId.PARTITION,
-	'ROWS': EnumValueId.ROWS,
-	'ROW': EnumValueId.ROW,
-	'RANGE': EnumValueId.RANGE,
-	'UNBOUNDED': EnumValueId.UNBOUNDED,
-	'PRECEDING': EnumValueId.PRECEDING,
-	'FOLLOWING': EnumValueId.FOLLOWING,
-	'PATH': EnumValueId.PATH,
-	'AUTO': EnumValueId.AUTO,
-	'JSON': EnumValueId.JSON,
-	'EXPLICIT': EnumValueId.EXPLICIT,
-	'RAW': EnumValueId.RAW,
-	'XML': EnumValueId.XML,
-	'ABSENT': EnumValueId.ABSENT,
-	'XSINIL': EnumValueId.XSINIL,
-	'ELEMENTS': EnumValueId.ELEMENTS,
-	'XMLSCHEMA': EnumValueId.XMLSCHEMA,
-	'XMLDATA': EnumValueId.XMLDATA,
-	'ROOT': EnumValueId.ROOT,
-	'INCLUDE_NULL_VALUES': EnumValueId.INCLUDE_NULL_VALUES,
-	'WITHOUT_ARRAY_WRAPPER': EnumValueId.WITHOUT_ARRAY_WRAPPER,
-	'OPENJSON': EnumValueId.OPENJSON,
-	'BINARY': EnumValueId.BINARY,
-	'BASE64': EnumValueId.BASE64,
-	'TYPE': EnumValueId.TYPE,
-	'OFFSET': EnumValueId.OFFSET,
-	'ONLY': EnumValueId.ONLY,
-	'TIES': EnumValueId.TIES,
-	'CAST': EnumValueId.CAST,
-	'TRY_CAST': EnumValueId.TRY_CAST,
-	'PARSE': EnumValueId.PARSE,
-	'TRY_PARSE': EnumValueId.TRY_PARSE,
-	'USING': EnumValueId.USING,
-	'AVG': EnumValueId.AVG,
-	'COUNT': EnumValueId.COUNT,
-	'SUM': EnumValueId.SUM,
-	'MIN': EnumValueId.MIN,
-	'MAX': EnumValueId.MAX,
-	'IIF':EnumValueId.IIF,
-	'FORCESEEK': EnumValueId.FORCESEEK,
-	'SPATIAL_WINDOW_MAX_CELLS': EnumValueId.SPATIAL_WINDOW_MAX_CELLS,
-	'TINYINT': EnumValueId.TINYINT,
-	'SMALLINT': EnumValueId.SMALLINT,
-	'INT': EnumValueId.INT,
-	'BIGINT': EnumValueId.BIGINT,
-	'BIT': EnumValueId.BIT,
-	'DECIMAL': EnumValueId.DECIMAL,
-	'NUMERIC': EnumValueId.NUMERIC,
-	'MONEY': EnumValueId.MONEY,
-	'SMALLMONEY': EnumValueId.SMALLMONEY,
-	'FLOAT': EnumValueId.FLOAT,
-	'REAL': EnumValueId.REAL,
-	'DATE': EnumValueId.DATE,
-	'TIME': EnumValueId.TIME,
-	'DATETIME2': EnumValueId.DATETIME2,
-	'DATETIMEOFFSET': EnumValueId.DATETIMEOFFSET,
-	'DATETIME': EnumValueId.DATETIME,
-	'SMALLDATETIME': EnumValueId.SMALLDATETIME,
-	'CHAR': EnumValueId.CHAR,
-	'VARCHAR': EnumValueId.VARCHAR,
-	'TEXT': EnumValueId.TEXT,
-	'NCHAR': EnumValueId.NCHAR,
-	'NVARCHAR': EnumValueId.NVARCHAR,
-	'NTEXT': EnumValueId.NTEXT,
-	'VARBINARY': EnumValueId.VARBINARY,
-	'IMAGE': EnumValueId.IMAGE,
-	'CURSOR': EnumValueId.CURSOR,
-	'GEOGRAPHY': EnumValueId.GEOGRAPHY,
-	'GEOMETRY': EnumValueId.GEOMETRY,
-	'HIERARCHYID': EnumValueId.HIERARCHYID,
-	'VECTOR': EnumValueId.VECTOR,
-	'ROWVERSION': EnumValueId.ROWVERSION,
-	'SQL_VARIANT': EnumValueId.SQL_VARIANT,
-	'UNIQUEIDENTIFIER': EnumValueId.UNIQUEIDENTIFIER,
-	'XML': EnumValueId.XML,
-	# Delimiters
-	'.': EnumValueId.DOT,
-	',': EnumValueId.COMMA,
-	';': EnumValueId.SEMICOLON,
-	'(': EnumValueId.PARENTH_1,
-	')': EnumValueId.PARENTH_2,
-	# Operators
-	'+': EnumValueId.OP_ADD,
-	'-': EnumValueId.OP_SUB, 
-	'*': EnumValueId.OP_MUL,
-	'/': EnumValueId.OP_DIV,
-	'%': EnumValueId.OP_MOD,
-	'>': EnumValueId.GT,
-	'<': EnumValueId.LT,
-	'=': EnumValueId.EQ,
-	'&': EnumValueId.BW_AND,
-	'|': EnumValueId.BW_OR,
-	'^': EnumValueId.BW_XOR,
-	'~': EnumValueId.BW_NOT,
-	'<>': EnumValueId.NE,
-	'>=': EnumValueId.GE,
-	'<=': EnumValueId.LE,
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from itertools import chain
+from operator import attrgetter
+from collections.abc import Iterator
+from tokenizer import Token, MultipartName, TokenArray, TokenizerProfile, SymbolTable, Trivia, EnumTokenType, Mask, _skip_block_comment
+from tsql_tables import ValueId, ValueFlag, VALUE_NAMES, VALUE_HASH as value_hash, COMPOUND_KEYWORDS as _COMPOUND_KEYWORDS, VALUE_FLAGS
+
+def __getattr__(name):
+	# The IntEnum of the value ids takes longer to build than importing everything else,
+	# so the enums come from tsql_keywords only when asked for; the lexer uses the plain
+	# ValueId and ValueFlag ints
+	if name == 'EnumValueId' or name == 'EnumValueFlag':
+		import tsql_keywords
+		return getattr(tsql_keywords, name)
+	raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+_NON_BLANK, _NON_BLANK_BYTES = re.compile(r'\S'), re.compile(rb'\S')
+
+# Words iter_statements() looks at: statements that can follow a query expression without
+# a semicolon, the set operators continuing one, and the BEGIN/CASE ... END blocks it does
+# not split. WITH is left out, it also follows table names and a CTE needs a semicolon
+# before it anyway. BEGIN TRAN, END CONVERSATION and the like are no block boundaries.
+_SELECT, _START, _BEGIN, _CASE, _END, _SET_OPERATOR, _NOT_BLOCK = range(1, 8)
+_STATEMENT_WORDS = {
+	'SELECT': _SELECT, 'BEGIN': _BEGIN, 'CASE': _CASE, 'END': _END,
+	**dict.fromkeys(('INSERT', 'UPDATE', 'DELETE', 'MERGE', 'DECLARE', 'SET', 'IF', 'WHILE', 'EXEC', 'EXECUTE',
+		'PRINT', 'RETURN', 'RAISERROR', 'THROW', 'CREATE', 'ALTER', 'DROP', 'TRUNCATE', 'USE'), _START),
+	**dict.fromkeys(('UNION', 'EXCEPT', 'INTERSECT', 'ALL'), _SET_OPERATOR),
+	**dict.fromkeys(('TRAN', 'TRANSACTION', 'DISTRIBUTED', 'DIALOG', 'CONVERSATION'), _NOT_BLOCK),
 }
+_STATEMENT_WORDS_BYTES = {word.encode('ascii'): kind for word, kind in _STATEMENT_WORDS.items()}
 
-_KEYWORDS_1 = frozenset({
-    EnumValueId.SESSION_USER,
-    EnumValueId.VIEW,
-    EnumValueId.NOT,
-    EnumValueId.TSEQUAL,
-    EnumValueId.SECURITYAUDIT,
-    EnumValueId.CONVERT,
-    EnumValueId.BROWSE,
-    EnumValueId.UNPIVOT,
-    EnumValueId.ROWCOUNT,
-    EnumValueId.RETURN,
-    EnumValueId.SEMANTICSIMILARITYDETAILSTABLE,
-    EnumValueId.PROCEDURE,
-    EnumValueId.DENY,
-    EnumValueId.PIVOT,
-    EnumValueId.AND,
-    EnumValueId.TOP,
-    EnumValueId.INTO,
-    EnumValueId.SET,
-    EnumValueId.END,
-    EnumValueId.CASE,
-    EnumValueId.CHECK,
-    EnumValueId.COLUMN,
-    EnumValueId.EXECUTE,
-    EnumValueId.DISK,
-    EnumValueId.MERGE,
-    EnumValueId.INNER,
-    EnumValueId.NATIONAL,
-    EnumValueId.ERRLVL,
-    EnumValueId.TEXTSIZE,
-    EnumValueId.DROP,
-    EnumValueId.USER,
-    EnumValueId.DBCC,
-    EnumValueId.AS,
-    EnumValueId.HAVING,
-    EnumValueId.BACKUP,
-    EnumValueId.WHEN,
-    EnumValueId.CURRENT_TIME,
-    EnumValueId.OPTION,
-    EnumValueId.SHUTDOWN,
-    EnumValueId.CLOSE,
-    EnumValueId.IDENTITY,
-    EnumValueId.IS,
-    EnumValueId.NOCHECK,
-    EnumValueId.PRECISION,
-    EnumValueId.FOR,
-    EnumValueId.PUBLIC,
-    EnumValueId.OR,
-    EnumValueId.THEN,
-    EnumValueId.FREETEXT,
-    EnumValueId.CURSOR,
-    EnumValueId.REFERENCES,
-    EnumValueId.DECLARE,
-    EnumValueId.CURRENT_DATE,
-    EnumValueId.FREETEXTTABLE,
-    EnumValueId.CROSS,
-    EnumValueId.TRIGGER,
-    EnumValueId.CURRENT,
-    EnumValueId.BETWEEN,
-    EnumValueId.LIKE,
-    EnumValueId.EXEC,
-    EnumValueId.GOTO,
-    EnumValueId.CONTINUE,
-    EnumValueId.ESCAPE,
-    EnumValueId.NULLIF,
-    EnumValueId.NONCLUSTERED,
-    EnumValueId.FILE,
-    EnumValueId.ON,
-    EnumValueId.RECONFIGURE,
-    EnumValueId.COMMIT,
-    EnumValueId.COLLATE,
-    EnumValueId.OVER,
-    EnumValueId.SEMANTICSIMILARITYTABLE,
-    EnumValueId.FETCH,
-    EnumValueId.SEMANTICKEYPHRASETABLE,
-    EnumValueId.TABLESAMPLE,
-    EnumValueId.FILLFACTOR,
-    EnumValueId.DATABASE,
-    EnumValueId.DELETE,
-    EnumValueId.OPENDATASOURCE,
-    EnumValueId.RESTORE,
-    EnumValueId.IDENTITY_INSERT,
-    EnumValueId.KILL,
-    EnumValueId.INTERSECT,
-    EnumValueId.GRANT,
-    EnumValueId.CONTAINSTABLE,
-    EnumValueId.FROM,
-    EnumValueId.VALUES,
-    EnumValueId.TRY_CONVERT,
-    EnumValueId.EXIT,
-    EnumValueId.DOUBLE,
-    EnumValueId.CURRENT_TIMESTAMP,
-    EnumValueId.PROC,
-    EnumValueId.EXCEPT,
-    EnumValueId.HOLDLOCK,
-    EnumValueId.WHERE,
-    EnumValueId.PLAN,
-    EnumValueId.TABLE,
-    EnumValueId.CONTAINS,
-    EnumValueId.REVOKE,
-    EnumValueId.REPLICATION,
-    EnumValueId.ASC,
-    EnumValueId.TRUNCATE,
-    EnumValueId.IN,
-    EnumValueId.ADD,
-    EnumValueId.READTEXT,
-    EnumValueId.REVERT,
-    EnumValueId.COALESCE,
-    EnumValueId.USE,
-    EnumValueId.CURRENT_USER,
-    EnumValueId.OPENQUERY,
-    EnumValueId.LOAD,
-    EnumValueId.OF,
-    EnumValueId.DUMP,
-    EnumValueId.LINENO,
-    EnumValueId.EXISTS,
-    EnumValueId.OFF,
-    EnumValueId.UNION,
-    EnumValueId.DISTRIBUTED,
-    EnumValueId.VARYING,
-    EnumValueId.DESC,
-    EnumValueId.SYSTEM_USER,
-    EnumValueId.IF,
-    EnumValueId.ELSE,
-    EnumValueId.OPENXML,
-    EnumValueId.SETUSER,
-    EnumValueId.CLUSTERED,
-    EnumValueId.WHILE,
-    EnumValueId.WITH,
-    EnumValueId.LEFT,
-    EnumValueId.ROLLBACK,
-    EnumValueId.WAITFOR,
-    EnumValueId.SCHEMA,
-    EnumValueId.DISTINCT,
-    EnumValueId.BULK,
-    EnumValueId.FUNCTION,
-    EnumValueId.SAVE,
-    EnumValueId.CONSTRAINT,
-    EnumValueId.UPDATETEXT,
-    EnumValueId.CASCADE,
-    EnumValueId.FOREIGN,
-    EnumValueId.OPEN,
-    EnumValueId.ALL,
-    EnumValueId.BREAK,
-    EnumValueId.ROWGUIDCOL,
-    EnumValueId.TRANSACTION,
-    EnumValueId.UPDATE,
-    EnumValueId.ANY,
-    EnumValueId.BY,
-    EnumValueId.ORDER,
-    EnumValueId.EXTERNAL,
-    EnumValueId.KEY,
-    EnumValueId.TRAN,
-    EnumValueId.OFFSETS,
-    EnumValueId.RAISERROR,
-    EnumValueId.SELECT,
-    EnumValueId.CREATE,
-    EnumValueId.GROUP,
-    EnumValueId.FULL,
-    EnumValueId.ALTER,
-    EnumValueId.READ,
-    EnumValueId.INSERT,
-    EnumValueId.BEGIN,
-    EnumValueId.STATISTICS,
-    EnumValueId.OUTER,
-    EnumValueId.OPENROWSET,
-    EnumValueId.SOME,
-    EnumValueId.RULE,
-    EnumValueId.AUTHORIZATION,
-    EnumValueId.PRINT,
-    EnumValueId.DEALLOCATE,
-    EnumValueId.PERCENT,
-    EnumValueId.RIGHT,
-    EnumValueId.INDEX,
-    EnumValueId.JOIN,
-    EnumValueId.PRIMARY,
-    EnumValueId.UNIQUE,
-    EnumValueId.WRITETEXT,
-    EnumValueId.COMPUTE,
-    EnumValueId.RESTRICT,
-    EnumValueId.TO,
-    EnumValueId.DEFAULT,
-    EnumValueId.NULL,
-    EnumValueId.CHECKPOINT,
-    EnumValueId.IDENTITYCOL,
-})
-
-_KEYWORDS_2 = {
-    (EnumValueId.INNER, EnumValueId.JOIN): ['INNER JOIN', EnumValueId.INNER_JOIN],
-    (EnumValueId.CROSS, EnumValueId.JOIN): ['CROSS JOIN', EnumValueId.CROSS_JOIN],
-    (EnumValueId.COMMIT, EnumValueId.TRAN): ['COMMIT TRAN', EnumValueId.COMMIT_TRAN],
-    (EnumValueId.ADD, EnumValueId.CONSTRAINT): ['ADD CONSTRAINT', EnumValueId.ADD_CONSTRAINT],
-    (EnumValueId.WITHIN, EnumValueId.GROUP): ['WITHIN GROUP', EnumValueId.WITHIN_GROUP],
-    (EnumValueId.BEGIN, EnumValueId.TRAN): ['BEGIN TRAN', EnumValueId.BEGIN_TRAN],
-    (EnumValueId.CROSS, EnumValueId.APPLY): ['CROSS APPLY', EnumValueId.CROSS_APPLY],
-    (EnumValueId.BEGIN, EnumValueId.TRANSACTION): ['BEGIN TRANSACTION', EnumValueId.BEGIN_TRANSACTION],
-    (EnumValueId.ROLLBACK, EnumValueId.TRANSACTION): ['ROLLBACK TRANSACTION', EnumValueId.ROLLBACK_TRANSACTION],
-    (EnumValueId.BEGIN, EnumValueId.TRY): ['BEGIN TRY', EnumValueId.BEGIN_TRY],
-    (EnumValueId.GROUP, EnumValueId.BY): ['GROUP BY', EnumValueId.GROUP_BY],
-    (EnumValueId.END, EnumValueId.CATCH): ['END CATCH', EnumValueId.END_CATCH],
-    (EnumValueId.FULL, EnumValueId.JOIN): ['FULL JOIN', EnumValueId.FULL_JOIN],
-    (EnumValueId.COMMIT, EnumValueId.TRANSACTION): ['COMMIT TRANSACTION', EnumValueId.COMMIT_TRANSACTION],
-    (EnumValueId.ADD, EnumValueId.COLUMN): ['ADD COLUMN', EnumValueId.ADD_COLUMN],
-    (EnumValueId.BEGIN, EnumValueId.CATCH): ['BEGIN CATCH', EnumValueId.BEGIN_CATCH],
-    (EnumValueId.LEFT, EnumValueId.JOIN): ['LEFT JOIN', EnumValueId.LEFT_JOIN],
-    (EnumValueId.ROLLBACK, EnumValueId.TRAN): ['ROLLBACK TRAN', EnumValueId.ROLLBACK_TRAN],
-    (EnumValueId.ORDER, EnumValueId.BY): ['ORDER BY', EnumValueId.ORDER_BY],
-    (EnumValueId.END, EnumValueId.TRY): ['END TRY', EnumValueId.END_TRY],
-    (EnumValueId.RIGHT, EnumValueId.JOIN): ['RIGHT JOIN', EnumValueId.RIGHT_JOIN],
-    (EnumValueId.OUTER, EnumValueId.APPLY): ['OUTER APPLY', EnumValueId.OUTER_APPLY],
-    (EnumValueId.IS, EnumValueId.NULL): ['IS NULL', EnumValueId.IS_NULL],
-    (EnumValueId.NOT, EnumValueId.IN): ['NOT IN', EnumValueId.NOT_IN],
-    (EnumValueId.NOT, EnumValueId.BETWEEN): ['NOT BETWEEN', EnumValueId.NOT_BETWEEN],
-    (EnumValueId.NOT, EnumValueId.LIKE): ['NOT LIKE', EnumValueId.NOT_LIKE],
-    (EnumValueId.NOT, EnumValueId.EXISTS): ['NOT EXISTS', EnumValueId.NOT_EXISTS],
-}
-_KEYWORDS_3 = {
-    (EnumValueId.RIGHT, EnumValueId.OUTER, EnumValueId.JOIN): ['RIGHT OUTER JOIN', EnumValueId.RIGHT_OUTER_JOIN],
-    (EnumValueId.LEFT, EnumValueId.OUTER, EnumValueId.JOIN): ['LEFT OUTER JOIN', EnumValueId.LEFT_OUTER_JOIN],
-    (EnumValueId.FULL, EnumValueId.OUTER, EnumValueId.JOIN): ['FULL OUTER JOIN', EnumValueId.FULL_OUTER_JOIN],
-    (EnumValueId.IS, EnumValueId.NOT, EnumValueId.NULL): ['IS NOT NULL', EnumValueId.IS_NOT_NULL],
-}
+@lru_cache(maxsize=8)
+def _batch_scanner(batch_separator: str, binary: bool, semicolons: bool = False) -> tuple[re.Pattern, re.Pattern, re.Pattern, re.Pattern]:
+	"""
+	Regexes for iter_batches(): separator lines, matched from the line break before
+	them, or what the tokenizer reads as one token and could hide one: comments and
+	delimited literals (and semicolons for iter_statements()); a separator line alone;
+	a separator on the first line; and one identifier, number or character as the
+	tokenizer reads them, to tell the dash of an exponent ("1e-") from a comment start.
+	For iter_statements() the first pattern also matches semicolons, parentheses, words
+	and numbers. There are no capturing groups, they would disable the scan for first
+	characters.
+	"""
+	separator = r'[^\S\n]*' + re.escape(batch_separator) + r'(?:[^\S\n]+[0-9]+)?[^\S\n]*(?:--[^\n]*)?$'
+	number = r'(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)(?:[eE][+-]?[0-9]*)?'
+	tokens = r"""'[^']*(?:''[^']*)*'?|"[^"]*(?:""[^"]*)*"?|\[[^\]]*(?:\]\][^\]]*)*\]?|/\*|--[^\n]*"""
+	if semicolons:
+		# Whole words and numbers, so that "xselect" or "1e5" hold no keyword
+		tokens += r'|;|[()]|(?:[^\W\d]|[@#\x80-\xff])[\w@#$\x80-\xff]*|' + number
+	token = r'[A-Za-z_@#][A-Za-z0-9_@#$]*|' + number + '|.'
+	patterns = ('\n' + separator + '|' + tokens, '\n' + separator, separator, token)
+	return tuple(re.compile(p.encode('ascii') if binary else p, re.IGNORECASE | re.MULTILINE | re.DOTALL) for p in patterns)
+
+def iter_batches(source, batch_separator: str = 'GO', repeat: bool = True) -> Iterator[tuple[int, int]]:
+	"""
+	Find the batches of a SQL script without copying it.
+
+	Args:
+		source (str | bytes | mmap | file): Script text, UTF-8 data, or a binary file,
+			which is memory mapped (other file objects are read).
+		batch_separator (str, optional): Word alone on the separator lines, in any case,
+			optionally followed by a repeat count ("GO 5") and a line comment. Default is 'GO'.
+		repeat (bool, optional): Yield a batch count times when its separator has a count.
+
+	Yields:
+		tuple[int, int]: (start, end) of each non-blank batch, without surrounding
+			whitespace. Offsets are bytes for binary sources.
+
+	Separators are only recognised outside comments and literals, following the
+	tokenizer rules (nested block comments, doubled closing quotes).
+	"""
+	return _iter_spans(source, batch_separator, repeat, False)
 
-# _KEYWORD_IDS = frozenset(list(_KEYWORDS_1)+[v[1]for v in (_KEYWORDS_2|_KEYWORDS_3).values()])
+def iter_statements(source, batch_separator: str = 'GO') -> Iterator[tuple[int, int]]:
+	"""
+	iter_batches() also splitting at semicolons outside comments and literals, and
+	where a statement starts after a query expression not ended by a semicolon.
+
+	Yields:
+		tuple[int, int]: (start, end) of each non-blank span between separators,
+			semicolons and statement starts, without surrounding whitespace and without
+			the semicolons.
+
+	A span starting with SELECT ends before the next SELECT, INSERT, UPDATE, DELETE,
+	SET, IF, BEGIN and the like at parenthesis depth 0, outside BEGIN ... END and
+	CASE ... END blocks, unless it follows a set operator (UNION [ALL], EXCEPT,
+	INTERSECT). Spans starting with anything else only end at semicolons and
+	separators: their statements may hold a query expression (INSERT ... SELECT).
+	"""
+	return _iter_spans(source, batch_separator, False, True)
+
+def _iter_spans(source, batch_separator: str, repeat: bool, semicolons: bool) -> Iterator[tuple[int, int]]:
+	if hasattr(source, 'read') and not isinstance(source, mmap.mmap):
+		try:
+			source = mmap.mmap(source.fileno(), 0, access=mmap.ACCESS_READ)
+		except (OSError, ValueError, io.UnsupportedOperation):
+			source = source.read()
+	binary = not isinstance(source, str)
+	scanner, separator_line, first_line, token = _batch_scanner(batch_separator.strip(), binary, semicolons)
+	newline, slash, semicolon, exponent, digits = (b'\n', b'/', b';', b'eE', b'.0123456789') if binary else ('\n', '/', ';', 'eE', '.0123456789')
+	line_comment = b'--' if binary else '--'
+	dash, dot, open_paren, close_paren, plain = (b'-', b'.', b'(', b')', b'\'"[.0123456789') if binary else ('-', '.', '(', ')', '\'"[.0123456789')
+	words = (_STATEMENT_WORDS_BYTES if binary else _STATEMENT_WORDS).get
+	first_char = (_NON_BLANK_BYTES if binary else _NON_BLANK).search
+	find, n = source.find, len(source)
+
+	def trimmed(start, end):
+		if m := first_char(source, start, end):
+			start = m.start()
+			while source[end - 1 : end].isspace(): end -= 1
+			return start, end
+
+	def separator(start, line):
+		span = trimmed(batch_start, start)
+		count = line.split(line_comment, 1)[0].split()[1:]
+		return [span] * (int(count[0]) if repeat and count else 1) if span else []
+
+	def exponent_sign(start, i):
+		# Tokens from i, the end of the last match, to the dash at start: nothing there
+		# is a comment or literal. Is the dash in a number
+		for m in token.finditer(source, i, start + 1):
+			pass
+		return m.start() < start and source[m.start() : m.start() + 1] in digits
+
+	if not semicolons and not first_line.match(source) and not separator_line.search(source):
+		# No separator line anywhere, comments and literals cannot change the result
+		if span := trimmed(0, n): yield span
+		return
+
+	# Statement state of iter_statements(): no word seen yet in the span, the span is a
+	# query expression, parenthesis and block depth, kind of the last keyword
+	first, query, depth, blocks, previous, closed = True, False, 0, 0, None, False
+	batch_start, i = 0, 0
+	if m := first_line.match(source):
+		batch_start = i = m.end()
+		yield from separator(0, m.group())
+	while i < n:
+		for m in scanner.finditer(source, i):
+			start, end = m.span()
+			kind = source[start : start + 1]
+			if kind == newline:
+				yield from separator(start, m.group())
+				batch_start = end
+				first, depth, blocks = True, 0, 0
+			elif kind == semicolon:
+				if span := trimmed(batch_start, start): yield span
+				batch_start = end
+				first, depth = True, 0
+			elif kind == slash:
+				i = _skip_block_comment(find, end, n, b'/*' if binary else '/*', b'*/' if binary else '*/')
+				break
+			elif kind == dash:
+				if source[start - 1 : start] in exponent and start > i and exponent_sign(start, i):
+					# "1e--": the first dash ends the number, the second one does not start a comment
+					i = start + 1
+					break
+			elif kind in plain:
+				pass
+			elif kind == open_paren:
+				depth += 1
+				if first: first = query = False
+			elif kind == close_paren:
+				if depth: depth -= 1
+			else:
+				word = words(m.group().upper())
+				# A name part: x.select
+				if word is not None and source[start - 1 : start] == dot: word = None
+				if first:
+					first, query = False, word == _SELECT
+				elif word is not None and word <= _BEGIN and query and not depth and not blocks and previous != _SET_OPERATOR:
+					if span := trimmed(batch_start, start): yield span
+					batch_start, query = start, word == _SELECT
+				if word == _BEGIN or word == _CASE:
+					blocks += 1
+				elif word == _END:
+					closed = blocks > 0
+					if closed: blocks -= 1
+				elif word == _NOT_BLOCK:
+					# BEGIN TRAN, END CONVERSATION
+					if previous == _BEGIN: blocks -= 1
+					elif previous == _END and closed: blocks += 1
+				previous = word
+			i = end
+		else:
+			break
+	if span := trimmed(batch_start, n):
+		yield span
 
-def split_batches(sql: str, batch_separator: str = 'GO') -> List[str]:
+def split_batches(sql: str, batch_separator: str = 'GO') -> list[str]:
 	"""
 	Split a SQL script into batches separated by a delimiter (default 'GO').
 
@@ -900,99 +204,347 @@ def split_batches(sql: str, batch_separator: str = 'GO') -> List[str]:
 			Default is 'GO'.
 
 	Returns:
-		List[str]: List of SQL batches without the separator.
+		List[str]: List of SQL batches without the separator, see iter_batches().
 	"""
-	batches, current = [], []
-	append_batch = batches.append
-	join = '\n'.join
-	normalize = str.casefold
-	batch_separator = normalize(batch_separator.strip())
-
-	for line in sql.split("\n"):
-		if normalize(line.strip()) == batch_separator:
-			if current:
-				batch = join(current).strip()
-				if batch:
-					append_batch(batch)
-				current.clear()
-		else:
-			current.append(line)
-
-	if current:
-		batch = join(current).strip()
-		if batch:
-			append_batch(batch)
-
-	return batches
+	return [sql[start:end] for start, end in iter_batches(sql, batch_separator, repeat=False)]
 
-def find_token_at(self, tokens: List[Token], position: int) -> Token | None:
+def find_token_at(tokens: list[Token], position: int) -> Token | None:
 	"""
 	Find the token that covers a given character position.
 
 	Args:
-		tokens (List[TSqlToken]): List of tokens to search.
+		tokens (List[TSqlToken]): List of tokens to search, in source order.
 		position (int): Character index within the SQL script.
 
 	Returns:
 		TSqlToken | None: The token that contains the position, or None if not found.
+
+	Binary search; build a TokenIndex for repeated queries on the same tokens.
+	"""
+	idx = bisect_right(tokens, position, key=attrgetter('start')) - 1
+	return tokens[idx] if idx >= 0 and position < tokens[idx].end else None
+
+class TokenIndex:
+	"""
+	Position queries over lex() or lex_columnar() output, in O(log n) each.
+
+	Token starts and ends are kept as array('i') columns (shared with a TokenArray) and
+	searched with bisect. Batches are (start, end) spans as yielded by iter_batches().
+	Queries return token indexes, or None where no token covers a position.
+	"""
+	__slots__ = ('tokens', 'starts', 'ends', 'batch_starts', 'batch_ends')
+
+	def __init__(self, tokens: list[Token] | TokenArray, batches=()):
+		self.tokens = tokens
+		if isinstance(tokens, TokenArray):
+			self.starts, self.ends = tokens.start, tokens.end
+		else:
+			self.starts, self.ends = array('i', (t.start for t in tokens)), array('i', (t.end for t in tokens))
+		self.batch_starts, self.batch_ends = array('i'), array('i')
+		for start, end in batches:
+			self.batch_starts.append(start)
+			self.batch_ends.append(end)
+
+	@classmethod
+	def of(cls, sql: str, tokens: list[Token] | TokenArray = None, batch_separator: str = 'GO') -> 'TokenIndex':
+		"""Index of sql, lexing it when tokens are not given"""
+		return cls(list(lex(sql)) if tokens is None else tokens, iter_batches(sql, batch_separator, repeat=False))
+
+	def __len__(self) -> int:
+		return len(self.starts)
+
+	def token_at(self, position: int) -> int | None:
+		"""Index of the token covering position"""
+		idx = bisect_right(self.starts, position) - 1
+		return idx if idx >= 0 and position < self.ends[idx] else None
+
+	def find(self, position: int) -> Token | None:
+		"""Token covering position"""
+		return None if (idx := self.token_at(position)) is None else self.tokens[idx]
+
+	def tokens_in(self, start: int, end: int) -> slice:
+		"""Slice of the tokens overlapping the range [start, end)"""
+		return slice(bisect_right(self.ends, start), bisect_left(self.starts, end))
+
+	def batch_of(self, idx: int) -> int | None:
+		"""Index of the batch containing token idx"""
+		start = self.starts[idx]
+		batch = bisect_right(self.batch_starts, start) - 1
+		return batch if batch >= 0 and start < self.batch_ends[batch] else None
+
+	def batch_tokens(self, batch: int) -> slice:
+		"""Slice of the tokens of a batch"""
+		return self.tokens_in(self.batch_starts[batch], self.batch_ends[batch])
+
+	def tokens_at(self, positions) -> list[int | None]:
+		"""
+		Bulk token_at(), in the order of positions. They are sorted once, so each search
+		starts from the token found for the previous position.
+		"""
+		starts, ends = self.starts, self.ends
+		result = [None] * len(positions)
+		lo = 0
+		for k in sorted(range(len(positions)), key=positions.__getitem__):
+			position = positions[k]
+			idx = bisect_right(starts, position, lo) - 1
+			if idx >= 0:
+				lo = idx
+				if position < ends[idx]: result[k] = idx
+		return result
+
+def _is_quoted_identifier(value):
+	return value[0] == '[' or value[0] == '"'
+
+def _is_bracketed_identifier(value):
+	return value[0] == '['
+
+# tokenizer profiles for SET QUOTED_IDENTIFIER ON / OFF, compiled once at import
+_PROFILES = {
+	quoted: TokenizerProfile(
+		word_start=frozenset('_@#' + string.ascii_letters),
+		word_chars=frozenset('_@#$' + string.ascii_letters + string.digits),
+		delimited_constructs={"'": "'", '"': '"', '[': "]"},
+		line_comment='--',
+		block_comments=['/*', '*/'],
+		operators1char=frozenset('><=-+*/%&|^~'),
+		operators2chars=frozenset(['<>', '<=', '>=']),
+		is_identifier=_is_quoted_identifier if quoted else _is_bracketed_identifier,
+		value_hash=value_hash)
+	for quoted in (True, False)
+}
+
+def _lex(it: Iterator[Token]) -> Iterator[Token]:
+	"""
+	Merge compound keywords and dotted names in a single streaming pass.
+
+	Dots and identifiers not starting with @ or # wait in pending until the longest
+	compound keyword starting at the first of them is known, so lookahead is bounded by
+	the longest keyword. Any other token ends the run: nothing merges across it.
+
+	Resolved tokens then go through the dotted name state: an identifier (head) takes in
+	each following '.' and the token after it unless that one is a keyword. The part
+	values are joined into the value, and packed with the spans for head.parts.
 	"""
-	return next((t for t in tokens if t.start <= position < t.end), None)
-
-def _flush_buffer(buf: list[Token]) -> Iterator[Token]:
-
-	# Compound Keywords
-	i=0
-	while i < len(buf):
-		pending = len(buf) - i
-		if pending >=3 and (val := _KEYWORDS_3.get((buf[i].value_id, buf[i+1].value_id, buf[i+2].value_id))) != None:
-			buf[i].value = val[0]
-			buf[i].end = buf[i+2].end
-			buf[i].type = EnumTokenType.KEYWORD
-			buf[i].value_id = val[1]
-			del buf[i+1:i+3]
-		elif pending >= 2 and (val := _KEYWORDS_2.get((buf[i].value_id, buf[i+1].value_id))) != None:
-			buf[i].value = val[0]
-			buf[i].end = buf[i+1].end
-			buf[i].type = EnumTokenType.KEYWORD
-			buf[i].value_id = val[1]
-			del buf[i+1:i+2]
-		elif buf[i].value_id in _KEYWORDS_1:
-			buf[i].type = EnumTokenType.KEYWORD
-
-		i += 1
-
-	while buf:
-		# Merge dotted identifiers
-		if buf[0].type == EnumTokenType.IDENTIFIER.value:
-			while len(buf) >= 3 and buf[1].value == '.' and buf[2].type != EnumTokenType.KEYWORD.value:
-				buf[0].value += '.' + buf[2].value
-				buf[0].end = buf[2].end
-				del buf[1:3]
-
-		yield buf.pop(0)
-
-def lex(sql, quoted_identifiers = True) -> Iterator[Token]:
-	if quoted_identifiers: is_identifier = lambda value:(value[0] == '[' or value[0] == '"')
-	else: is_identifier = lambda value:(value[0] == '[')
-
-	it = tokenize(text=sql,
-					word_start=frozenset('_@#' + string.ascii_letters),
-					word_chars=frozenset('_@#$' + string.ascii_letters + string.digits),
-					delimited_constructs={"'": "'", '"': '"', '[': "]"},
-					line_comment='--',
-					block_comments=['/*', '*/'],
-					operators1char=frozenset('><=-+*/%&|^~'),
-					operators2chars=frozenset(['<>', '<=', '>=']),
-					is_identifier=is_identifier,
-					value_hash=value_hash,
-					comments=False
-					)
-	
-	buf:list[Token] = []
+	DOT, IDENTIFIER, KEYWORD = ValueId.DOT, EnumTokenType.IDENTIFIER, EnumTokenType.KEYWORD
+	root, flags, IS_KEYWORD, COMPOUND_START = _COMPOUND_KEYWORDS, VALUE_FLAGS, ValueFlag.KEYWORD, ValueFlag.COMPOUND_START
+	pending: list[Token] = []
+	head = dot = parts = spans = None
+
+	for t in chain(it, (None,)):
+		if t is not None and (t.value_id == DOT or (t.type == IDENTIFIER and t.value[0] not in ('@', '#'))):
+			pending.append(t)
+			end_of_run = False
+		else:
+			end_of_run = True
+
+		while pending:
+			# Longest compound keyword at pending[0], or wait for the next token
+			r, keyword = pending[0], None
+			if (value_flags := flags[r.value_id or 0]) & COMPOUND_START:
+				children = root
+				for k, p in enumerate(pending, 1):
+					if (node := children.get(p.value_id)) is None: break
+					children, found = node
+					if found is not None: length, keyword = k, found
+				else:
+					if children and not end_of_run: break
+
+			if keyword is not None:
+				r.value, r.value_id = keyword
+				r.end, r.type = pending[length - 1].end, KEYWORD
+				del pending[:length]
+			else:
+				del pending[0]
+				if value_flags & IS_KEYWORD: r.type = KEYWORD
+
+			# Dotted names
+			if head is not None:
+				if dot is None:
+					if r.value == '.':
+						dot = r
+						continue
+					if spans is not None: head._value, head._parts = '.'.join(parts), MultipartName.pack(parts, spans)
+					yield head
+					head = None
+				elif r.type != KEYWORD:
+					if spans is None: spans = [head.start, head.end]
+					spans += (r.start, r.end)
+					parts.append(r.value)
+					head.end, dot = r.end, None
+					continue
+				else:
+					if spans is not None: head._value, head._parts = '.'.join(parts), MultipartName.pack(parts, spans)
+					yield head
+					yield dot
+					head = dot = None
+			if r.type == IDENTIFIER:
+				head, parts, spans = r, [r.value], None
+			else:
+				yield r
+
+		if end_of_run:
+			if head is not None:
+				if spans is not None: head._value, head._parts = '.'.join(parts), MultipartName.pack(parts, spans)
+				yield head
+				if dot is not None: yield dot
+				head = dot = None
+			if t is not None: yield t
+
+_NAME_PART = re.compile(r'\[((?:[^\]]|\]\])*)\]|"((?:[^"]|"")*)"|([^.]*)')
+_REGULAR_IDENTIFIER = re.compile(r'[A-Za-z_@#][A-Za-z0-9_@#$]*')
+
+def _normalize_part(m: re.Match) -> str:
+	bracketed, quoted, bare = m.groups()
+	if bare is not None:
+		return bare.upper()
+	name = (bracketed.replace(']]', ']') if quoted is None else quoted.replace('""', '"')).upper()
+	return name if _REGULAR_IDENTIFIER.fullmatch(name) else '[' + name.replace(']', ']]') + ']'
+
+def normalize_identifier(value: str) -> str:
+	"""
+	Case-insensitive key of a lex() identifier value, dotted names included.
+
+	Delimiters are dropped from parts that are valid regular identifiers, so [dbo].[T],
+	"dbo".t and DBO.T share one key; other parts are kept [bracketed].
+	"""
+	if value[0] != '[' and value[0] != '"' and '[' not in value and '"' not in value:
+		return value.upper()
+	parts, pos, n = [], 0, len(value)
+	while True:
+		m = _NAME_PART.match(value, pos)
+		parts.append(_normalize_part(m))
+		pos = m.end() + 1
+		if pos > n: break
+	return '.'.join(parts)
+
+def _with_symbols(it: Iterator[Token], symbols: SymbolTable) -> Iterator[Token]:
+	"""Set symbol_id of identifiers, sharing the table's string when it equals the value."""
+	add, names, IDENTIFIER = symbols.add, symbols.names, EnumTokenType.IDENTIFIER
 	for t in it:
-		if t.value_id == EnumValueId.DOT or (t.type == EnumTokenType.IDENTIFIER and t.value[0] not in('@', '#')):
-			buf.append(t)
-			continue
-		yield from _flush_buffer(buf)
+		if t.type == IDENTIFIER:
+			value = t.value
+			t.symbol_id = id = add(normalize_identifier(value))
+			if names[id] == value: t.value = names[id]
 		yield t
-	yield from _flush_buffer(buf=buf)
+
+def lex(sql, quoted_identifiers = True, backend = 'regex', symbols: SymbolTable = None, trivia: Trivia = None) -> Iterator[Token]:
+	"""
+	Lex a SQL script.
+
+	When a SymbolTable is given, identifier tokens get the symbol_id of their
+	normalize_identifier() key, assigned in the table if new.
+
+	When an empty Trivia is given, it is filled with the comments and the leading and
+	trailing trivia of each token, by index in the output. The tokens are the same.
+	"""
+	profile = _PROFILES[bool(quoted_identifiers)]
+	if trivia is None:
+		tokens = _lex(profile.tokenize(sql, backend=backend))
+	else:
+		tokens = trivia.attach(_lex(trivia.divert(profile.tokenize(sql, comments=True, backend=backend))), sql)
+	return tokens if symbols is None else _with_symbols(tokens, symbols)
+
+def lex_file(path, quoted_identifiers = True, symbols: SymbolTable = None) -> Iterator[Token]:
+	"""
+	Lex a UTF-8 file through a memory map without loading it (see tokenizer.tokenize_file).
+
+	Token offsets are byte offsets, tokenizer.Utf8Offsets maps them to characters.
+	"""
+	tokens = _lex(_PROFILES[bool(quoted_identifiers)].tokenize_file(path))
+	return tokens if symbols is None else _with_symbols(tokens, symbols)
+
+def lex_bytes(data, quoted_identifiers = True, symbols: SymbolTable = None, pos: int = 0) -> Iterator[Token]:
+	"""
+	Lex UTF-8 data (bytes, memoryview or mmap) from byte offset pos without copying it
+	(see tokenizer.tokenize_bytes). Token offsets are byte offsets in data.
+	"""
+	tokens = _lex(_PROFILES[bool(quoted_identifiers)].tokenize_bytes(data, pos=pos))
+	return tokens if symbols is None else _with_symbols(tokens, symbols)
+
+def lex_columnar(sql, quoted_identifiers = True, symbols: SymbolTable = None, trivia: Trivia = None) -> TokenArray:
+	"""
+	Lex a SQL script straight into a TokenArray.
+
+	Tokens are consumed one at a time from lex(), so only the columns stay in memory.
+	Values are the source slices (Token.get_value), not the normalized lex() values.
+	"""
+	return TokenArray(sql, lex(sql, quoted_identifiers, symbols=symbols, trivia=trivia))
+
+def _is_restart_point(t: Token, sql: str) -> bool:
+	"""True for tokens lex() never buffers, so nothing before them can merge with what follows."""
+	if t.type == EnumTokenType.IDENTIFIER:
+		return sql[t.start] in ('@', '#')
+	return t.type != EnumTokenType.KEYWORD and t.value_id != ValueId.DOT
+
+class _Starts:
+	"""Start offsets of a token list, read on demand."""
+	__slots__ = ('tokens',)
+	def __init__(self, tokens: list[Token]): self.tokens = tokens
+	def __getitem__(self, idx: int) -> int: return self.tokens[idx].start
+
+def relex(sql, tokens: list[Token] | TokenArray, edit: tuple[int, int, str], quoted_identifiers = True,
+		  symbols: SymbolTable = None) -> list[Token] | TokenArray:
+	"""
+	Update the lex() output of a script after an edit, re-lexing only the affected region.
+
+	Args:
+		sql (str): Script after the edit.
+		tokens (List[Token] | TokenArray): lex() or lex_columnar() output before the edit.
+		edit (tuple[int, int, str]): (start, old_len, new_text), the old_len characters at start
+			were replaced by new_text.
+		quoted_identifiers (bool): Same value used to produce tokens.
+		symbols (SymbolTable): Same table used to produce tokens, if any.
+
+	Returns:
+		List[Token] | TokenArray: Same as lexing sql from scratch, in the container type of tokens.
+
+	Lexing restarts at the last token before the edit that lex() would not buffer, and stops
+	as soon as such a token is produced at the (shifted) start of an old one after the edit:
+	from there both the tokenizer and the keyword/dotted-name merging are in the same state,
+	so the remaining old tokens are only shifted. Re-lexed and shifted tokens hold their
+	values instead of slicing them from a copy of sql, a series of edits keeps no copies.
+	"""
+	edit_start, old_len, new_text = edit
+	delta = len(new_text) - old_len
+	columnar = isinstance(tokens, TokenArray)
+	if columnar:
+		starts = tokens.start
+		k = bisect_left(tokens.end, edit_start) - 1
+		j = bisect_left(starts, edit_start + old_len)
+	else:
+		starts = _Starts(tokens)
+		k = bisect_left(tokens, edit_start, key=attrgetter('end')) - 1
+		j = bisect_left(tokens, edit_start + old_len, key=attrgetter('start'))
+
+	# Restart point: its scan ends before the edit, even looking one character ahead
+	while k >= 0 and not _is_restart_point(tokens[k], sql): k -= 1
+	k, restart = (k, starts[k]) if k >= 0 else (0, 0)
+
+	# Old tokens from j on are the candidates to resynchronise with
+	count, unchanged_from = len(tokens), edit_start + len(new_text)
+	middle, sync = [], count
+	relexed = _lex(_PROFILES[bool(quoted_identifiers)].tokenize(sql, pos=restart))
+	for t in relexed if symbols is None else _with_symbols(relexed, symbols):
+		if t.start >= unchanged_from:
+			while j < count and starts[j] + delta < t.start: j += 1
+			if j < count and starts[j] + delta == t.start and _is_restart_point(t, sql):
+				sync = j
+				break
+		middle.append(t)
+
+	if columnar:
+		result = TokenArray(sql)
+		for column in ('start', 'end', 'type', 'value_id', 'symbol_id'):
+			getattr(result, column).extend(getattr(tokens, column)[:k])
+		result.extend(middle)
+		result.start.extend(array('i', (x + delta for x in tokens.start[sync:])))
+		result.end.extend(array('i', (x + delta for x in tokens.end[sync:])))
+		result.type.extend(tokens.type[sync:])
+		result.value_id.extend(tokens.value_id[sync:])
+		result.symbol_id.extend(tokens.symbol_id[sync:])
+		return result
+	# Tokens kept across edits take their values with them instead of referring to the
+	# padded copy of the script made by each call, which would keep all of them alive
+	for t in middle: t.detach()
+	tail = tokens[sync:] if delta == 0 else [t.moved(delta) for t in tokens[sync:]]
+	return tokens[:k] + middle + tail
@@ -1,26 +1,12 @@
-from tsql_lexer import lex, EnumValueId as I, EnumTokenType as Ty, Mask as M
+from tsql_lexer import lex, lex_bytes, iter_statements, ValueId as I, EnumTokenType as Ty, Mask as M, ValueFlag as F, VALUE_FLAGS, VALUE_NAMES
+from tokenizer import Token, TokenArray, LineIndex, map_file
 from enum import IntEnum, auto
-
-class Tok:
-    SQL, TOKENS, LEN, idx, i, t = "", [], 0, 0, None, None
-    @staticmethod
-    def init(sql): 
-        Tok.SQL, Tok.TOKENS = sql, list(lex(sql))
-        Tok.LEN = len(Tok.TOKENS)
-        Tok.seek(0)
-    @staticmethod
-    def consume_one():
-        Tok.seek(Tok.idx + 1)
-        return Tok.idx - 1
-    @staticmethod
-    def seek(idx):
-        Tok.idx = idx
-        if Tok.idx < Tok.LEN:
-            Tok.i = Tok.TOKENS[Tok.idx].value_id
-            Tok.t = Tok.TOKENS[Tok.idx].type
-        else:
-            Tok.i = None
-            Tok.t = None
+from collections import deque
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from array import array
+import os
+import sys
 
 class N(IntEnum):
     row_range = auto()
@@ -89,634 +75,1094 @@ class N(IntEnum):
 class Node(list):
     def __init__(self, type:str):
         self.type = type
-        
-def walk(node, parents=[]):
-    l = []
-    for item in node:
-        if isinstance(item, Node): 
-            l += walk(item, parents+[item])
-        elif isinstance(item, int): 
-            l += [(parents , Tok.TOKENS[item])]
-        else: 
-            raise Exception(f'Invalid node {type(item)} at {"/".join([t.type.name for t in parents])}')
-    return l
-
-def error(m=""):
-    t = Tok.TOKENS[Tok.idx] if Tok.idx < Tok.LEN else Tok.TOKENS[-1]
-    line, col = t.get_position(Tok.SQL)
-    raise Exception(f'Error in "{t.value}" (L{line}:C{col}) idx {Tok.idx} {m}')
-
-def matchi(i, off):
-    if 0 <= Tok.idx+off < Tok.LEN:
-        if (t:=Tok.TOKENS[Tok.idx+off]):
-            return t.value_id == i
-    return False
-
-def matchxi(*i, off=1):
-    if 0 <= Tok.idx+off < Tok.LEN:
-        if (t:=Tok.TOKENS[Tok.idx+off]):
-            return t.value_id in i
-    return False
-
-def inspect(off=0):
-    return Tok.TOKENS[Tok.idx+off] if 0 <= Tok.idx+off < Tok.LEN else None
-
-def _tok():
-    if Tok.idx >= Tok.LEN:
-        error('Unexpected EOF.')
-    return Tok.consume_one()
-
-def _toki(exp:I):
-    if Tok.idx >= Tok.LEN:
-        error('Unexpected EOF.')
-    elif Tok.i != exp:
-        error(f"{exp.name} expected.")
-    return Tok.consume_one()
-
-def _tokxi(*exp):
-    if Tok.idx >= Tok.LEN:
-        error('Unexpected EOF.')
-    elif Tok.i not in exp:
-        error(f"{'|'.join([e.name for e in exp])} expedted.")
-    return Tok.consume_one()
-
-def _tokt(exp):
-    if Tok.idx >= Tok.LEN:
-        error('Unexpected EOF.')
-    elif Tok.t != exp:
-        error(f"{exp.name} expected.")
-    return Tok.consume_one()
-
-def _tokxt(*exp):
-    if Tok.idx >= Tok.LEN:
-        error('Unexpected EOF.')
-    elif Tok.t not in exp:
-        error(f"{'|'.join([e.name for e in exp])} expeted.")
-    return Tok.consume_one()
-
-############################################################################################
-
-def _frame_bound(type):
-    if (Tok.i == I.UNBOUNDED and matchi(type, off=1)) \
-    or (Tok.i == I.CURRENT and matchi(I.ROW, off=1)) \
-    or (Tok.t == Ty.INTEGER and matchi(type, off=1)):
-        n = Node(N.frame_bound)
-        n+=[_tok(), _tok()]
-        return n
-    error("Frame bound expected.")
-
-def _row_range():
-    n = Node(N.row_range)
-    n.append(_tok()) # ROWS or RANGE
-    if Tok.i == I.BETWEEN:
-        n+=[_tok(), _frame_bound(I.PRECEDING), _toki(I.AND), _frame_bound(I.FOLLOWING)]
-    else:
-        n.append(_frame_bound(I.PRECEDING))
-    return n
-
-def _over():
-    n = Node(N.over)
-    n += [_toki(I.OVER), _toki(I.PARENTH_1)]
-    if Tok.i == I.PARTITION and matchi(I.BY, off=1): n += [_tok(), _tok(), _list(_expression, N.value_expression_list)]
-    if Tok.i == I.ORDER_BY: n.append(_order_by())
-    if Tok.i in (I.ROWS, I.RANGE): n.append(_row_range())
-    n.append(_toki(I.PARENTH_2))
-    return n
-
-def _datatype():
-    n = Node(N.data_type)
-    match Tok.i:
-        case I.CHAR | I.NCHAR | I.DATETIMEOFFSET | I.DATETIME2:
-            n.append(_tok())
-            if Tok.i == I.PARENTH_1: n +=[_tok(), _tokt(Ty.INTEGER), _toki(I.PARENTH_2)]
-        case I.VARCHAR | I.NVARCHAR:
-            n.append(_tok())
-            if Tok.i == I.PARENTH_1: 
-                n.append(_tok())
-                if Tok.i == I.MAX:
-                    n.append(_tok())
-                else:
-                    n.append(_tokt(Ty.INTEGER))
-                n.append( _toki(I.PARENTH_2))
-        case I.DECIMAL | I.NUMERIC:
-            n.append(_tok())
-            if Tok.i == I.PARENTH_1:
-                n +=[_tok(), _tokt(Ty.INTEGER)]
-                if Tok.i == I.COMMA: n += [_tok(), _tokt(Ty. INTEGER)]
-                n.append(_toki(I.PARENTH_2))
-        case I.TINYINT | I.SMALLINT | I.INT | I.BIGINT | I.BIT | \
-             I.DECIMAL | I.NUMERIC | I.MONEY | I.SMALLMONEY | I.FLOAT | I.REAL | I.MONEY | I.SMALLMONEY | \
-             I.DATE | I.TIME | I.DATETIME | I.SMALLDATETIME | \
-             I.TEXT | I.NTEXT | I.VARBINARY | \
-             I.IMAGE | I.GEOGRAPHY | I.GEOMETRY | I.HIERARCHYID | I.JSON | I.VECTOR | I.ROWVERSION | I.SQL_VARIANT | \
-             I.UNIQUEIDENTIFIER | I.XML:
-            n.append(_tok())
-        case _:
-            error('Data type expected.')
-    return n
-
-def _parameter():
-    n = Node(N.expression)
-    if Tok.i == I.DEFAULT:
-        n.append(_tok())
-    else:
-        n.extend(_expression())
-    return n
-
-def _if_function_call():
-    if matchi(I.PARENTH_1, off=1) == False:
-        return
-    n = Node(N.function_call)
-    distinct = False
-    if Tok.i in (I.CAST, I.TRY_CAST):
-        n +=[_tok(), _toki(I.PARENTH_1), _expression(), _toki(I.AS), _datatype(), _toki(I.PARENTH_2)]
-    elif Tok.i in (I.CONVERT, I.TRY_CONVERT):
-        n +=[_tok(), _toki(I.PARENTH_1), _datatype(), _toki(I.COMMA), _expression()]
-        if Tok.i == I.COMMA: n +=[_toki(I.COMMA), _expression()]
-        n.append(_toki(I.PARENTH_2))
-    elif Tok.i in(I.PARSE, I.TRY_PARSE):
-        n +=[_tok(), _toki(I.PARENTH_1), _expression(), _toki(I.AS), _datatype()]
-        if matchi(I.USING): n +=[_tok(), _expression()]
-        n.append(_toki(I.PARENTH_2))
-    elif Tok.i == I.COUNT and matchi(I.PARENTH_1, off=1) and matchi(I.OP_MUL, off=2) and matchi(I.PARENTH_2, off=3):
-        n +=[_tok(), _tok(), _tok(), _tok()]
-    elif Tok.i == I.IIF:
-        n +=[_tok(), _toki(I.PARENTH_1), _condition(), _toki(I.COMMA), _expression(), _toki(I.COMMA), _expression(), _toki(I.PARENTH_2)]
-    elif Tok.i in(I.LEFT, I.RIGHT, I.NULLIF):
-        n +=[_tok(), _toki(I.PARENTH_1), _expression(), _toki(I.COMMA), _expression(), _toki(I.PARENTH_2)]
-    elif Tok.t == Ty.IDENTIFIER or Tok.i in(I.LEFT, I.RIGHT, I.NULLIF, I.COALESCE):
-        n +=[_tok(), _toki(I.PARENTH_1)]
-        if Tok.i != I.PARENTH_2:
-            if Tok.i  == I.DISTINCT:
-                n.append(_tok())
-                distinct = True
-            n.append(_list(_parameter, N.argument_list))
-        n.append(_toki(I.PARENTH_2))
-    else:
-        return
 
-    if Tok.i == I.OVER:
-        if distinct:
-            error("Unexpected DISTINCT.")
-        n.append(_over())
-    return n
-
-def _collate():
-    n = Node(N.collate)
-    n +=[_tok(), _tokt(Ty.IDENTIFIER)]
-    return n
-
-def _primary_expression():
-    n = Node(N.primary_expression)
-    while Tok.i in(I.OP_ADD, I.OP_SUB): n.append(_tok())
-    if Tok.i == I.CASE: 
-         n+=_case()
-         return n
-    elif Tok.i == I.PARENTH_1:
-        if matchxi(I.SELECT, I.INSERT, I.UPDATE, I.DELETE, off=1):
-            n+=[_toki(I.PARENTH_1), _query_expression(), _toki(I.PARENTH_2)]
+# Arena entry type of the tokens, N starts at 1
+TOKEN = 0
+
+class AstArena:
+    """
+    Flat AST: one entry per node and per token, in pre-order, held in parallel int
+    arrays. types holds the N value of nodes and TOKEN for tokens, first_child,
+    next_sibling and parent hold entry ids or -1, and start/end the range of token
+    indices the entry covers (an empty node covers an empty range). Entry 0 is the
+    root.
+
+    Uses a few dozen bytes per entry where a Node tree uses a list with a __dict__ per
+    node and an int object per token index, pickles as six arrays, and gives parent and
+    sibling navigation. root is a view with the list-like navigation of Node.
+    """
+    __slots__ = ('types', 'first_child', 'next_sibling', 'parent', 'start', 'end')
+
+    def __init__(self):
+        self.types, self.first_child, self.next_sibling = array('i'), array('i'), array('i')
+        self.parent, self.start, self.end = array('i'), array('i'), array('i')
+
+    @classmethod
+    def from_node(cls, node: Node, base: int = 0) -> 'AstArena':
+        """Arena of a Node tree, built without recursion, with token indices base less"""
+        arena = cls()
+        types, first_child, next_sibling = arena.types, arena.first_child, arena.next_sibling
+        parent, start, end = arena.parent, arena.start, arena.end
+        def add(type, parent_id, previous):
+            id = len(types)
+            types.append(type); first_child.append(-1); next_sibling.append(-1)
+            parent.append(parent_id); start.append(-1); end.append(-1)
+            if previous >= 0: next_sibling[previous] = id
+            elif parent_id >= 0: first_child[parent_id] = id
+            return id
+
+        pos = 0 # Past the last token added
+        stack = [[iter(node), add(node.type, -1, -1), -1]] # [children, id, last child id]
+        while stack:
+            top = stack[-1]
+            item = next(top[0], None)
+            if item is None:
+                id = top[1]
+                if start[id] < 0: start[id] = pos
+                end[id] = pos
+                stack.pop()
+            elif isinstance(item, Node):
+                top[2] = add(item.type, top[1], top[2])
+                stack.append([iter(item), top[2], -1])
+            elif isinstance(item, int):
+                item -= base
+                top[2] = id = add(TOKEN, top[1], top[2])
+                start[id], end[id] = item, item + 1
+                pos = item + 1
+                # Nodes start at their first token
+                for k in range(len(stack) - 1, -1, -1):
+                    if start[stack[k][1]] >= 0: break
+                    start[stack[k][1]] = item
+            else:
+                raise Exception(f'Invalid node {type(item)} in {N(types[top[1]]).name}')
+        return arena
+
+    def __len__(self):
+        return len(self.types)
+
+    @property
+    def root(self) -> 'ArenaNode':
+        return ArenaNode(self, 0)
+
+    @property
+    def nbytes(self) -> int:
+        return 6 * self.types.itemsize * len(self.types)
+
+    def children(self, id: int) -> Iterator[int]:
+        """Entry ids of the children of entry id"""
+        child, next_sibling = self.first_child[id], self.next_sibling
+        while child >= 0:
+            yield child
+            child = next_sibling[child]
+
+    def item(self, id: int):
+        """Entry id as a Node tree holds it: the token index of tokens, a view of nodes"""
+        return self.start[id] if self.types[id] == TOKEN else ArenaNode(self, id)
+
+    def to_node(self, id: int = 0) -> Node:
+        """Node tree of entry id"""
+        n = Node(N(self.types[id]))
+        for child in self.children(id):
+            n.append(self.start[child] if self.types[child] == TOKEN else self.to_node(child))
+        return n
+
+    def __eq__(self, other):
+        if not isinstance(other, AstArena): return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    __hash__ = None
+
+class ArenaNode:
+    """
+    View of a node of an AstArena, navigated like a Node: iterating and indexing give
+    views of the child nodes and token indices of the child tokens.
+    """
+    __slots__ = ('arena', 'id')
+
+    def __init__(self, arena: AstArena, id: int):
+        self.arena, self.id = arena, id
+
+    @property
+    def type(self) -> N:
+        return N(self.arena.types[self.id])
+
+    @property
+    def span(self) -> tuple[int, int]:
+        """Token indices start, end of the node"""
+        return self.arena.start[self.id], self.arena.end[self.id]
+
+    @property
+    def parent(self) -> 'ArenaNode | None':
+        parent = self.arena.parent[self.id]
+        return ArenaNode(self.arena, parent) if parent >= 0 else None
+
+    @property
+    def next_sibling(self):
+        """Next child of the parent, as a view or token index, or None"""
+        sibling = self.arena.next_sibling[self.id]
+        return self.arena.item(sibling) if sibling >= 0 else None
+
+    def __iter__(self):
+        arena = self.arena
+        for child in arena.children(self.id):
+            yield arena.item(child)
+
+    def __len__(self):
+        return sum(1 for _ in self.arena.children(self.id))
+
+    def __getitem__(self, k):
+        if isinstance(k, slice) or k < 0: return list(self)[k]
+        for child in self.arena.children(self.id):
+            if k == 0: return self.arena.item(child)
+            k -= 1
+        raise IndexError('node index out of range')
+
+    def __eq__(self, other):
+        if isinstance(other, ArenaNode): return self.arena is other.arena and self.id == other.id or list(self) == list(other)
+        if isinstance(other, list): return list(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'ArenaNode({self.type.name}, {self.id})'
+
+# Lookahead of the rules is at most this many tokens past the current one
+_LOOKAHEAD = 3
+
+# Memoized rules, memo keys are token index << 1 | rule
+_EXPRESSION, _PARENTHESIZED_CONDITION = 0, 1
+_MISSING = object()
+
+class _Backtrack(Exception):
+    """Failure of a speculative parse, raised by error() without building a message"""
+
+class Parser:
+    """
+    Parser of one SQL text, with its own cursor, so parsers can run in several threads
+    or nest.
+
+    The token list ends with EOF sentinel tokens (type 0, no value id), so lookahead
+    needs no bounds checks: sentinels match no value id, type or flag. Nodes hold
+    token indices into tokens.
+
+    A parenthesis in a condition may open a condition or an expression. It is first
+    parsed as a condition by _speculate(): a parenthesis holding an expression makes
+    the rule return None, other errors raise a bare _Backtrack, and
+    memo keeps (node, end index) or None by (token index, rule) for the parenthesized
+    condition and for the expressions completed while speculating. Parsing the same
+    tokens again as an expression reuses them, so nested parentheses parse in linear
+    time instead of doubling the work at each level.
+    """
+    __slots__ = ('sql', 'tokens', 'n', 'idx', 'i', 't', 'f', 'lines', 'memo', 'speculating')
+
+    def __init__(self, sql: str, tokens: list[Token] = None):
+        self.sql = sql
+        self.tokens = list(lex(sql)) if tokens is None else list(tokens)
+        self.n = len(self.tokens)
+        end = len(sql) if sql is not None else self.tokens[-1].end if self.tokens else 0
+        eof = Token(end, end, 0, '')
+        self.tokens += [eof] * (_LOOKAHEAD + 1)
+        self.lines = None
+        self.memo, self.speculating = {}, 0
+        self.seek(0)
+
+    def parse(self) -> Node:
+        """Parse a query expression from the current token"""
+        return self._query_expression()
+
+    def parse_arena(self) -> AstArena:
+        """Parse a query expression from the current token into an AstArena"""
+        return AstArena.from_node(self._query_expression())
+
+    def seek(self, idx):
+        self.idx = idx
+        t = self.tokens[idx]
+        self.i = value_id = t.value_id
+        self.t = t.type
+        self.f = VALUE_FLAGS[value_id or 0]
+
+    def consume_one(self):
+        idx = self.idx
+        self.seek(idx + 1)
+        return idx
+
+    def token(self, idx) -> Token:
+        return self.tokens[idx]
+
+    def walk(self, node) -> list[tuple[list, Token]]:
+        """(nodes from below node down to the parent of the token, token) of the tokens of node"""
+        l, parents = [], []
+        for path, t in self.iter_walk(node, types=()):
+            # Tokens of the same node share the copy of the path
+            if len(path) != len(parents) or path and path[-1] is not parents[-1]: parents = list(path)
+            l.append((parents, t))
+        return l
+
+    def iter_walk(self, node, order='pre', types: Iterable[N] = None, tokens=True) -> Iterator[tuple[list, Token | Node]]:
+        """
+        Walk node (a Node or ArenaNode) without recursion, yielding (path, item) lazily.
+
+        Args:
+            node: Root of the walk.
+            order (str): 'pre' yields nodes before their children, 'post' after them.
+            types (Iterable[N]): Only yield the nodes of these types, None for all nodes,
+                empty for none.
+            tokens (bool): Also yield the tokens, as Token.
+
+        path is the list of nodes from below node down to the parent of item (empty for
+        node itself). It is the walk stack, updated in place as the walk goes on: copy it
+        to keep it.
+        """
+        if order not in ('pre', 'post'): raise ValueError(f'Invalid order {order!r}')
+        post = order == 'post'
+        if types is not None: types = frozenset(types)
+        path, stack = [], [iter(node)]
+        if not post and (types is None or node.type in types): yield path, node
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+                if path:
+                    item = path.pop()
+                    if post and (types is None or item.type in types): yield path, item
+            elif isinstance(item, int):
+                if tokens: yield path, self.token(item)
+            elif isinstance(item, (Node, ArenaNode)):
+                if not post and (types is None or item.type in types): yield path, item
+                path.append(item)
+                stack.append(iter(item))
+            else:
+                raise Exception(f'Invalid node {type(item)} at {"/".join([t.type.name for t in path])}')
+        if post and (types is None or node.type in types): yield path, node
+
+    def error(self, m=""):
+        if self.speculating: raise _Backtrack
+        t = self.token(self.idx if self.idx < self.n else self.n - 1)
+        if self.sql is None: raise Exception(f'Error in "{t.value}" (offset {t.start}) idx {self.idx} {m}')
+        if self.lines is None: self.lines = LineIndex(self.sql)
+        line, col = t.get_position(self.sql, self.lines)
+        raise Exception(f'Error in "{t.value}" (L{line}:C{col}) idx {self.idx} {m}')
+
+    def matchi(self, i, off):
+        return self.tokens[self.idx+off].value_id == i
+
+    def matchxi(self, *i, off=1):
+        return self.tokens[self.idx+off].value_id in i
+
+    def matchf(self, flag, off=1):
+        return VALUE_FLAGS[self.tokens[self.idx+off].value_id or 0] & flag
+
+    def inspect(self, off=0):
+        t = self.token(self.idx+off)
+        return t if t.type else None
+
+    def _speculate(self, rule):
+        """
+        (node, end index) of rule from the current token, or None with the cursor back in
+        place if it fails. rule returns None for the failures it expects, others raise
+        _Backtrack from error().
+        """
+        start = self.idx
+        self.speculating += 1
+        try:
+            if (n := rule()) is not None: return n, self.idx
+        except _Backtrack:
+            pass
+        finally:
+            self.speculating -= 1
+        self.seek(start)
+        return None
+
+    def _tok(self):
+        idx = self.idx
+        if not self.t:
+            self.error('Unexpected EOF.')
+        self.seek(idx + 1)
+        return idx
+
+    def _toki(self, exp:int):
+        idx = self.idx
+        if self.i != exp:
+            self.error(f"{VALUE_NAMES[exp]} expected." if self.t else 'Unexpected EOF.')
+        self.seek(idx + 1)
+        return idx
+
+    def _tokxi(self, *exp):
+        if self.i not in exp:
+            self.error(f"{'|'.join([VALUE_NAMES[e] for e in exp])} expedted." if self.t else 'Unexpected EOF.')
+        return self.consume_one()
+
+    def _tokt(self, exp):
+        idx = self.idx
+        if self.t != exp:
+            self.error(f"{exp.name} expected." if self.t else 'Unexpected EOF.')
+        self.seek(idx + 1)
+        return idx
+
+    def _tokxt(self, *exp):
+        if self.t not in exp:
+            self.error(f"{'|'.join([e.name for e in exp])} expeted." if self.t else 'Unexpected EOF.')
+        return self.consume_one()
+
+    ############################################################################################
+
+    def _frame_bound(self, type):
+        if (self.i == I.UNBOUNDED and self.matchi(type, off=1)) \
+        or (self.i == I.CURRENT and self.matchi(I.ROW, off=1)) \
+        or (self.t == Ty.INTEGER and self.matchi(type, off=1)):
+            n = Node(N.frame_bound)
+            n+=[self._tok(), self._tok()]
             return n
+        self.error("Frame bound expected.")
+
+    def _row_range(self):
+        n = Node(N.row_range)
+        n.append(self._tok()) # ROWS or RANGE
+        if self.i == I.BETWEEN:
+            n+=[self._tok(), self._frame_bound(I.PRECEDING), self._toki(I.AND), self._frame_bound(I.FOLLOWING)]
         else:
-            n+=[_toki(I.PARENTH_1), _expression(), _toki(I.PARENTH_2)]
-            return n
-    elif Tok.t in (Ty.INTEGER, Ty.DECIMAL, Ty.DELIMITED_LITERAL):
-        n+=[_tok()]
-        return n
-    elif Tok.i in(I.CURRENT_DATE, I.CURRENT_TIME, I.CURRENT_TIMESTAMP, I.CURRENT_USER):
-        n+=[_tok()]
-        return n
-    elif f:=_if_function_call():
-        n+=f
-        return n
-    elif Tok.t == Ty.IDENTIFIER or Tok.i == I.NULL:
-        n+=[_tok()]
-        return n
-    error('Value or expression expected.')
-
-def _expression():
-    n = Node(N.expression)
-    n.append(_primary_expression())
-    while Tok.i in(I.OP_ADD, I.OP_SUB, I.OP_MUL, I.OP_DIV, I.OP_MOD):
-        n += [_tok(), _primary_expression()]
-    if Tok.i == I.COLLATE:
-        n.append(_collate())
-    return n
-
-def _primary_condition():
-    # Without left expression
-    match Tok.i:
-        case I.NOT:
-            n = Node(N.not_condition)
-            n += [_tok(), _primary_condition()]
-            return n
-        case I.EXISTS | I.NOT_EXISTS:
-            n = Node(N.exists_condition) 
-            n += [_tok(), _toki(I.PARENTH_1), _query_expression(), _toki(I.PARENTH_2)]
+            n.append(self._frame_bound(I.PRECEDING))
+        return n
+
+    def _over(self):
+        n = Node(N.over)
+        n += [self._toki(I.OVER), self._toki(I.PARENTH_1)]
+        if self.i == I.PARTITION and self.matchi(I.BY, off=1): n += [self._tok(), self._tok(), self._list(self._expression, N.value_expression_list)]
+        if self.i == I.ORDER_BY: n.append(self._order_by())
+        if self.i in (I.ROWS, I.RANGE): n.append(self._row_range())
+        n.append(self._toki(I.PARENTH_2))
+        return n
+
+    def _datatype(self):
+        n = Node(N.data_type)
+        match self.i:
+            case I.CHAR | I.NCHAR | I.DATETIMEOFFSET | I.DATETIME2:
+                n.append(self._tok())
+                if self.i == I.PARENTH_1: n +=[self._tok(), self._tokt(Ty.INTEGER), self._toki(I.PARENTH_2)]
+            case I.VARCHAR | I.NVARCHAR:
+                n.append(self._tok())
+                if self.i == I.PARENTH_1: 
+                    n.append(self._tok())
+                    if self.i == I.MAX:
+                        n.append(self._tok())
+                    else:
+                        n.append(self._tokt(Ty.INTEGER))
+                    n.append( self._toki(I.PARENTH_2))
+            case I.DECIMAL | I.NUMERIC:
+                n.append(self._tok())
+                if self.i == I.PARENTH_1:
+                    n +=[self._tok(), self._tokt(Ty.INTEGER)]
+                    if self.i == I.COMMA: n += [self._tok(), self._tokt(Ty. INTEGER)]
+                    n.append(self._toki(I.PARENTH_2))
+            case _ if self.f & F.DATA_TYPE:
+                n.append(self._tok())
+            case _:
+                self.error('Data type expected.')
+        return n
+
+    def _parameter(self):
+        n = Node(N.expression)
+        if self.i == I.DEFAULT:
+            n.append(self._tok())
+        else:
+            n.extend(self._expression())
+        return n
+
+    def _if_function_call(self):
+        if self.matchi(I.PARENTH_1, off=1) == False:
+            return
+        n = Node(N.function_call)
+        distinct = False
+        if self.i in (I.CAST, I.TRY_CAST):
+            n +=[self._tok(), self._toki(I.PARENTH_1), self._expression(), self._toki(I.AS), self._datatype(), self._toki(I.PARENTH_2)]
+        elif self.i in (I.CONVERT, I.TRY_CONVERT):
+            n +=[self._tok(), self._toki(I.PARENTH_1), self._datatype(), self._toki(I.COMMA), self._expression()]
+            if self.i == I.COMMA: n +=[self._toki(I.COMMA), self._expression()]
+            n.append(self._toki(I.PARENTH_2))
+        elif self.i in(I.PARSE, I.TRY_PARSE):
+            n +=[self._tok(), self._toki(I.PARENTH_1), self._expression(), self._toki(I.AS), self._datatype()]
+            if self.i == I.USING: n +=[self._tok(), self._expression()]
+            n.append(self._toki(I.PARENTH_2))
+        elif self.i == I.COUNT and self.matchi(I.PARENTH_1, off=1) and self.matchi(I.OP_MUL, off=2) and self.matchi(I.PARENTH_2, off=3):
+            n +=[self._tok(), self._tok(), self._tok(), self._tok()]
+        elif self.i == I.IIF:
+            n +=[self._tok(), self._toki(I.PARENTH_1), self._condition(), self._toki(I.COMMA), self._expression(), self._toki(I.COMMA), self._expression(), self._toki(I.PARENTH_2)]
+        elif self.i in(I.LEFT, I.RIGHT, I.NULLIF):
+            n +=[self._tok(), self._toki(I.PARENTH_1), self._expression(), self._toki(I.COMMA), self._expression(), self._toki(I.PARENTH_2)]
+        elif self.t == Ty.IDENTIFIER or self.i in(I.LEFT, I.RIGHT, I.NULLIF, I.COALESCE):
+            n +=[self._tok(), self._toki(I.PARENTH_1)]
+            if self.i != I.PARENTH_2:
+                if self.i  == I.DISTINCT:
+                    n.append(self._tok())
+                    distinct = True
+                n.append(self._list(self._parameter, N.argument_list))
+            n.append(self._toki(I.PARENTH_2))
+        else:
+            return
+
+        if self.i == I.OVER:
+            if distinct:
+                self.error("Unexpected DISTINCT.")
+            n.append(self._over())
+        return n
+
+    def _collate(self):
+        n = Node(N.collate)
+        n +=[self._tok(), self._tokt(Ty.IDENTIFIER)]
+        return n
+
+    def _primary_expression(self):
+        n = Node(N.primary_expression)
+        while self.i in(I.OP_ADD, I.OP_SUB): n.append(self._tok())
+        if self.i == I.CASE: 
+             n+=self._case()
+             return n
+        elif self.i == I.PARENTH_1:
+            if self.matchf(F.QUERY_START):
+                n+=[self._toki(I.PARENTH_1), self._query_expression(), self._toki(I.PARENTH_2)]
+                return n
+            else:
+                n+=[self._toki(I.PARENTH_1), self._expression(), self._toki(I.PARENTH_2)]
+                return n
+        elif self.t & (M.NUMBER | M.DELIMITED): # INTEGER, DECIMAL or DELIMITED_LITERAL
+            n+=[self._tok()]
             return n
-        case I.PARENTH_1:
-            if not matchxi(I.SELECT, I.INSERT, I.UPDATE, I.DELETE, off=1):
-                start_idx = Tok.idx
-                try:
-                    n = Node(N.condition)
-                    n += [_toki(I.PARENTH_1), _condition(), _toki(I.PARENTH_2)]
-                    return n
-                except: pass
-                # Backtrack
-                Tok.seek(start_idx)
-    
-    # With left expression
-    left_expr = _expression()
-    match Tok.i:
-        case I.EQ | I.NE | I.GE | I.LE | I.LT | I.GT | I.LIKE | I.NOT_LIKE: 
-            n = Node(N.binary_condition)
-            n += [left_expr, _tok(), _expression()]
+        elif self.i in(I.CURRENT_DATE, I.CURRENT_TIME, I.CURRENT_TIMESTAMP, I.CURRENT_USER):
+            n+=[self._tok()]
             return n
-        case I.IS_NULL | I.IS_NOT_NULL:
-            n = Node(N.null_condition)
-            n += [left_expr, _tok()]
+        elif f:=self._if_function_call():
+            n+=f
             return n
-        case I.BETWEEN | I.NOT_BETWEEN:
-            n = Node(N.between_condition)
-            n += [left_expr, _tok(), _expression(), _toki(I.AND), _expression()]
+        elif self.t == Ty.IDENTIFIER or self.i == I.NULL:
+            n+=[self._tok()]
             return n
-        case I.IN | I.NOT_IN:
-            cond = Node(N.in_condition)
-            op = _tok()
-            if matchxi(I.SELECT, I.INSERT, I.UPDATE, I.DELETE, off=1):
-                cond += [left_expr, op, _toki(I.PARENTH_1), _query_expression(), _toki(I.PARENTH_2)]
-            else:
-                cond += [left_expr, op, _toki(I.PARENTH_1), _list(_expression, N.value_expression_list), _toki(I.PARENTH_2)]
-            return cond
-    
-    error('Logical operator expected.')
-
-def _condition():
-    n = Node(N.condition)
-    n.append(_primary_condition())
-    while Tok.i in(I.AND, I.OR):
-        n += [_tok(), _primary_condition()]
-    return n[0] if len(n) == 1 else  n
-
-def _case():
-    n = Node(N.case_expresion)
-    n.append(_toki(I.CASE))
-    if Tok.i == I.WHEN: 
-        fn = _condition  
-    else:
-        n.append(_expression())
-        fn = _expression
-    while Tok.i == I.WHEN: n += [_toki(I.WHEN), fn(), _toki(I.THEN), _expression()]
-    if Tok.i == I.ELSE: n += [_toki(I.ELSE), _expression()]
-    n += [_toki(I.END)]
-    return n
-
-def _select_column():
-    n = Node(N.select_column)
-    if Tok.i == I.OP_MUL: # Tok.i == '*'
-        n.append(_tok())
-    elif Tok.t == Ty.IDENTIFIER and matchi(I.DOT, off=1) and matchi(I.OP_MUL, off=2):
-        n += [_tok(), _tok(), _tok()]
-    elif Tok.t == Ty.IDENTIFIER and matchi(I.EQ, off=1): # Case: alias = expr
-        n += [_tok(), _tok()]
-        n.append(_expression())
-    else:
-        n.append(_expression())
-        if (a:=_if_alias()): n.append(a)
-    return n
-
-def _list(fn, node_type:N):
-    n = Node(node_type)
-    n.append(fn())
-    sep=I.COMMA
-    while Tok.i == sep: n += [_tok(), fn()]
-    return n
-
-def _if_alias():
-    n = Node(N.alias)
-    if Tok.i == I.AS: n+=[_tok(), _tokxt(Ty.IDENTIFIER, Ty.DELIMITED_LITERAL)]; return n
-    elif Tok.t in (Ty.IDENTIFIER, Ty.DELIMITED_LITERAL): n.append(_tok()); return n
-    else: return None
-
-def _rowset_function():
-    n = Node(N.rowset_function)
-    match Tok.i:
-        case I.OPENROWSET: n+=[_tok(), _toki(I.PARENTH_1), _tokt(Ty.DELIMITED_LITERAL), _toki(I.COMMA), _tokt(Ty.DELIMITED_LITERAL), _toki(I.COMMA), _tokt(Ty.DELIMITED_LITERAL), _toki(I.PARENTH_2)]
-        case I.OPENQUERY: n+=[_tok(), _toki(I.PARENTH_1), _tokt(Ty.IDENTIFIER), _toki(I.COMMA), _tokt(Ty.DELIMITED_LITERAL), _toki(I.PARENTH_2)]
-        case I.OPENDATASOURCE: n+=[_tok(), _toki(I.PARENTH_1), _tokt(Ty.DELIMITED_LITERAL), _toki(I.COMMA), _tokt(Ty.DELIMITED_LITERAL), _toki(I.PARENTH_2)]
-
-    if a:=_if_alias(): n.append(a)
-    return n
-
-def _schema_column_declaration():
-    n = Node(N.schema_column_declaration)
-    n+=[_tokt(Ty.IDENTIFIER), _datatype()]
-    return n
-
-def _openxml():
-    n = Node(N.openxml)
-    n += [_tok(), _toki(I.PARENTH_1)]
-    aux = inspect()
-    if not aux or aux.value[0]!='@':
-        error("Variable expected.")
-    n+=[_tok(), _toki(I.COMMA), _tokt(Ty.DELIMITED_LITERAL)]
-    if Tok.i == I.COMMA: n+=[_tok(), _tokt(Ty.INTEGER)]
-    n+=[_toki(I.PARENTH_2), _toki(I.WITH), _toki(I.PARENTH_1)]
-    if Tok.t != Ty.IDENTIFIER:
-        error("Identifier expected.")
-    elif matchi(I.PARENTH_2, off=1):
-        n.append(_tok())
-    else:
-        n.append(_list(_schema_column_declaration, N.schema_column_list))
-    n.append(_toki(I.PARENTH_2))
-    if (a:=_if_alias()): n.append(a)
-    return n
-
-def _json_coldef():
-    c = _schema_column_declaration()
-    if Tok.t == Ty.DELIMITED_LITERAL: c.append(_tok())
-    return c
-
-def _openjson():
-    n = Node(N.openjson)
-    n += [_tok(), _toki(I.PARENTH_1), _tokxt(Ty.IDENTIFIER, Ty.DELIMITED_LITERAL)]
-    if Tok.i == I.COMMA: n+=[_tok(), _tokt(Ty.DELIMITED_LITERAL)]
-    n.append(_toki(I.PARENTH_2))
-    if Tok.i == I.WITH:
-        n+=[_tok(), _toki(I.PARENTH_1), _list(_json_coldef, N.schema_column_list), _toki(I.PARENTH_2)]
-    if (a:=_if_alias()): n.append(a)
-    return n
-
-def _tuple():
-    n = Node(N.tuple)
-    n += [_toki(I.PARENTH_1), _list(_expression, N.value_expression_list), _toki(I.PARENTH_2)]
-    return n
-
-def _derived_table():
-    n = Node(N.derived_table)
-    n+=[_tok(), _query_expression(), _toki(I.PARENTH_2)]
-    if (a:=_if_alias()): 
-        n.append(a)
-    else:
-        error('Alias expected.')
-    return n
-
-def _table_value_construct():
-    n = Node(N.table_value_constructor)
-    n+=[_tok(), _tok(), _list(_tuple, N.tuple_list), _toki(I.PARENTH_2)]
-    if (a:=_if_alias()): 
-        n+=[a, _toki(I.PARENTH_1), _column_list(), _toki(I.PARENTH_2)]
-    else:
-        error('Alias expected')
-    return n
-    
-def _column_list():
-    n = Node(N.column_list)
-    n.append(_tokt(Ty.IDENTIFIER))
-    while Tok.i == I.COMMA:
-        n += [_tok(), _tokt(Ty.IDENTIFIER)]
-    return n
-
-def _pivot_clause():
-    n = Node(N.pivot_clause)
-    n+=[_toki(I.PARENTH_1), _tokxi(I.AVG, I.COUNT, I.SUM, I.MIN, I.MAX), _toki(I.PARENTH_1), _tokt(Ty.IDENTIFIER), _toki(I.PARENTH_2)
-        , _toki(I.FOR), _tokt(Ty.IDENTIFIER), _toki(I.IN), _toki(I.PARENTH_1), _column_list(), _toki(I.PARENTH_2), _toki(I.PARENTH_2)]
-    return n
-
-def _unpivot_clause():
-    n = Node(N.unpivot_clause)
-    n+=[_toki(I.PARENTH_1), _tokt(Ty.IDENTIFIER), _toki(I.FOR), _tokt(Ty.IDENTIFIER), _toki(I.IN), _toki(I.PARENTH_1), _column_list(), _toki(I.PARENTH_2), _toki(I.PARENTH_2)]
-    return n
-
-def _table_hint():
-    n = Node(N.table_hint)
-    if Tok.i == I.INDEX:
-        n.append(_tok())
-        if Tok.i == I.EQ:
-            n+=[_tok(), _tokt(Ty.IDENTIFIER)]
-        else:
-            n+=[_toki(I.PARENTH_1), _list(lambda:_tokxt(Ty.IDENTIFIER, Ty.INTEGER), N.table_hint_index_list), _toki(I.PARENTH_2)]
-    elif Tok.i == I.FORCESEEK:
-        n.append(_tok())
-        if Tok.i == I.PARENTH_1:
-            n+=[_toki(I.PARENTH_1), _tokt(Ty.IDENTIFIER), _toki(I.PARENTH_1), _list(lambda:_tokt(Ty.IDENTIFIER), N.identifier_list) ,_toki(I.PARENTH_2), _toki(I.PARENTH_2)]
-    elif Tok.i == I.SPATIAL_WINDOW_MAX_CELLS:
-        n+=[_tok(), _toki(I.EQ), _tokt(Ty.INTEGER)]            
-    else:
-        n.append(_tokt(Ty.IDENTIFIER))
-    return n
-
-def _table_or_view_name():
-    n = Node(N.table_or_view_name)
-    n.append(_tok())
-    if(a:=_if_alias()):
-        n.append(a)
-    if Tok.i in(I.WITH, I.PARENTH_1):
-        if Tok.i == I.WITH:
-            n.append(_tok())
-        n+=[_toki(I.PARENTH_1), _list(_table_hint, N.table_hint_list), _toki(I.PARENTH_2)]
-    return n
-
-def _udf_table():
-    n = Node(N.user_defined_function)
-    n += [_tok(), _tok()]
-    if Tok.i != I.PARENTH_2:
-        n.extend(_list(_parameter, N.argument_list))
-    n.append(_toki(I.PARENTH_2))
-    if(a:=_if_alias()): n.append(a)
-    return n
-
-def _table_source():
-    left = Node(N.table_source)
-    if Tok.i == I.OPENJSON: left.append(_openjson())
-    elif Tok.i in(I.OPENROWSET, I.OPENQUERY, I.OPENDATASOURCE): left.append(_rowset_function())
-    elif Tok.i == I.OPENXML: left.append(_openxml())
-    elif Tok.t == Ty.IDENTIFIER and matchi(I.PARENTH_1, off=1): left.append(_udf_table())
-    elif Tok.t == Ty.IDENTIFIER: left.append(_table_or_view_name())
-    elif Tok.i == I.PARENTH_1 and matchxi(I.SELECT, I.INSERT, I.UPDATE, I.DELETE, off=1): left.append(_derived_table())
-    elif Tok.i == I.PARENTH_1 and matchi(I.VALUES, off=1): left.append(_table_value_construct())
-    elif Tok.i == I.PARENTH_1: 
-        p = Node(N.parenthesized_table_source)
-        p += [_tok(), _table_source(), _toki(I.PARENTH_2)]
-        left.append(p)
-    else: error("Table source expected.")
-
-    while Tok.i in(I.JOIN, I.INNER_JOIN, I.LEFT_JOIN, I.RIGHT_JOIN, I.FULL_JOIN, I.LEFT_OUTER_JOIN, I.RIGHT_OUTER_JOIN, I.FULL_OUTER_JOIN, I.CROSS_JOIN, I.CROSS_APPLY, I.OUTER_APPLY, I.PIVOT,  I.UNPIVOT):
-        left.type = N.joined_table_source
-        match Tok.i:
-            case I.PIVOT:
-                n = Node(N.pivoted_table)
-                n += [_tok(), _pivot_clause()]
-                if a:=_if_alias(): n.append(a)
-                left += n
-            case I.UNPIVOT:
-                n = Node(N.unpivoted_table)
-                n += [_tok(), _unpivot_clause()]
-                if a:=_if_alias(): n.append(a)
-                left += n    
-            case I.JOIN | I.INNER_JOIN | I.LEFT_JOIN | I.RIGHT_JOIN | I.FULL_JOIN | I.LEFT_OUTER_JOIN | I.RIGHT_OUTER_JOIN | I.FULL_OUTER_JOIN:
-                left += [_tok(), _table_source(), _toki(I.ON), _condition()]
-            case I.CROSS_JOIN | I.CROSS_APPLY | I.OUTER_APPLY:
-                left += [_tok(), _table_source()]
+        self.error('Value or expression expected.')
+
+    def _expression(self):
+        if self.memo and (memo := self.memo.get(self.idx << 1 | _EXPRESSION)):
+            self.seek(memo[1])
+            return memo[0]
+        start = self.idx
+        n = Node(N.expression)
+        n.append(self._primary_expression())
+        while self.f & F.ARITHMETIC:
+            n += [self._tok(), self._primary_expression()]
+        if self.i == I.COLLATE:
+            n.append(self._collate())
+        if self.speculating: self.memo[start << 1 | _EXPRESSION] = n, self.idx
+        return n
+
+    def _parenthesized_condition(self):
+        """Speculative rule: None when the parenthesis holds an expression"""
+        n = Node(N.condition)
+        n.append(self._toki(I.PARENTH_1))
+        if (cond := self._condition(True)) is None: return None
+        n += [cond, self._toki(I.PARENTH_2)]
+        return n
+
+    def _primary_condition(self, speculative=False):
+        # Without left expression
+        match self.i:
+            case I.NOT:
+                n = Node(N.not_condition)
+                n.append(self._tok())
+                if (cond := self._primary_condition(speculative)) is None: return None
+                n.append(cond)
+                return n
+            case I.EXISTS | I.NOT_EXISTS:
+                n = Node(N.exists_condition) 
+                n += [self._tok(), self._toki(I.PARENTH_1), self._query_expression(), self._toki(I.PARENTH_2)]
+                return n
+            case I.PARENTH_1:
+                if not self.matchf(F.QUERY_START):
+                    key = self.idx << 1 | _PARENTHESIZED_CONDITION
+                    if (memo := self.memo.get(key, _MISSING)) is _MISSING:
+                        memo = self.memo[key] = self._speculate(self._parenthesized_condition)
+                    if memo is not None:
+                        self.seek(memo[1])
+                        return memo[0]
+                    # Not a condition, parse it again as an expression
         
-    return left
-
-def _from():
-    n = Node(N.from_clause)
-    n.append(_toki(I.FROM))
-    n.extend(_list(_table_source, N.table_source_list))
-    return n
-
-def _where():
-    n = Node(N.where_clause)
-    n+=[_tok(), _condition()]
-    return n
-
-def _group_by():
-    n = Node(N.group_by_clause)
-    n+=[_tok(), _list(_expression, N.value_expression_list)]
-    return n
-
-def _having():
-    n = Node(N.having_clause)
-    n+=[_tok(), _condition()]
-    return n
-
-def _order_by_expression():
-    n = _expression()
-    if Tok.i in(I.ASC, I.DESC):
-        n.append(_tok())
-    return n
-
-def _order_by():
-    n = Node(N.order_by_clause)
-    n+=[_tok(), _list(_order_by_expression, N.value_expression_list)]
-    if Tok.i == I.OFFSET:
-        n+=[_tok(), _expression(), _toki((I.ROW, I.ROWS))]
-        if Tok.i == I.FETCH:
-            n+=[_tok(), _expression(), _toki((I.ROW, I.ROWS)), _toki(I.ONLY)]
-    return n
-
-def _for_directive_name():
-    n = Node(N.for_directive_name)
-    n += [_toki(I.PARENTH_1), _tokt(Ty.DELIMITED_LITERAL), _toki(I.PARENTH_2)]
-    return n
-
-def _for_directive(words, name=False):
-    if Tok.i == I.COMMA:
-        for i, w in enumerate(words, 1):
-            if matchi(w, off=i) == False:
-                return
-        ls = [_tok()]
-        ls.extend([_tok() for t in range(len(words))])
-        if name and Tok.i == I.PARENTH_1:
-            ls.extend(_for_directive_name())
-        return ls
-
-def _for_common_directives():
-    d=Node(N.common_directives)
-    if (ls:=_for_directive([I.BINARY, I.BASE64])): d.extend(ls)
-    if (ls:=_for_directive([I.TYPE])): d.extend(ls)
-    if (ls:=_for_directive([I.ROOT], name=True)): d.extend(ls)
-    return d
-def _elements():
-    e = Node(N.elements)
-    if Tok.i == I.COMMA and matchi(I.ELEMENTS, off=1):
-        e.append(_tok())
-        e.append(_tok())
-        match Tok.i:
-            case I.XSINIL:
-                e.append(_tok())
-            case I.ABSENT:
-                e.append(_tok())
-    return e
-def _raw_auto():
-    ra=Node(N.raw_auto_directives)
-    ra.append(_for_common_directives())
-    if (ls:=_for_directive([I.XMLDATA])): ra.extend(ls)
-    elif (ls:=_for_directive([I.XMLSCHEMA], name=True)): ra.extend(ls)
-    ra.append(_elements())
-    return ra
-
-def _for():
-    n = Node(N.for_cluase)
-    n.append(_tok())
-    match Tok.i:
-        case I.BROWSE:
-            n.append(_tok())
-        case I.XML:
-            n.append(_tok())
-            match Tok.i:
-                case I.RAW:
-                    n.append(_tok())
-                    if Tok.i == I.PARENTH_1: n.append(_for_directive_name())
-                    n.append(_raw_auto())
-                case I.AUTO:
-                    n.append(_tok())
-                    n.append(_raw_auto())
-                case I.PATH: 
-                    n.append(_tok())
-                    if Tok.i == I.PARENTH_1: n.append(_for_directive_name())
-                    n.append(_for_common_directives())
-                    n.append(_elements())
-                case I.EXPLICIT:
-                    n.append(_tok())
-                    n.append(_for_common_directives())
-                    if (ls:=_for_directive([I.XMLDATA])): n.extend(ls)
-                case _:
-                    error("XML mode expected.")
-        case I.JSON:
-            n.append(_tok())
-            match Tok.i:
-                case I.AUTO: 
-                    n.append(_tok())
-                case I.PATH: 
-                    n.append(_tok())
-                    if Tok.i == I.PARENTH_1: n.append(_for_directive_name())
-                case _:
-                    error("JSON mode expected.")
-            if (ls:=_for_directive([I.ROOT], name=True)): n.extend(ls)
-            if (ls:=_for_directive([I.INCLUDE_NULL_VALUES])): n.extend(ls)
-            if (ls:=_for_directive([I.WITHOUT_ARRAY_WRAPPER])): n.extend(ls)
-        case _:
-            error('BROWSE, XML or JSON expected.')
+        # With left expression
+        left_expr = self._expression()
+        match self.i:
+            case _ if self.f & F.COMPARISON:
+                n = Node(N.binary_condition)
+                n += [left_expr, self._tok(), self._expression()]
+                return n
+            case I.IS_NULL | I.IS_NOT_NULL:
+                n = Node(N.null_condition)
+                n += [left_expr, self._tok()]
+                return n
+            case I.BETWEEN | I.NOT_BETWEEN:
+                n = Node(N.between_condition)
+                n += [left_expr, self._tok(), self._expression(), self._toki(I.AND), self._expression()]
+                return n
+            case I.IN | I.NOT_IN:
+                cond = Node(N.in_condition)
+                op = self._tok()
+                if self.matchf(F.QUERY_START):
+                    cond += [left_expr, op, self._toki(I.PARENTH_1), self._query_expression(), self._toki(I.PARENTH_2)]
+                else:
+                    cond += [left_expr, op, self._toki(I.PARENTH_1), self._list(self._expression, N.value_expression_list), self._toki(I.PARENTH_2)]
+                return cond
+        
+        # An expression alone, the usual outcome of a speculative parse
+        if speculative: return None
+        self.error('Logical operator expected.')
+
+    def _condition(self, speculative=False):
+        """With speculative, None instead of an error when a condition is just an expression"""
+        n = Node(N.condition)
+        if (cond := self._primary_condition(speculative)) is None: return None
+        n.append(cond)
+        while self.i in(I.AND, I.OR):
+            n.append(self._tok())
+            if (cond := self._primary_condition(speculative)) is None: return None
+            n.append(cond)
+        return n[0] if len(n) == 1 else  n
+
+    def _case(self):
+        n = Node(N.case_expresion)
+        n.append(self._toki(I.CASE))
+        if self.i == I.WHEN: 
+            fn = self._condition  
+        else:
+            n.append(self._expression())
+            fn = self._expression
+        while self.i == I.WHEN: n += [self._toki(I.WHEN), fn(), self._toki(I.THEN), self._expression()]
+        if self.i == I.ELSE: n += [self._toki(I.ELSE), self._expression()]
+        n += [self._toki(I.END)]
+        return n
+
+    def _select_column(self):
+        n = Node(N.select_column)
+        if self.i == I.OP_MUL: # self.i == '*'
+            n.append(self._tok())
+        elif self.t == Ty.IDENTIFIER and self.matchi(I.DOT, off=1) and self.matchi(I.OP_MUL, off=2):
+            n += [self._tok(), self._tok(), self._tok()]
+        elif self.t == Ty.IDENTIFIER and self.matchi(I.EQ, off=1): # Case: alias = expr
+            n += [self._tok(), self._tok()]
+            n.append(self._expression())
+        else:
+            n.append(self._expression())
+            if (a:=self._if_alias()): n.append(a)
+        return n
+
+    def _list(self, fn, node_type:N):
+        n = Node(node_type)
+        n.append(fn())
+        sep=I.COMMA
+        while self.i == sep: n += [self._tok(), fn()]
+        return n
+
+    def _if_alias(self):
+        n = Node(N.alias)
+        if self.i == I.AS: n+=[self._tok(), self._tokxt(Ty.IDENTIFIER, Ty.DELIMITED_LITERAL)]; return n
+        elif self.t in (Ty.IDENTIFIER, Ty.DELIMITED_LITERAL): n.append(self._tok()); return n
+        else: return None
+
+    def _rowset_function(self):
+        n = Node(N.rowset_function)
+        match self.i:
+            case I.OPENROWSET: n+=[self._tok(), self._toki(I.PARENTH_1), self._tokt(Ty.DELIMITED_LITERAL), self._toki(I.COMMA), self._tokt(Ty.DELIMITED_LITERAL), self._toki(I.COMMA), self._tokt(Ty.DELIMITED_LITERAL), self._toki(I.PARENTH_2)]
+            case I.OPENQUERY: n+=[self._tok(), self._toki(I.PARENTH_1), self._tokt(Ty.IDENTIFIER), self._toki(I.COMMA), self._tokt(Ty.DELIMITED_LITERAL), self._toki(I.PARENTH_2)]
+            case I.OPENDATASOURCE: n+=[self._tok(), self._toki(I.PARENTH_1), self._tokt(Ty.DELIMITED_LITERAL), self._toki(I.COMMA), self._tokt(Ty.DELIMITED_LITERAL), self._toki(I.PARENTH_2)]
+
+        if a:=self._if_alias(): n.append(a)
+        return n
+
+    def _schema_column_declaration(self):
+        n = Node(N.schema_column_declaration)
+        n+=[self._tokt(Ty.IDENTIFIER), self._datatype()]
+        return n
+
+    def _openxml(self):
+        n = Node(N.openxml)
+        n += [self._tok(), self._toki(I.PARENTH_1)]
+        aux = self.inspect()
+        if not aux or aux.value[0]!='@':
+            self.error("Variable expected.")
+        n+=[self._tok(), self._toki(I.COMMA), self._tokt(Ty.DELIMITED_LITERAL)]
+        if self.i == I.COMMA: n+=[self._tok(), self._tokt(Ty.INTEGER)]
+        n+=[self._toki(I.PARENTH_2), self._toki(I.WITH), self._toki(I.PARENTH_1)]
+        if self.t != Ty.IDENTIFIER:
+            self.error("Identifier expected.")
+        elif self.matchi(I.PARENTH_2, off=1):
+            n.append(self._tok())
+        else:
+            n.append(self._list(self._schema_column_declaration, N.schema_column_list))
+        n.append(self._toki(I.PARENTH_2))
+        if (a:=self._if_alias()): n.append(a)
+        return n
+
+    def _json_coldef(self):
+        c = self._schema_column_declaration()
+        if self.t == Ty.DELIMITED_LITERAL: c.append(self._tok())
+        return c
+
+    def _openjson(self):
+        n = Node(N.openjson)
+        n += [self._tok(), self._toki(I.PARENTH_1), self._tokxt(Ty.IDENTIFIER, Ty.DELIMITED_LITERAL)]
+        if self.i == I.COMMA: n+=[self._tok(), self._tokt(Ty.DELIMITED_LITERAL)]
+        n.append(self._toki(I.PARENTH_2))
+        if self.i == I.WITH:
+            n+=[self._tok(), self._toki(I.PARENTH_1), self._list(self._json_coldef, N.schema_column_list), self._toki(I.PARENTH_2)]
+        if (a:=self._if_alias()): n.append(a)
+        return n
+
+    def _tuple(self):
+        n = Node(N.tuple)
+        n += [self._toki(I.PARENTH_1), self._list(self._expression, N.value_expression_list), self._toki(I.PARENTH_2)]
+        return n
+
+    def _derived_table(self):
+        n = Node(N.derived_table)
+        n+=[self._tok(), self._query_expression(), self._toki(I.PARENTH_2)]
+        if (a:=self._if_alias()): 
+            n.append(a)
+        else:
+            self.error('Alias expected.')
+        return n
+
+    def _table_value_construct(self):
+        n = Node(N.table_value_constructor)
+        n+=[self._tok(), self._tok(), self._list(self._tuple, N.tuple_list), self._toki(I.PARENTH_2)]
+        if (a:=self._if_alias()): 
+            n+=[a, self._toki(I.PARENTH_1), self._column_list(), self._toki(I.PARENTH_2)]
+        else:
+            self.error('Alias expected')
+        return n
         
-    return n
-
-def _top():
-    n = Node(N.top_clause)
-    n+=[_toki(I.TOP), _primary_expression()]
-    if Tok.i == I.PERCENT: n.append(_tok())
-    if Tok.i == I.WITH and matchi(I.TIES, off=1):
-        n+=[_tok(), _tok()]
-    return n
-
-def _select_clause():
-    n = Node(N.select_clause)
-    n.append(_toki(I.SELECT))
-    if Tok.i in (I.ALL, I.DISTINCT):
-        n.append(_tok())
-    if Tok.i == I.TOP: n.append(_top())
-    n.append(_list(_select_column, N.column_list))
-    return n
-
-def _query_specification():
-    n = Node(N.query_especification)
-    n.append(_select_clause())
-    if Tok.i == I.INTO: n+=[_tok(), _tokt(Ty.IDENTIFIER)]
-    if Tok.i == I.FROM: n.append(_from())
-    if Tok.i == I.WHERE: n.append(_where())
-    if Tok.i == I.GROUP_BY: n.append(_group_by())
-    if Tok.i == I.HAVING: n.append(_having())
-    if Tok.i == I.ORDER_BY: n.append(_order_by())
-    if Tok.i == I.FOR:  n.append(_for())
-    return n
-
-def _query_expression():
-    n = Node(N.query_especification)
-    n.append(_query_specification())
-    while Tok.i in (I.UNION, I.INTERSECT, I.EXCEPT):
-        n.append(_tok())
-        if Tok.i == I.ALL:
-            n.append(_tok())
-        n.append(_query_specification())
-    return n
\ No newline at end of file
+    def _column_list(self):
+        n = Node(N.column_list)
+        n.append(self._tokt(Ty.IDENTIFIER))
+        while self.i == I.COMMA:
+            n += [self._tok(), self._tokt(Ty.IDENTIFIER)]
+        return n
+
+    def _pivot_clause(self):
+        n = Node(N.pivot_clause)
+        n+=[self._toki(I.PARENTH_1), self._tokxi(I.AVG, I.COUNT, I.SUM, I.MIN, I.MAX), self._toki(I.PARENTH_1), self._tokt(Ty.IDENTIFIER), self._toki(I.PARENTH_2)
+            , self._toki(I.FOR), self._tokt(Ty.IDENTIFIER), self._toki(I.IN), self._toki(I.PARENTH_1), self._column_list(), self._toki(I.PARENTH_2), self._toki(I.PARENTH_2)]
+        return n
+
+    def _unpivot_clause(self):
+        n = Node(N.unpivot_clause)
+        n+=[self._toki(I.PARENTH_1), self._tokt(Ty.IDENTIFIER), self._toki(I.FOR), self._tokt(Ty.IDENTIFIER), self._toki(I.IN), self._toki(I.PARENTH_1), self._column_list(), self._toki(I.PARENTH_2), self._toki(I.PARENTH_2)]
+        return n
+
+    def _table_hint(self):
+        n = Node(N.table_hint)
+        if self.i == I.INDEX:
+            n.append(self._tok())
+            if self.i == I.EQ:
+                n+=[self._tok(), self._tokt(Ty.IDENTIFIER)]
+            else:
+                n+=[self._toki(I.PARENTH_1), self._list(lambda:self._tokxt(Ty.IDENTIFIER, Ty.INTEGER), N.table_hint_index_list), self._toki(I.PARENTH_2)]
+        elif self.i == I.FORCESEEK:
+            n.append(self._tok())
+            if self.i == I.PARENTH_1:
+                n+=[self._toki(I.PARENTH_1), self._tokt(Ty.IDENTIFIER), self._toki(I.PARENTH_1), self._list(lambda:self._tokt(Ty.IDENTIFIER), N.identifier_list) ,self._toki(I.PARENTH_2), self._toki(I.PARENTH_2)]
+        elif self.i == I.SPATIAL_WINDOW_MAX_CELLS:
+            n+=[self._tok(), self._toki(I.EQ), self._tokt(Ty.INTEGER)]            
+        else:
+            n.append(self._tokt(Ty.IDENTIFIER))
+        return n
+
+    def _table_or_view_name(self):
+        n = Node(N.table_or_view_name)
+        n.append(self._tok())
+        if(a:=self._if_alias()):
+            n.append(a)
+        if self.i in(I.WITH, I.PARENTH_1):
+            if self.i == I.WITH:
+                n.append(self._tok())
+            n+=[self._toki(I.PARENTH_1), self._list(self._table_hint, N.table_hint_list), self._toki(I.PARENTH_2)]
+        return n
+
+    def _udf_table(self):
+        n = Node(N.user_defined_function)
+        n += [self._tok(), self._tok()]
+        if self.i != I.PARENTH_2:
+            n.extend(self._list(self._parameter, N.argument_list))
+        n.append(self._toki(I.PARENTH_2))
+        if(a:=self._if_alias()): n.append(a)
+        return n
+
+    def _table_source(self):
+        left = Node(N.table_source)
+        if self.i == I.OPENJSON: left.append(self._openjson())
+        elif self.i in(I.OPENROWSET, I.OPENQUERY, I.OPENDATASOURCE): left.append(self._rowset_function())
+        elif self.i == I.OPENXML: left.append(self._openxml())
+        elif self.t == Ty.IDENTIFIER and self.matchi(I.PARENTH_1, off=1): left.append(self._udf_table())
+        elif self.t == Ty.IDENTIFIER: left.append(self._table_or_view_name())
+        elif self.i == I.PARENTH_1 and self.matchf(F.QUERY_START): left.append(self._derived_table())
+        elif self.i == I.PARENTH_1 and self.matchi(I.VALUES, off=1): left.append(self._table_value_construct())
+        elif self.i == I.PARENTH_1: 
+            p = Node(N.parenthesized_table_source)
+            p += [self._tok(), self._table_source(), self._toki(I.PARENTH_2)]
+            left.append(p)
+        else: self.error("Table source expected.")
+
+        while self.f & F.JOIN or self.i in (I.PIVOT, I.UNPIVOT):
+            left.type = N.joined_table_source
+            match self.i:
+                case I.PIVOT:
+                    n = Node(N.pivoted_table)
+                    n += [self._tok(), self._pivot_clause()]
+                    if a:=self._if_alias(): n.append(a)
+                    left += n
+                case I.UNPIVOT:
+                    n = Node(N.unpivoted_table)
+                    n += [self._tok(), self._unpivot_clause()]
+                    if a:=self._if_alias(): n.append(a)
+                    left += n    
+                case I.JOIN | I.INNER_JOIN | I.LEFT_JOIN | I.RIGHT_JOIN | I.FULL_JOIN | I.LEFT_OUTER_JOIN | I.RIGHT_OUTER_JOIN | I.FULL_OUTER_JOIN:
+                    left += [self._tok(), self._table_source(), self._toki(I.ON), self._condition()]
+                case I.CROSS_JOIN | I.CROSS_APPLY | I.OUTER_APPLY:
+                    left += [self._tok(), self._table_source()]
+            
+        return left
+
+    def _from(self):
+        n = Node(N.from_clause)
+        n.append(self._toki(I.FROM))
+        n.extend(self._list(self._table_source, N.table_source_list))
+        return n
+
+    def _where(self):
+        n = Node(N.where_clause)
+        n+=[self._tok(), self._condition()]
+        return n
+
+    def _group_by(self):
+        n = Node(N.group_by_clause)
+        n+=[self._tok(), self._list(self._expression, N.value_expression_list)]
+        return n
+
+    def _having(self):
+        n = Node(N.having_clause)
+        n+=[self._tok(), self._condition()]
+        return n
+
+    def _order_by_expression(self):
+        n = self._expression()
+        if self.i in(I.ASC, I.DESC):
+            # Copied, memo may hold the expression node
+            copy = Node(n.type)
+            copy += n
+            n = copy
+            n.append(self._tok())
+        return n
+
+    def _order_by(self):
+        n = Node(N.order_by_clause)
+        n+=[self._tok(), self._list(self._order_by_expression, N.value_expression_list)]
+        if self.i == I.OFFSET:
+            n+=[self._tok(), self._expression(), self._tokxi(I.ROW, I.ROWS)]
+            if self.i == I.FETCH:
+                n+=[self._tok(), self._expression(), self._tokxi(I.ROW, I.ROWS), self._toki(I.ONLY)]
+        return n
+
+    def _for_directive_name(self):
+        n = Node(N.for_directive_name)
+        n += [self._toki(I.PARENTH_1), self._tokt(Ty.DELIMITED_LITERAL), self._toki(I.PARENTH_2)]
+        return n
+
+    def _for_directive(self, words, name=False):
+        if self.i == I.COMMA:
+            for i, w in enumerate(words, 1):
+                if self.matchi(w, off=i) == False:
+                    return
+            ls = [self._tok()]
+            ls.extend([self._tok() for t in range(len(words))])
+            if name and self.i == I.PARENTH_1:
+                ls.extend(self._for_directive_name())
+            return ls
+
+    def _for_common_directives(self):
+        d=Node(N.common_directives)
+        if (ls:=self._for_directive([I.BINARY, I.BASE64])): d.extend(ls)
+        if (ls:=self._for_directive([I.TYPE])): d.extend(ls)
+        if (ls:=self._for_directive([I.ROOT], name=True)): d.extend(ls)
+        return d
+    def _elements(self):
+        e = Node(N.elements)
+        if self.i == I.COMMA and self.matchi(I.ELEMENTS, off=1):
+            e.append(self._tok())
+            e.append(self._tok())
+            match self.i:
+                case I.XSINIL:
+                    e.append(self._tok())
+                case I.ABSENT:
+                    e.append(self._tok())
+        return e
+    def _raw_auto(self):
+        ra=Node(N.raw_auto_directives)
+        ra.append(self._for_common_directives())
+        if (ls:=self._for_directive([I.XMLDATA])): ra.extend(ls)
+        elif (ls:=self._for_directive([I.XMLSCHEMA], name=True)): ra.extend(ls)
+        ra.append(self._elements())
+        return ra
+
+    def _for(self):
+        n = Node(N.for_cluase)
+        n.append(self._tok())
+        match self.i:
+            case I.BROWSE:
+                n.append(self._tok())
+            case I.XML:
+                n.append(self._tok())
+                match self.i:
+                    case I.RAW:
+                        n.append(self._tok())
+                        if self.i == I.PARENTH_1: n.append(self._for_directive_name())
+                        n.append(self._raw_auto())
+                    case I.AUTO:
+                        n.append(self._tok())
+                        n.append(self._raw_auto())
+                    case I.PATH: 
+                        n.append(self._tok())
+                        if self.i == I.PARENTH_1: n.append(self._for_directive_name())
+                        n.append(self._for_common_directives())
+                        n.append(self._elements())
+                    case I.EXPLICIT:
+                        n.append(self._tok())
+                        n.append(self._for_common_directives())
+                        if (ls:=self._for_directive([I.XMLDATA])): n.extend(ls)
+                    case _:
+                        self.error("XML mode expected.")
+            case I.JSON:
+                n.append(self._tok())
+                match self.i:
+                    case I.AUTO: 
+                        n.append(self._tok())
+                    case I.PATH: 
+                        n.append(self._tok())
+                        if self.i == I.PARENTH_1: n.append(self._for_directive_name())
+                    case _:
+                        self.error("JSON mode expected.")
+                if (ls:=self._for_directive([I.ROOT], name=True)): n.extend(ls)
+                if (ls:=self._for_directive([I.INCLUDE_NULL_VALUES])): n.extend(ls)
+                if (ls:=self._for_directive([I.WITHOUT_ARRAY_WRAPPER])): n.extend(ls)
+            case _:
+                self.error('BROWSE, XML or JSON expected.')
+            
+        return n
+
+    def _top(self):
+        n = Node(N.top_clause)
+        n+=[self._toki(I.TOP), self._primary_expression()]
+        if self.i == I.PERCENT: n.append(self._tok())
+        if self.i == I.WITH and self.matchi(I.TIES, off=1):
+            n+=[self._tok(), self._tok()]
+        return n
+
+    def _select_clause(self):
+        n = Node(N.select_clause)
+        n.append(self._toki(I.SELECT))
+        if self.i in (I.ALL, I.DISTINCT):
+            n.append(self._tok())
+        if self.i == I.TOP: n.append(self._top())
+        n.append(self._list(self._select_column, N.column_list))
+        return n
+
+    def _query_specification(self):
+        n = Node(N.query_especification)
+        n.append(self._select_clause())
+        if self.i == I.INTO: n+=[self._tok(), self._tokt(Ty.IDENTIFIER)]
+        if self.i == I.FROM: n.append(self._from())
+        if self.i == I.WHERE: n.append(self._where())
+        if self.i == I.GROUP_BY: n.append(self._group_by())
+        if self.i == I.HAVING: n.append(self._having())
+        if self.i == I.ORDER_BY: n.append(self._order_by())
+        if self.i == I.FOR:  n.append(self._for())
+        return n
+
+    def _query_expression(self):
+        n = Node(N.query_especification)
+        n.append(self._query_specification())
+        while self.f & F.SET_OPERATOR:
+            n.append(self._tok())
+            if self.i == I.ALL:
+                n.append(self._tok())
+            n.append(self._query_specification())
+        return n
+
+class StreamParser(Parser):
+    """
+    Parser pulling the tokens of a script lazily from lex() or any token iterator, for
+    scripts too large to hold as one token list.
+
+    statements() parses one query expression after another and yields each as soon as
+    it completes. buf holds the tokens from base, the first token of the current
+    statement, up to a few tokens of lookahead: the statement start is the only mark,
+    backtracking never goes before it, and it is released when the next statement
+    starts. Memory follows the largest statement instead of the script.
+    """
+    __slots__ = ('buf', 'base', '_it', '_eof')
+
+    # Tokens pulled at a time
+    _CHUNK = 64
+
+    def __init__(self, sql: str, tokens: Iterable[Token] = None):
+        self.sql = sql
+        self.tokens = None
+        self._it = iter(lex(sql) if tokens is None else tokens)
+        self.buf, self.base = [], 0
+        self.n = sys.maxsize # Until the end of the tokens is reached
+        self.lines = None
+        self.memo, self.speculating = {}, 0
+        self.seek(0)
+
+    def _fill(self, k):
+        buf = self.buf
+        buf.extend(islice(self._it, k + self._CHUNK - len(buf)))
+        if len(buf) <= k:
+            if self.n == sys.maxsize:
+                self.n = self.base + len(buf)
+                end = len(self.sql) if self.sql is not None else buf[-1].end if buf else 0
+                self._eof = Token(end, end, 0, '')
+            buf += [self._eof] * (k + 1 - len(buf))
+
+    def release(self, idx):
+        """Drop the tokens before idx, nothing can seek before it anymore"""
+        del self.buf[:idx - self.base]
+        self.base = idx
+        self.memo.clear()
+
+    def statements(self) -> Iterator[tuple[int, Node, list[Token]]]:
+        """
+        Parse the query expressions of the script, skipping semicolons between them.
+
+        Yields:
+            tuple[int, Node, list[Token]]: Index of the first token, tree and tokens of
+                each query expression; token idx of the tree is tokens[idx - first].
+        """
+        while True:
+            while self.i == I.SEMICOLON: self.consume_one()
+            if not self.t: return
+            start = self.idx
+            self.release(start)
+            n = self._query_expression()
+            yield start, n, self.buf[:self.idx - start]
+
+    def seek(self, idx):
+        self.idx = idx
+        k = idx - self.base
+        buf = self.buf
+        if k + _LOOKAHEAD >= len(buf): self._fill(k + _LOOKAHEAD)
+        t = buf[k]
+        self.i = value_id = t.value_id
+        self.t = t.type
+        self.f = VALUE_FLAGS[value_id or 0]
+
+    def token(self, idx) -> Token:
+        return self.buf[idx - self.base]
+
+    def matchi(self, i, off):
+        return self.buf[self.idx-self.base+off].value_id == i
+
+    def matchxi(self, *i, off=1):
+        return self.buf[self.idx-self.base+off].value_id in i
+
+    def matchf(self, flag, off=1):
+        return VALUE_FLAGS[self.buf[self.idx-self.base+off].value_id or 0] & flag
+
+# Memory map of the script in a parse_script() worker process
+_script = None
+
+def _map_script(path):
+    """parse_script() worker initializer: map the file once per process"""
+    global _script
+    _script = memoryview(map_file(path))
+
+def _parse_script_spans(spans: array, quoted_identifiers) -> list[tuple[int, AstArena, TokenArray]]:
+    return _parse_spans(_script, spans, quoted_identifiers)
+
+def _parse_spans(data: memoryview, spans: array, quoted_identifiers) -> list[tuple[int, AstArena, TokenArray]]:
+    """parse_script() worker: statements of the (start, end) byte spans of the file, spans flattened"""
+    statements = []
+    for k in range(0, len(spans), 2):
+        parser = StreamParser(None, lex_bytes(data[:spans[k + 1]], quoted_identifiers, pos=spans[k]))
+        for first, tree, tokens in parser.statements():
+            offset = tokens[0].start
+            columns = TokenArray(None)
+            columns.extend(tokens, -offset)
+            statements.append((offset, AstArena.from_node(tree, first), columns))
+    return statements
+
+def parse_script(path, workers: int = None, batch_separator: str = 'GO', quoted_identifiers = True,
+                 chunk_size: int = None) -> Iterator[tuple[int, AstArena, TokenArray]]:
+    """
+    Parse the query expressions of a UTF-8 script file in worker processes.
+
+    The file is split without lexing it, at batch separators, semicolons and statement
+    starts outside comments and literals (see iter_statements), and the spans are
+    grouped in chunks of about chunk_size bytes, each parsed by a worker through the
+    memory map of the file it opens once. A span is never split, so a giant statement
+    gets a chunk of its own while the other workers go on with the next chunks.
+
+    Args:
+        path: Script file.
+        workers (int): Worker processes, None for one per CPU. With 1 the chunks are
+            parsed in this process.
+        batch_separator (str): As in iter_batches().
+        quoted_identifiers (bool): As in lex().
+        chunk_size (int): Bytes per chunk, None to size them from the file size and
+            the number of workers.
+
+    Yields:
+        tuple[int, AstArena, TokenArray]: Byte offset of the first token of each query
+            expression, in script order, its tree with token indices into the tokens, and
+            its tokens, with byte offsets from that first token and the statement bytes as
+            source. Workers send back these arrays instead of pickled Node trees.
+
+    Raises the parse error of the first failing chunk, with the byte offset in the file.
+    """
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    data = map_file(path)
+    if chunk_size is None:
+        chunk_size = max(1 << 16, min(1 << 22, size // (workers * 16)))
+
+    def chunks():
+        spans, total = array('q'), 0
+        for start, end in iter_statements(data, batch_separator):
+            spans += array('q', (start, end))
+            total += end - start
+            if total >= chunk_size:
+                yield spans
+                spans, total = array('q'), 0
+        if spans:
+            yield spans
+
+    def results(statements):
+        for offset, arena, tokens in statements:
+            tokens.sql = data[offset : offset + tokens.end[-1]]
+            yield offset, arena, tokens
+
+    if workers == 1:
+        view = memoryview(data)
+        for spans in chunks():
+            yield from results(_parse_spans(view, spans, quoted_identifiers))
+        return
+
+    # Imported here, multiprocessing doubles the import time of the module
+    from concurrent.futures import ProcessPoolExecutor
+    pool = ProcessPoolExecutor(workers, initializer=_map_script, initargs=(path,))
+    try:
+        # A few chunks ahead per worker keeps them busy behind a slow chunk, without
+        # holding the results of the whole script
+        pending = deque()
+        for spans in chunks():
+            pending.append(pool.submit(_parse_script_spans, spans, quoted_identifiers))
+            if len(pending) >= workers * 4:
+                yield from results(pending.popleft().result())
+        while pending:
+            yield from results(pending.popleft().result())
+    finally:
+        # Also when the caller stops early
+        pool.shutdown(cancel_futures=True)
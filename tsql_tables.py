@@ -0,0 +1,984 @@
+"""
+Lexer tables generated by `python tsql_keywords.py` from tsql_keywords.py, do not edit.
+
+tsql_lexer.EnumValueId and EnumValueFlag wrap the ValueId and ValueFlag ints in IntEnums
+when first asked for.
+"""
+
+class ValueId:
+	RIGHT_OUTER_JOIN = 1
+	LEFT_OUTER_JOIN = 2
+	FULL_OUTER_JOIN = 3
+	IS_NOT_NULL = 4
+	INNER_JOIN = 5
+	CROSS_JOIN = 6
+	COMMIT_TRAN = 7
+	ADD_CONSTRAINT = 8
+	WITHIN_GROUP = 9
+	BEGIN_TRAN = 10
+	CROSS_APPLY = 11
+	BEGIN_TRANSACTION = 12
+	ROLLBACK_TRANSACTION = 13
+	BEGIN_TRY = 14
+	GROUP_BY = 15
+	END_CATCH = 16
+	FULL_JOIN = 17
+	COMMIT_TRANSACTION = 18
+	ADD_COLUMN = 19
+	BEGIN_CATCH = 20
+	LEFT_JOIN = 21
+	ROLLBACK_TRAN = 22
+	ORDER_BY = 23
+	END_TRY = 24
+	RIGHT_JOIN = 25
+	OUTER_APPLY = 26
+	IS_NULL = 27
+	NOT_IN = 28
+	NOT_BETWEEN = 29
+	NOT_LIKE = 30
+	NOT_EXISTS = 31
+	SESSION_USER = 32
+	VIEW = 33
+	NOT = 34
+	TSEQUAL = 35
+	SECURITYAUDIT = 36
+	CONVERT = 37
+	BROWSE = 38
+	UNPIVOT = 39
+	ROWCOUNT = 40
+	RETURN = 41
+	SEMANTICSIMILARITYDETAILSTABLE = 42
+	PROCEDURE = 43
+	DENY = 44
+	PIVOT = 45
+	AND = 46
+	TOP = 47
+	INTO = 48
+	SET = 49
+	END = 50
+	CASE = 51
+	CHECK = 52
+	COLUMN = 53
+	EXECUTE = 54
+	DISK = 55
+	MERGE = 56
+	INNER = 57
+	NATIONAL = 58
+	ERRLVL = 59
+	TEXTSIZE = 60
+	DROP = 61
+	USER = 62
+	DBCC = 63
+	AS = 64
+	HAVING = 65
+	BACKUP = 66
+	WHEN = 67
+	CURRENT_TIME = 68
+	OPTION = 69
+	SHUTDOWN = 70
+	CLOSE = 71
+	IDENTITY = 72
+	IS = 73
+	NOCHECK = 74
+	PRECISION = 75
+	FOR = 76
+	PUBLIC = 77
+	OR = 78
+	THEN = 79
+	FREETEXT = 80
+	REFERENCES = 81
+	DECLARE = 82
+	CURRENT_DATE = 83
+	FREETEXTTABLE = 84
+	CROSS = 85
+	TRIGGER = 86
+	CURRENT = 87
+	BETWEEN = 88
+	LIKE = 89
+	EXEC = 90
+	GOTO = 91
+	CONTINUE = 92
+	ESCAPE = 93
+	NULLIF = 94
+	NONCLUSTERED = 95
+	FILE = 96
+	ON = 97
+	RECONFIGURE = 98
+	COMMIT = 99
+	COLLATE = 100
+	OVER = 101
+	SEMANTICSIMILARITYTABLE = 102
+	FETCH = 103
+	SEMANTICKEYPHRASETABLE = 104
+	TABLESAMPLE = 105
+	FILLFACTOR = 106
+	DATABASE = 107
+	DELETE = 108
+	OPENDATASOURCE = 109
+	RESTORE = 110
+	IDENTITY_INSERT = 111
+	KILL = 112
+	INTERSECT = 113
+	GRANT = 114
+	CONTAINSTABLE = 115
+	FROM = 116
+	VALUES = 117
+	TRY_CONVERT = 118
+	EXIT = 119
+	DOUBLE = 120
+	CURRENT_TIMESTAMP = 121
+	PROC = 122
+	EXCEPT = 123
+	HOLDLOCK = 124
+	WHERE = 125
+	PLAN = 126
+	TABLE = 127
+	CONTAINS = 128
+	REVOKE = 129
+	REPLICATION = 130
+	ASC = 131
+	TRUNCATE = 132
+	IN = 133
+	ADD = 134
+	READTEXT = 135
+	REVERT = 136
+	COALESCE = 137
+	USE = 138
+	CURRENT_USER = 139
+	OPENQUERY = 140
+	LOAD = 141
+	OF = 142
+	DUMP = 143
+	LINENO = 144
+	EXISTS = 145
+	OFF = 146
+	UNION = 147
+	DISTRIBUTED = 148
+	VARYING = 149
+	DESC = 150
+	SYSTEM_USER = 151
+	IF = 152
+	ELSE = 153
+	OPENXML = 154
+	SETUSER = 155
+	CLUSTERED = 156
+	WHILE = 157
+	WITH = 158
+	LEFT = 159
+	ROLLBACK = 160
+	WAITFOR = 161
+	SCHEMA = 162
+	DISTINCT = 163
+	BULK = 164
+	FUNCTION = 165
+	SAVE = 166
+	CONSTRAINT = 167
+	UPDATETEXT = 168
+	CASCADE = 169
+	FOREIGN = 170
+	OPEN = 171
+	ALL = 172
+	BREAK = 173
+	ROWGUIDCOL = 174
+	TRANSACTION = 175
+	UPDATE = 176
+	ANY = 177
+	BY = 178
+	ORDER = 179
+	EXTERNAL = 180
+	KEY = 181
+	TRAN = 182
+	OFFSETS = 183
+	RAISERROR = 184
+	SELECT = 185
+	CREATE = 186
+	GROUP = 187
+	FULL = 188
+	ALTER = 189
+	READ = 190
+	INSERT = 191
+	BEGIN = 192
+	STATISTICS = 193
+	OUTER = 194
+	OPENROWSET = 195
+	SOME = 196
+	RULE = 197
+	AUTHORIZATION = 198
+	PRINT = 199
+	DEALLOCATE = 200
+	PERCENT = 201
+	RIGHT = 202
+	INDEX = 203
+	JOIN = 204
+	PRIMARY = 205
+	UNIQUE = 206
+	WRITETEXT = 207
+	COMPUTE = 208
+	RESTRICT = 209
+	TO = 210
+	DEFAULT = 211
+	NULL = 212
+	CHECKPOINT = 213
+	IDENTITYCOL = 214
+	WITHIN = 215
+	APPLY = 216
+	TRY = 217
+	CATCH = 218
+	PARTITION = 219
+	ROW = 220
+	ROWS = 221
+	RANGE = 222
+	UNBOUNDED = 223
+	PRECEDING = 224
+	FOLLOWING = 225
+	PATH = 226
+	AUTO = 227
+	EXPLICIT = 228
+	RAW = 229
+	ABSENT = 230
+	XSINIL = 231
+	ELEMENTS = 232
+	XMLSCHEMA = 233
+	XMLDATA = 234
+	ROOT = 235
+	INCLUDE_NULL_VALUES = 236
+	WITHOUT_ARRAY_WRAPPER = 237
+	OPENJSON = 238
+	BINARY = 239
+	BASE64 = 240
+	TYPE = 241
+	OFFSET = 242
+	ONLY = 243
+	TIES = 244
+	CAST = 245
+	TRY_CAST = 246
+	PARSE = 247
+	TRY_PARSE = 248
+	USING = 249
+	AVG = 250
+	COUNT = 251
+	SUM = 252
+	MIN = 253
+	MAX = 254
+	IIF = 255
+	FORCESEEK = 256
+	SPATIAL_WINDOW_MAX_CELLS = 257
+	TINYINT = 258
+	SMALLINT = 259
+	INT = 260
+	BIGINT = 261
+	BIT = 262
+	DECIMAL = 263
+	NUMERIC = 264
+	MONEY = 265
+	SMALLMONEY = 266
+	FLOAT = 267
+	REAL = 268
+	DATE = 269
+	TIME = 270
+	DATETIME2 = 271
+	DATETIMEOFFSET = 272
+	DATETIME = 273
+	SMALLDATETIME = 274
+	CHAR = 275
+	VARCHAR = 276
+	TEXT = 277
+	NCHAR = 278
+	NVARCHAR = 279
+	NTEXT = 280
+	VARBINARY = 281
+	IMAGE = 282
+	CURSOR = 283
+	GEOGRAPHY = 284
+	GEOMETRY = 285
+	HIERARCHYID = 286
+	JSON = 287
+	VECTOR = 288
+	ROWVERSION = 289
+	SQL_VARIANT = 290
+	UNIQUEIDENTIFIER = 291
+	XML = 292
+	EQ = 293
+	NE = 294
+	GT = 295
+	GE = 296
+	LT = 297
+	LE = 298
+	OP_ADD = 299
+	OP_SUB = 300
+	OP_MUL = 301
+	OP_DIV = 302
+	OP_MOD = 303
+	PARENTH_1 = 304
+	PARENTH_2 = 305
+	BW_AND = 306
+	BW_OR = 307
+	BW_XOR = 308
+	BW_NOT = 309
+	SEMICOLON = 310
+	COMMA = 311
+	DOT = 312
+
+class ValueFlag:
+	KEYWORD = 0b00000001
+	COMPOUND_START = 0b00000010
+	DATA_TYPE = 0b00000100
+	JOIN = 0b00001000
+	SET_OPERATOR = 0b00010000
+	COMPARISON = 0b00100000
+	QUERY_START = 0b01000000
+	ARITHMETIC = 0b10000000
+
+VALUE_NAMES = (
+	None,
+	'RIGHT_OUTER_JOIN',
+	'LEFT_OUTER_JOIN',
+	'FULL_OUTER_JOIN',
+	'IS_NOT_NULL',
+	'INNER_JOIN',
+	'CROSS_JOIN',
+	'COMMIT_TRAN',
+	'ADD_CONSTRAINT',
+	'WITHIN_GROUP',
+	'BEGIN_TRAN',
+	'CROSS_APPLY',
+	'BEGIN_TRANSACTION',
+	'ROLLBACK_TRANSACTION',
+	'BEGIN_TRY',
+	'GROUP_BY',
+	'END_CATCH',
+	'FULL_JOIN',
+	'COMMIT_TRANSACTION',
+	'ADD_COLUMN',
+	'BEGIN_CATCH',
+	'LEFT_JOIN',
+	'ROLLBACK_TRAN',
+	'ORDER_BY',
+	'END_TRY',
+	'RIGHT_JOIN',
+	'OUTER_APPLY',
+	'IS_NULL',
+	'NOT_IN',
+	'NOT_BETWEEN',
+	'NOT_LIKE',
+	'NOT_EXISTS',
+	'SESSION_USER',
+	'VIEW',
+	'NOT',
+	'TSEQUAL',
+	'SECURITYAUDIT',
+	'CONVERT',
+	'BROWSE',
+	'UNPIVOT',
+	'ROWCOUNT',
+	'RETURN',
+	'SEMANTICSIMILARITYDETAILSTABLE',
+	'PROCEDURE',
+	'DENY',
+	'PIVOT',
+	'AND',
+	'TOP',
+	'INTO',
+	'SET',
+	'END',
+	'CASE',
+	'CHECK',
+	'COLUMN',
+	'EXECUTE',
+	'DISK',
+	'MERGE',
+	'INNER',
+	'NATIONAL',
+	'ERRLVL',
+	'TEXTSIZE',
+	'DROP',
+	'USER',
+	'DBCC',
+	'AS',
+	'HAVING',
+	'BACKUP',
+	'WHEN',
+	'CURRENT_TIME',
+	'OPTION',
+	'SHUTDOWN',
+	'CLOSE',
+	'IDENTITY',
+	'IS',
+	'NOCHECK',
+	'PRECISION',
+	'FOR',
+	'PUBLIC',
+	'OR',
+	'THEN',
+	'FREETEXT',
+	'REFERENCES',
+	'DECLARE',
+	'CURRENT_DATE',
+	'FREETEXTTABLE',
+	'CROSS',
+	'TRIGGER',
+	'CURRENT',
+	'BETWEEN',
+	'LIKE',
+	'EXEC',
+	'GOTO',
+	'CONTINUE',
+	'ESCAPE',
+	'NULLIF',
+	'NONCLUSTERED',
+	'FILE',
+	'ON',
+	'RECONFIGURE',
+	'COMMIT',
+	'COLLATE',
+	'OVER',
+	'SEMANTICSIMILARITYTABLE',
+	'FETCH',
+	'SEMANTICKEYPHRASETABLE',
+	'TABLESAMPLE',
+	'FILLFACTOR',
+	'DATABASE',
+	'DELETE',
+	'OPENDATASOURCE',
+	'RESTORE',
+	'IDENTITY_INSERT',
+	'KILL',
+	'INTERSECT',
+	'GRANT',
+	'CONTAINSTABLE',
+	'FROM',
+	'VALUES',
+	'TRY_CONVERT',
+	'EXIT',
+	'DOUBLE',
+	'CURRENT_TIMESTAMP',
+	'PROC',
+	'EXCEPT',
+	'HOLDLOCK',
+	'WHERE',
+	'PLAN',
+	'TABLE',
+	'CONTAINS',
+	'REVOKE',
+	'REPLICATION',
+	'ASC',
+	'TRUNCATE',
+	'IN',
+	'ADD',
+	'READTEXT',
+	'REVERT',
+	'COALESCE',
+	'USE',
+	'CURRENT_USER',
+	'OPENQUERY',
+	'LOAD',
+	'OF',
+	'DUMP',
+	'LINENO',
+	'EXISTS',
+	'OFF',
+	'UNION',
+	'DISTRIBUTED',
+	'VARYING',
+	'DESC',
+	'SYSTEM_USER',
+	'IF',
+	'ELSE',
+	'OPENXML',
+	'SETUSER',
+	'CLUSTERED',
+	'WHILE',
+	'WITH',
+	'LEFT',
+	'ROLLBACK',
+	'WAITFOR',
+	'SCHEMA',
+	'DISTINCT',
+	'BULK',
+	'FUNCTION',
+	'SAVE',
+	'CONSTRAINT',
+	'UPDATETEXT',
+	'CASCADE',
+	'FOREIGN',
+	'OPEN',
+	'ALL',
+	'BREAK',
+	'ROWGUIDCOL',
+	'TRANSACTION',
+	'UPDATE',
+	'ANY',
+	'BY',
+	'ORDER',
+	'EXTERNAL',
+	'KEY',
+	'TRAN',
+	'OFFSETS',
+	'RAISERROR',
+	'SELECT',
+	'CREATE',
+	'GROUP',
+	'FULL',
+	'ALTER',
+	'READ',
+	'INSERT',
+	'BEGIN',
+	'STATISTICS',
+	'OUTER',
+	'OPENROWSET',
+	'SOME',
+	'RULE',
+	'AUTHORIZATION',
+	'PRINT',
+	'DEALLOCATE',
+	'PERCENT',
+	'RIGHT',
+	'INDEX',
+	'JOIN',
+	'PRIMARY',
+	'UNIQUE',
+	'WRITETEXT',
+	'COMPUTE',
+	'RESTRICT',
+	'TO',
+	'DEFAULT',
+	'NULL',
+	'CHECKPOINT',
+	'IDENTITYCOL',
+	'WITHIN',
+	'APPLY',
+	'TRY',
+	'CATCH',
+	'PARTITION',
+	'ROW',
+	'ROWS',
+	'RANGE',
+	'UNBOUNDED',
+	'PRECEDING',
+	'FOLLOWING',
+	'PATH',
+	'AUTO',
+	'EXPLICIT',
+	'RAW',
+	'ABSENT',
+	'XSINIL',
+	'ELEMENTS',
+	'XMLSCHEMA',
+	'XMLDATA',
+	'ROOT',
+	'INCLUDE_NULL_VALUES',
+	'WITHOUT_ARRAY_WRAPPER',
+	'OPENJSON',
+	'BINARY',
+	'BASE64',
+	'TYPE',
+	'OFFSET',
+	'ONLY',
+	'TIES',
+	'CAST',
+	'TRY_CAST',
+	'PARSE',
+	'TRY_PARSE',
+	'USING',
+	'AVG',
+	'COUNT',
+	'SUM',
+	'MIN',
+	'MAX',
+	'IIF',
+	'FORCESEEK',
+	'SPATIAL_WINDOW_MAX_CELLS',
+	'TINYINT',
+	'SMALLINT',
+	'INT',
+	'BIGINT',
+	'BIT',
+	'DECIMAL',
+	'NUMERIC',
+	'MONEY',
+	'SMALLMONEY',
+	'FLOAT',
+	'REAL',
+	'DATE',
+	'TIME',
+	'DATETIME2',
+	'DATETIMEOFFSET',
+	'DATETIME',
+	'SMALLDATETIME',
+	'CHAR',
+	'VARCHAR',
+	'TEXT',
+	'NCHAR',
+	'NVARCHAR',
+	'NTEXT',
+	'VARBINARY',
+	'IMAGE',
+	'CURSOR',
+	'GEOGRAPHY',
+	'GEOMETRY',
+	'HIERARCHYID',
+	'JSON',
+	'VECTOR',
+	'ROWVERSION',
+	'SQL_VARIANT',
+	'UNIQUEIDENTIFIER',
+	'XML',
+	'EQ',
+	'NE',
+	'GT',
+	'GE',
+	'LT',
+	'LE',
+	'OP_ADD',
+	'OP_SUB',
+	'OP_MUL',
+	'OP_DIV',
+	'OP_MOD',
+	'PARENTH_1',
+	'PARENTH_2',
+	'BW_AND',
+	'BW_OR',
+	'BW_XOR',
+	'BW_NOT',
+	'SEMICOLON',
+	'COMMA',
+	'DOT',
+)
+
+VALUE_HASH = {
+	'SESSION_USER': 32,
+	'VIEW': 33,
+	'NOT': 34,
+	'TSEQUAL': 35,
+	'SECURITYAUDIT': 36,
+	'CONVERT': 37,
+	'BROWSE': 38,
+	'UNPIVOT': 39,
+	'ROWCOUNT': 40,
+	'RETURN': 41,
+	'SEMANTICSIMILARITYDETAILSTABLE': 42,
+	'PROCEDURE': 43,
+	'DENY': 44,
+	'PIVOT': 45,
+	'AND': 46,
+	'TOP': 47,
+	'INTO': 48,
+	'SET': 49,
+	'END': 50,
+	'CASE': 51,
+	'CHECK': 52,
+	'COLUMN': 53,
+	'EXECUTE': 54,
+	'DISK': 55,
+	'MERGE': 56,
+	'INNER': 57,
+	'NATIONAL': 58,
+	'ERRLVL': 59,
+	'TEXTSIZE': 60,
+	'DROP': 61,
+	'USER': 62,
+	'DBCC': 63,
+	'AS': 64,
+	'HAVING': 65,
+	'BACKUP': 66,
+	'WHEN': 67,
+	'CURRENT_TIME': 68,
+	'OPTION': 69,
+	'SHUTDOWN': 70,
+	'CLOSE': 71,
+	'IDENTITY': 72,
+	'IS': 73,
+	'NOCHECK': 74,
+	'PRECISION': 75,
+	'FOR': 76,
+	'PUBLIC': 77,
+	'OR': 78,
+	'THEN': 79,
+	'FREETEXT': 80,
+	'CURSOR': 283,
+	'REFERENCES': 81,
+	'DECLARE': 82,
+	'CURRENT_DATE': 83,
+	'FREETEXTTABLE': 84,
+	'CROSS': 85,
+	'TRIGGER': 86,
+	'CURRENT': 87,
+	'BETWEEN': 88,
+	'LIKE': 89,
+	'EXEC': 90,
+	'GOTO': 91,
+	'CONTINUE': 92,
+	'ESCAPE': 93,
+	'NULLIF': 94,
+	'NONCLUSTERED': 95,
+	'FILE': 96,
+	'ON': 97,
+	'RECONFIGURE': 98,
+	'COMMIT': 99,
+	'COLLATE': 100,
+	'OVER': 101,
+	'SEMANTICSIMILARITYTABLE': 102,
+	'FETCH': 103,
+	'SEMANTICKEYPHRASETABLE': 104,
+	'TABLESAMPLE': 105,
+	'FILLFACTOR': 106,
+	'DATABASE': 107,
+	'DELETE': 108,
+	'OPENDATASOURCE': 109,
+	'RESTORE': 110,
+	'IDENTITY_INSERT': 111,
+	'KILL': 112,
+	'INTERSECT': 113,
+	'GRANT': 114,
+	'CONTAINSTABLE': 115,
+	'FROM': 116,
+	'VALUES': 117,
+	'TRY_CONVERT': 118,
+	'EXIT': 119,
+	'DOUBLE': 120,
+	'CURRENT_TIMESTAMP': 121,
+	'PROC': 122,
+	'EXCEPT': 123,
+	'HOLDLOCK': 124,
+	'WHERE': 125,
+	'PLAN': 126,
+	'TABLE': 127,
+	'CONTAINS': 128,
+	'REVOKE': 129,
+	'REPLICATION': 130,
+	'ASC': 131,
+	'TRUNCATE': 132,
+	'IN': 133,
+	'ADD': 134,
+	'READTEXT': 135,
+	'REVERT': 136,
+	'COALESCE': 137,
+	'USE': 138,
+	'CURRENT_USER': 139,
+	'OPENQUERY': 140,
+	'LOAD': 141,
+	'OF': 142,
+	'DUMP': 143,
+	'LINENO': 144,
+	'EXISTS': 145,
+	'OFF': 146,
+	'UNION': 147,
+	'DISTRIBUTED': 148,
+	'VARYING': 149,
+	'DESC': 150,
+	'SYSTEM_USER': 151,
+	'IF': 152,
+	'ELSE': 153,
+	'OPENXML': 154,
+	'SETUSER': 155,
+	'CLUSTERED': 156,
+	'WHILE': 157,
+	'WITH': 158,
+	'LEFT': 159,
+	'ROLLBACK': 160,
+	'WAITFOR': 161,
+	'SCHEMA': 162,
+	'DISTINCT': 163,
+	'BULK': 164,
+	'FUNCTION': 165,
+	'SAVE': 166,
+	'CONSTRAINT': 167,
+	'UPDATETEXT': 168,
+	'CASCADE': 169,
+	'FOREIGN': 170,
+	'OPEN': 171,
+	'ALL': 172,
+	'BREAK': 173,
+	'ROWGUIDCOL': 174,
+	'TRANSACTION': 175,
+	'UPDATE': 176,
+	'ANY': 177,
+	'BY': 178,
+	'ORDER': 179,
+	'EXTERNAL': 180,
+	'KEY': 181,
+	'TRAN': 182,
+	'OFFSETS': 183,
+	'RAISERROR': 184,
+	'SELECT': 185,
+	'CREATE': 186,
+	'GROUP': 187,
+	'FULL': 188,
+	'ALTER': 189,
+	'READ': 190,
+	'INSERT': 191,
+	'BEGIN': 192,
+	'STATISTICS': 193,
+	'OUTER': 194,
+	'OPENROWSET': 195,
+	'SOME': 196,
+	'RULE': 197,
+	'AUTHORIZATION': 198,
+	'PRINT': 199,
+	'DEALLOCATE': 200,
+	'PERCENT': 201,
+	'RIGHT': 202,
+	'INDEX': 203,
+	'JOIN': 204,
+	'PRIMARY': 205,
+	'UNIQUE': 206,
+	'WRITETEXT': 207,
+	'COMPUTE': 208,
+	'RESTRICT': 209,
+	'TO': 210,
+	'DEFAULT': 211,
+	'NULL': 212,
+	'CHECKPOINT': 213,
+	'IDENTITYCOL': 214,
+	'INNER JOIN': 5,
+	'CROSS JOIN': 6,
+	'COMMIT TRAN': 7,
+	'ADD CONSTRAINT': 8,
+	'WITHIN GROUP': 9,
+	'BEGIN TRAN': 10,
+	'CROSS APPLY': 11,
+	'BEGIN TRANSACTION': 12,
+	'ROLLBACK TRANSACTION': 13,
+	'BEGIN TRY': 14,
+	'GROUP BY': 15,
+	'END CATCH': 16,
+	'FULL JOIN': 17,
+	'COMMIT TRANSACTION': 18,
+	'ADD COLUMN': 19,
+	'BEGIN CATCH': 20,
+	'LEFT JOIN': 21,
+	'ROLLBACK TRAN': 22,
+	'ORDER BY': 23,
+	'END TRY': 24,
+	'RIGHT JOIN': 25,
+	'OUTER APPLY': 26,
+	'IS NULL': 27,
+	'NOT IN': 28,
+	'NOT BETWEEN': 29,
+	'NOT LIKE': 30,
+	'NOT EXISTS': 31,
+	'RIGHT OUTER JOIN': 1,
+	'LEFT OUTER JOIN': 2,
+	'FULL OUTER JOIN': 3,
+	'IS NOT NULL': 4,
+	'WITHIN': 215,
+	'APPLY': 216,
+	'TRY': 217,
+	'CATCH': 218,
+	'PARTITION': 219,
+	'ROWS': 221,
+	'ROW': 220,
+	'RANGE': 222,
+	'UNBOUNDED': 223,
+	'PRECEDING': 224,
+	'FOLLOWING': 225,
+	'PATH': 226,
+	'AUTO': 227,
+	'JSON': 287,
+	'EXPLICIT': 228,
+	'RAW': 229,
+	'XML': 292,
+	'ABSENT': 230,
+	'XSINIL': 231,
+	'ELEMENTS': 232,
+	'XMLSCHEMA': 233,
+	'XMLDATA': 234,
+	'ROOT': 235,
+	'INCLUDE_NULL_VALUES': 236,
+	'WITHOUT_ARRAY_WRAPPER': 237,
+	'OPENJSON': 238,
+	'BINARY': 239,
+	'BASE64': 240,
+	'TYPE': 241,
+	'OFFSET': 242,
+	'ONLY': 243,
+	'TIES': 244,
+	'CAST': 245,
+	'TRY_CAST': 246,
+	'PARSE': 247,
+	'TRY_PARSE': 248,
+	'USING': 249,
+	'AVG': 250,
+	'COUNT': 251,
+	'SUM': 252,
+	'MIN': 253,
+	'MAX': 254,
+	'IIF': 255,
+	'FORCESEEK': 256,
+	'SPATIAL_WINDOW_MAX_CELLS': 257,
+	'TINYINT': 258,
+	'SMALLINT': 259,
+	'INT': 260,
+	'BIGINT': 261,
+	'BIT': 262,
+	'DECIMAL': 263,
+	'NUMERIC': 264,
+	'MONEY': 265,
+	'SMALLMONEY': 266,
+	'FLOAT': 267,
+	'REAL': 268,
+	'DATE': 269,
+	'TIME': 270,
+	'DATETIME2': 271,
+	'DATETIMEOFFSET': 272,
+	'DATETIME': 273,
+	'SMALLDATETIME': 274,
+	'CHAR': 275,
+	'VARCHAR': 276,
+	'TEXT': 277,
+	'NCHAR': 278,
+	'NVARCHAR': 279,
+	'NTEXT': 280,
+	'VARBINARY': 281,
+	'IMAGE': 282,
+	'GEOGRAPHY': 284,
+	'GEOMETRY': 285,
+	'HIERARCHYID': 286,
+	'VECTOR': 288,
+	'ROWVERSION': 289,
+	'SQL_VARIANT': 290,
+	'UNIQUEIDENTIFIER': 291,
+	'.': 312,
+	',': 311,
+	';': 310,
+	'(': 304,
+	')': 305,
+	'+': 299,
+	'-': 300,
+	'*': 301,
+	'/': 302,
+	'%': 303,
+	'>': 295,
+	'<': 297,
+	'=': 293,
+	'&': 306,
+	'|': 307,
+	'^': 308,
+	'~': 309,
+	'<>': 294,
+	'>=': 296,
+	'<=': 298,
+}
+
+# value id -> (children, (keyword, value id) or None)
+COMPOUND_KEYWORDS = {
+	57: ({204: ({}, ('INNER JOIN', 5))}, None),
+	85: ({204: ({}, ('CROSS JOIN', 6)), 216: ({}, ('CROSS APPLY', 11))}, None),
+	99: ({182: ({}, ('COMMIT TRAN', 7)), 175: ({}, ('COMMIT TRANSACTION', 18))}, None),
+	134: ({167: ({}, ('ADD CONSTRAINT', 8)), 53: ({}, ('ADD COLUMN', 19))}, None),
+	215: ({187: ({}, ('WITHIN GROUP', 9))}, None),
+	192: ({182: ({}, ('BEGIN TRAN', 10)), 175: ({}, ('BEGIN TRANSACTION', 12)), 217: ({}, ('BEGIN TRY', 14)), 218: ({}, ('BEGIN CATCH', 20))}, None),
+	160: ({175: ({}, ('ROLLBACK TRANSACTION', 13)), 182: ({}, ('ROLLBACK TRAN', 22))}, None),
+	187: ({178: ({}, ('GROUP BY', 15))}, None),
+	50: ({218: ({}, ('END CATCH', 16)), 217: ({}, ('END TRY', 24))}, None),
+	188: ({204: ({}, ('FULL JOIN', 17)), 194: ({204: ({}, ('FULL OUTER JOIN', 3))}, None)}, None),
+	159: ({204: ({}, ('LEFT JOIN', 21)), 194: ({204: ({}, ('LEFT OUTER JOIN', 2))}, None)}, None),
+	179: ({178: ({}, ('ORDER BY', 23))}, None),
+	202: ({204: ({}, ('RIGHT JOIN', 25)), 194: ({204: ({}, ('RIGHT OUTER JOIN', 1))}, None)}, None),
+	194: ({216: ({}, ('OUTER APPLY', 26))}, None),
+	73: ({212: ({}, ('IS NULL', 27)), 34: ({212: ({}, ('IS NOT NULL', 4))}, None)}, None),
+	34: ({133: ({}, ('NOT IN', 28)), 88: ({}, ('NOT BETWEEN', 29)), 89: ({}, ('NOT LIKE', 30)), 145: ({}, ('NOT EXISTS', 31))}, None),
+}
+
+# Indexed by value id: VALUE_FLAGS[t.value_id or 0] & EnumValueFlag.X
+VALUE_FLAGS = bytearray(b'\x00\t\t\t\x01\t\t\x01\x01\x01\x01\t\x01\x01\x01\x01\x01\t\x01\x01\x01\t\x01\x01\x01\t\t\x01\x01\x01!\x01\x01\x01\x03\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x03\x01\x01\x01\x01\x01\x01\x03\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x03\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x03\x01\x01\x01!\x01\x01\x01\x01\x01\x01\x01\x01\x01\x03\x01\x01\x01\x01\x01\x01\x01\x01A\x01\x01\x01\x01\x11\x01\x01\x01\x01\x01\x01\x01\x01\x01\x11\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x03\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x11\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x03\x03\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01A\x01\x01\x03\x01\x01\x01\x01\x01A\x01\x03\x03\x01\x01A\x03\x01\x03\x01\x01\x01\x01\x01\x01\x01\x03\x01\t\x01\x01\x01\x01\x01\x01\x01\x01\x01\x01\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x04\x01\x04\x04\x04\x04\x04\x04\x04\x04\x04      \x80\x80\x80\x80\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00')